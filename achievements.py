@@ -0,0 +1,224 @@
+from collections import defaultdict
+
+
+class Rule:
+    """Succès à débloquer.
+
+    triggers() liste les événements qui peuvent faire évoluer la règle ;
+    observe() tient ses éventuels compteurs propres et reached() la
+    vérifie, sur la séance qui vient d'être enregistrée.
+    reached_in_history() la vérifie sur un historique entier (stats et
+    séances par programme), après un import ou une migration.
+    """
+
+    def __init__(self, rule_id, name, description):
+        self.id = rule_id
+        self.name = name
+        self.description = description
+
+    def triggers(self):
+        return ()
+
+    def observe(self, session):
+        pass
+
+    def reached(self, session):
+        return False
+
+    def reached_in_history(self, stats, program_counts):
+        return False
+
+
+class StreakRule(Rule):
+    """Série d'au moins days jours consécutifs"""
+
+    def __init__(self, rule_id, name, days):
+        super().__init__(rule_id, name, f"{days} jours d'entraînement consécutifs")
+        self.days = days
+
+    def triggers(self):
+        return ('streak',)
+
+    def reached(self, session):
+        return session.stats['streak'] >= self.days
+
+    def reached_in_history(self, stats, program_counts):
+        return max(stats.get('best_streak', 0), stats.get('streak', 0)) >= self.days
+
+
+class TotalRule(Rule):
+    """Total cumulé (séances ou calories) d'au moins threshold"""
+
+    LABELS = {'total_workouts': "séances", 'total_calories': "calories brûlées"}
+
+    def __init__(self, rule_id, name, key, threshold):
+        super().__init__(rule_id, name, f"{threshold} {self.LABELS.get(key, key)}")
+        self.key = key
+        self.threshold = threshold
+
+    def triggers(self):
+        return (self.key,)
+
+    def reached(self, session):
+        return session.stats[self.key] >= self.threshold
+
+    def reached_in_history(self, stats, program_counts):
+        return stats.get(self.key, 0) >= self.threshold
+
+
+class ProgramRule(Rule):
+    """Au moins count séances d'un programme (program=None : de n'importe lequel)"""
+
+    def __init__(self, rule_id, name, count, program=None):
+        target = program or "d'un même programme"
+        super().__init__(rule_id, name, f"{count} séances {target}")
+        self.count = count
+        self.program = program
+
+    def triggers(self):
+        return (('program', self.program),)
+
+    def reached(self, session):
+        return session.program_count >= self.count
+
+    def reached_in_history(self, stats, program_counts):
+        if self.program is not None:
+            return program_counts.get(self.program, 0) >= self.count
+        return max(program_counts.values(), default=0) >= self.count
+
+
+class TimeOfDayRule(Rule):
+    """Au moins count séances commencées entre start et end heures.
+
+    L'historique ne garde pas l'heure des séances : le compteur part de
+    zéro à la première séance enregistrée par l'application, et un
+    historique importé ou migré n'y compte pas.
+    """
+
+    def __init__(self, rule_id, name, start, end, count):
+        super().__init__(rule_id, name, f"{count} séances entre {start} h et {end} h")
+        self.start = start
+        self.end = end
+        self.count = count
+
+    def triggers(self):
+        return tuple(('hour', hour) for hour in range(self.start, self.end))
+
+    def observe(self, session):
+        # L'historique ne garde pas l'heure : séances de la plage comptées ici
+        session.counters[self.id] = session.counters.get(self.id, 0) + 1
+
+    def reached(self, session):
+        return session.counters.get(self.id, 0) >= self.count
+
+
+DEFAULT_RULES = (
+    TotalRule('first_workout', "Premier pas", 'total_workouts', 1),
+    TotalRule('workouts_50', "Habitué", 'total_workouts', 50),
+    TotalRule('workouts_100', "Centurion", 'total_workouts', 100),
+    TotalRule('calories_1000', "Brûleur", 'total_calories', 1000),
+    TotalRule('calories_10000', "Fournaise", 'total_calories', 10000),
+    StreakRule('streak_3', "Régulier", 3),
+    StreakRule('streak_7', "Semaine parfaite", 7),
+    StreakRule('streak_30', "Mois de feu", 30),
+    ProgramRule('program_10', "Spécialiste", 10),
+    ProgramRule('program_50', "Expert", 50),
+    TimeOfDayRule('early_bird', "Lève-tôt", 5, 8, 5),
+    TimeOfDayRule('night_owl', "Oiseau de nuit", 21, 24, 5),
+)
+
+
+class SessionState:
+    """Ce que les règles voient de la séance enregistrée"""
+
+    __slots__ = ('stats', 'entry', 'program_count', 'counters')
+
+    def __init__(self, stats, entry, program_count, counters):
+        self.stats = stats
+        self.entry = entry
+        self.program_count = program_count
+        self.counters = counters
+
+
+class AchievementEngine:
+    """Débloque les succès au fil des séances, sans relire l'historique.
+
+    Les règles sont indexées par déclencheur (série, totaux, programme,
+    heure) : une séance n'évalue que les règles de ses déclencheurs, et
+    jamais celles déjà débloquées. Les valeurs viennent des compteurs
+    tenus à jour (stats de progress.json, agrégats par programme) ; seules
+    les séances par plage horaire, que l'historique ne garde pas, sont
+    comptées dans progress_data['achievement_counters']. backfill() évalue
+    une fois toutes les règles sur un historique importé ou migré.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES):
+        self.rules = {rule.id: rule for rule in rules}
+        self._index = defaultdict(list)
+        for rule in rules:
+            for trigger in rule.triggers():
+                self._index[trigger].append(rule)
+        # Identifiants débloqués, liés à la liste de progress_data
+        self._unlocked_list = None
+        self._unlocked = set()
+
+    def _unlocked_ids(self, achievements):
+        if achievements is not self._unlocked_list or len(achievements) != len(self._unlocked):
+            self._unlocked_list = achievements
+            self._unlocked = {achievement['id'] for achievement in achievements}
+        return self._unlocked
+
+    def affected_rules(self, entry, now):
+        """Règles que la séance peut faire évoluer (now : heure de la
+        séance dans le fuseau de l'utilisateur)"""
+        index = self._index
+        for trigger in ('total_workouts', 'total_calories', 'streak',
+                        ('program', None), ('program', entry['workout']), ('hour', now.hour)):
+            yield from index.get(trigger, ())
+
+    def record(self, progress_data, entry, now, program_count):
+        """Évalue la séance (déjà comptée dans les stats) ; retourne les succès débloqués.
+
+        program_count : séances du programme de entry, celle-ci comprise
+        """
+        achievements = progress_data.setdefault('achievements', [])
+        unlocked = self._unlocked_ids(achievements)
+        counters = progress_data.setdefault('achievement_counters', {})
+        session = SessionState(progress_data['stats'], entry, program_count, counters)
+
+        new = []
+        for rule in self.affected_rules(entry, now):
+            if rule.id in unlocked:
+                continue
+            rule.observe(session)
+            if rule.reached(session):
+                achievement = {"id": rule.id, "name": rule.name, "date": entry['date']}
+                achievements.append(achievement)
+                unlocked.add(rule.id)
+                new.append(achievement)
+        return new
+
+    def backfill(self, progress_data, program_counts):
+        """Débloque les succès déjà atteints par l'historique (import,
+        migration) ; retourne les succès débloqués.
+
+        Chaque règle est évaluée une fois sur les stats reconstruites et
+        program_counts ({programme: séances}). Les succès sont datés du
+        dernier jour d'activité, faute de mieux.
+        """
+        achievements = progress_data.setdefault('achievements', [])
+        unlocked = self._unlocked_ids(achievements)
+        stats = progress_data['stats']
+        day = stats.get('last_workout_date')
+        if day is None:
+            return []
+
+        new = []
+        for rule in self.rules.values():
+            if rule.id in unlocked or not rule.reached_in_history(stats, program_counts):
+                continue
+            achievement = {"id": rule.id, "name": rule.name, "date": day}
+            achievements.append(achievement)
+            unlocked.add(rule.id)
+            new.append(achievement)
+        return new
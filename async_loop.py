@@ -0,0 +1,96 @@
+import asyncio
+import tkinter as tk
+from _tkinter import ALL_EVENTS, DONT_WAIT
+
+
+class AsyncTkLoop:
+    """Fait tourner l'interface Tk dans une boucle asyncio.
+
+    À la place de window.mainloop(), pump() traite les événements Tk en
+    attente (dessins, clics, after() du FrameScheduler) puis rend la main
+    à asyncio. Les minuteurs, animations et traitements longs peuvent
+    ainsi s'écrire en coroutines (spawn), en parallèle de la séance.
+    Les coroutines tournent sur le thread de l'interface : elles peuvent
+    modifier les widgets, mais doivent confier les blocages (disque,
+    réseau) à un thread (asyncio.to_thread, worker_call).
+
+    Tant que des événements arrivent (animations, saisie), Tk est
+    consulté toutes les interval secondes. Après idle_after secondes sans
+    aucun événement, l'attente double à chaque tour jusqu'à max_interval :
+    une fenêtre inactive ne réveille plus le processus 120 fois par
+    seconde. Le premier événement ramène l'attente à interval.
+    """
+
+    def __init__(self, window, interval=1 / 120, max_interval=1 / 20, idle_after=0.25):
+        self.window = window
+        self.interval = interval
+        self.max_interval = max_interval
+        self.idle_after = idle_after
+        self._tasks = set()
+
+    def spawn(self, coro):
+        """Lance une coroutine ; ses erreurs sont affichées, pas propagées"""
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Erreur dans la tâche {task.get_coro().__qualname__}: {task.exception()}")
+
+    def _window_exists(self):
+        try:
+            return bool(self.window.winfo_exists())
+        except tk.TclError:
+            return False
+
+    async def pump(self):
+        """Traite les événements Tk jusqu'à la fermeture de la fenêtre"""
+        loop = asyncio.get_running_loop()
+        delay = self.interval
+        last_event = loop.time()
+        while self._window_exists():
+            # Tous les événements prêts, sans attendre
+            handled = False
+            while self.window.tk.dooneevent(ALL_EVENTS | DONT_WAIT):
+                handled = True
+            if handled:
+                delay = self.interval
+                last_event = loop.time()
+            elif loop.time() - last_event >= self.idle_after:
+                # Fenêtre inactive : attente de plus en plus longue
+                delay = min(max(delay, self.interval) * 2, self.max_interval)
+            await asyncio.sleep(delay)
+
+    async def main(self, *coros):
+        for coro in coros:
+            self.spawn(coro)
+        try:
+            await self.pump()
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def run(self, *coros):
+        """Remplace window.mainloop() ; retourne à la fermeture de la fenêtre"""
+        asyncio.run(self.main(*coros))
+
+
+def worker_call(worker, key, func, *args):
+    """Exécute func sur l'IOWorker (dans l'ordre des écritures de key) et
+    retourne un futur asyncio résolu quand l'écriture est terminée"""
+    future = asyncio.get_running_loop().create_future()
+
+    def done():
+        if not future.done():
+            future.set_result(None)
+
+    def failed(error):
+        if not future.done():
+            future.set_exception(error)
+
+    worker.submit(key, func, *args, on_done=done, on_error=failed)
+    return future
@@ -0,0 +1,383 @@
+"""Banc d'essai des chemins de données et des boucles de rendu.
+
+Génère des jeux de données synthétiques (programmes et historique de
+10^2 à 10^6 entrées), mesure la latence (percentiles) et la mémoire de
+chaque opération, et compare le résultat à une référence enregistrée.
+
+    python benchmarks.py --sizes 100 10000 1000000
+    python benchmarks.py --save benchmarks_baseline.json
+    python benchmarks.py --compare benchmarks_baseline.json
+
+Les vues Tk (create_workout_view, create_stats_view) ne sont mesurées que
+si un affichage est disponible.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from fitness_core import FitnessCore
+from palette import hsv_to_hex
+from render_pipeline import RenderPipeline
+
+DEFAULT_SIZES = (100, 1000, 10000)
+PROGRAM_TYPES = ("HIIT", "Cardio", "Force", "Yoga", "Stretching")
+
+
+# Jeux de données synthétiques
+def make_programs(count, seed=0):
+    """Programmes d'entraînement au format de workout_programs.json"""
+    rng = random.Random(seed)
+    programs = {}
+    for i in range(count):
+        program_type = PROGRAM_TYPES[i % len(PROGRAM_TYPES)]
+        programs[f"program_{i + 1}"] = {
+            "name": f"{program_type} {i + 1}",
+            "description": f"Programme synthétique {i + 1}",
+            "durations": [
+                {"time": seconds, "name": f"{seconds} sec", "calories": seconds * rng.randint(1, 3)}
+                for seconds in (15, 30, 60)
+            ],
+            "exercises": [
+                {"name": f"Exercice {j + 1}", "duration": 30, "rest": 15, "sets": 3}
+                for j in range(rng.randint(1, 4))
+            ]
+        }
+    return programs
+
+
+def make_history(count, programs, start=date(2020, 1, 1), seed=0):
+    """Séances terminées, triées par date, sur les programmes donnés"""
+    rng = random.Random(seed)
+    names = [program['name'] for program in programs.values()]
+    history = []
+    day = start
+    for _ in range(count):
+        if rng.random() < 0.3:
+            day += timedelta(days=rng.randint(1, 2))
+        seconds = rng.choice((15, 30, 60, 900))
+        history.append({
+            "date": day.isoformat(),
+            "workout": rng.choice(names),
+            "duration": f"{seconds} sec",
+            "completed": True,
+            "calories": seconds * rng.randint(1, 3),
+            "time": seconds,
+            "exercises_completed": rng.randint(1, 4)
+        })
+    return history
+
+
+def make_progress(history):
+    """Contenu de progress.json correspondant à un historique"""
+    counts = dict.fromkeys(PROGRAM_TYPES, 0)
+    for entry in history:
+        program_type = entry['workout'].split()[0]
+        if program_type in counts:
+            counts[program_type] += 1
+    return {
+        "history": history,
+        "stats": {
+            "total_workouts": len(history),
+            "total_calories": sum(entry['calories'] for entry in history),
+            "streak": 1,
+            "best_streak": 1,
+            "last_workout_date": history[-1]['date'] if history else None
+        },
+        "achievements": [],
+        "workout_counts": counts
+    }
+
+
+def write_dataset(data_dir, programs_count, history_count, seed=0):
+    """Écrit settings.json, workout_programs.json et progress.json"""
+    os.makedirs(data_dir, exist_ok=True)
+    programs = make_programs(max(1, programs_count), seed)
+    files = {
+        'settings.json': {"user": {"name": "BENCH", "age": 30, "weight": 70, "height": 180}},
+        'workout_programs.json': programs,
+        'progress.json': make_progress(make_history(history_count, programs, seed=seed)),
+    }
+    for filename, data in files.items():
+        with open(os.path.join(data_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+
+# Mesures
+def percentile(sorted_values, q):
+    """Percentile q (0-100) par interpolation linéaire"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def measure(func, repeat=30, warmup=1):
+    """Latence de func() en millisecondes (p50, p90, p99, max) et pic mémoire en Kio"""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+
+    # Mémoire mesurée à part : tracemalloc ralentit l'exécution
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'p50': percentile(samples, 50),
+        'p90': percentile(samples, 90),
+        'p99': percentile(samples, 99),
+        'max': samples[-1],
+        'mean': sum(samples) / len(samples),
+        'peak_kib': peak / 1024,
+    }
+
+
+# Bancs d'essai : chacun reçoit le répertoire de données et la taille
+def bench_update_progress_file(data_dir, size, repeat):
+    core = FitnessCore(data_dir)
+    program = next(iter(core.programs.values()))
+    duration = program['durations'][0]
+    return measure(lambda: core.record_workout(program, duration), repeat)
+
+
+def bench_update_progress_file_sqlite(data_dir, size, repeat):
+    core = FitnessCore(data_dir, storage='sqlite')
+    program = next(iter(core.programs.values()))
+    duration = program['durations'][0]
+    try:
+        return measure(lambda: core.record_workout(program, duration), repeat)
+    finally:
+        core.close()
+
+
+def bench_load_programs(data_dir, size, repeat):
+    # Chargement à froid des programmes (données de create_workout_view)
+    core = FitnessCore(data_dir)
+
+    def load():
+        core.store.invalidate('programs')
+        return list(core.programs.items())
+    return measure(load, repeat)
+
+
+def bench_stats_summary(data_dir, size, repeat):
+    # Données de create_stats_view, colonnes d'analyse déjà construites
+    core = FitnessCore(data_dir)
+    return measure(core.stats_summary, repeat)
+
+
+def bench_stats_summary_cold(data_dir, size, repeat):
+    # Premier affichage des statistiques : lecture du journal et colonnes
+    core = FitnessCore(data_dir)
+
+    def summary():
+        core.analytics = None
+        return core.stats_summary()
+    return measure(summary, min(repeat, 10))
+
+
+def bench_stats_summary_sqlite(data_dir, size, repeat):
+    # Tables de synthèse et requêtes indexées
+    core = FitnessCore(data_dir, storage='sqlite')
+    try:
+        return measure(core.stats_summary, repeat)
+    finally:
+        core.close()
+
+
+def bench_hsv_to_rgb(data_dir, size, repeat):
+    # 1000 conversions par échantillon
+    def convert():
+        for h in range(1000):
+            hsv_to_hex(h % 360, 1.0, 1.0)
+    return measure(convert, repeat)
+
+
+def bench_animate_circles(data_dir, size, repeat):
+    # 1000 images, canvas factice : seul le coût Python est mesuré
+    from fitness_app import ModernFitnessApp
+
+    def noop(*args, **kwargs):
+        pass
+
+    canvas = SimpleNamespace(coords=noop, itemconfig=noop)
+    frame = SimpleNamespace(
+        timer_running=True,
+        circles=[1, 2, 3],
+        canvas=canvas,
+        circle_render=RenderPipeline(canvas),
+        circle_atlas=None,
+        timer_label=SimpleNamespace(configure=noop)
+    )
+
+    def animate():
+        for _ in range(1000):
+            ModernFitnessApp.animate_circles(frame)
+    return measure(animate, repeat)
+
+
+def display_available():
+    """Vrai si une fenêtre Tk peut être créée"""
+    try:
+        import tkinter
+        root = tkinter.Tk()
+        root.destroy()
+        return True
+    except Exception:
+        return False
+
+
+def _gui_app(data_dir):
+    from fitness_app import ModernFitnessApp
+    os.chdir(os.path.dirname(data_dir))
+    return ModernFitnessApp()
+
+
+def bench_create_workout_view(data_dir, size, repeat):
+    cwd = os.getcwd()
+    app = _gui_app(data_dir)
+    try:
+        def create():
+            app.workout_frame.destroy()
+            app.create_workout_view()
+            app.window.update_idletasks()
+        return measure(create, min(repeat, 10))
+    finally:
+        app.window.destroy()
+        os.chdir(cwd)
+
+
+def bench_create_stats_view(data_dir, size, repeat):
+    cwd = os.getcwd()
+    app = _gui_app(data_dir)
+    try:
+        def create():
+            app.create_stats_view()
+            app.window.update_idletasks()
+        return measure(create, min(repeat, 10))
+    finally:
+        app.window.destroy()
+        os.chdir(cwd)
+
+
+BENCHMARKS = {
+    'update_progress_file': bench_update_progress_file,
+    'update_progress_file_sqlite': bench_update_progress_file_sqlite,
+    'load_programs': bench_load_programs,
+    'stats_summary': bench_stats_summary,
+    'stats_summary_cold': bench_stats_summary_cold,
+    'stats_summary_sqlite': bench_stats_summary_sqlite,
+    'hsv_to_rgb': bench_hsv_to_rgb,
+    'animate_circles': bench_animate_circles,
+}
+
+GUI_BENCHMARKS = {
+    'create_workout_view': bench_create_workout_view,
+    'create_stats_view': bench_create_stats_view,
+}
+
+# Bancs dont le coût ne dépend pas de la taille des données
+SIZE_INDEPENDENT = {'hsv_to_rgb', 'animate_circles'}
+
+
+def run(sizes=DEFAULT_SIZES, repeat=30, names=None, seed=0, log=print):
+    """Exécute les bancs ; retourne {nom: {taille: mesures}}"""
+    benchmarks = dict(BENCHMARKS)
+    if names is None or any(name in GUI_BENCHMARKS for name in names):
+        if display_available():
+            benchmarks.update(GUI_BENCHMARKS)
+        else:
+            log("Pas d'affichage : vues Tk ignorées")
+    if names is not None:
+        benchmarks = {name: bench for name, bench in benchmarks.items() if name in names}
+
+    results = {}
+    for size in sizes:
+        root = tempfile.mkdtemp(prefix='fitness-bench-')
+        try:
+            for name, bench in benchmarks.items():
+                if name in SIZE_INDEPENDENT and size != sizes[0]:
+                    continue
+                # Jeu de données neuf pour chaque banc (migration comprise)
+                data_dir = os.path.join(root, name, 'data')
+                write_dataset(data_dir, size, size, seed)
+                result = bench(data_dir, size, repeat)
+                results.setdefault(name, {})[str(size)] = result
+                log(format_result(name, size, result))
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def format_result(name, size, result):
+    return (f"{name:<28} {size:>8}  p50 {result['p50']:9.3f} ms  p90 {result['p90']:9.3f} ms  "
+            f"p99 {result['p99']:9.3f} ms  max {result['max']:9.3f} ms  "
+            f"mém. {result['peak_kib']:10.1f} Kio")
+
+
+def compare(results, baseline, tolerance=0.25, metric='p50'):
+    """Liste des (nom, taille, référence, mesure) plus lents que la référence de plus de tolerance"""
+    regressions = []
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            reference = baseline.get(name, {}).get(size)
+            if reference is None:
+                continue
+            if result[metric] > reference[metric] * (1 + tolerance):
+                regressions.append((name, size, reference[metric], result[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai de Fitness Pro")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="nombre de programmes et d'entrées d'historique")
+    parser.add_argument('--repeat', type=int, default=30, help="échantillons par mesure")
+    parser.add_argument('--only', nargs='+', help="bancs à exécuter")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', metavar='FICHIER', help="enregistrer les résultats comme référence")
+    parser.add_argument('--compare', metavar='FICHIER', help="comparer à une référence enregistrée")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="ralentissement toléré avant de signaler une régression (0.25 = 25 %%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.only, args.seed)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=4)
+        print(f"Référence enregistrée dans {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for name, size, reference, value in regressions:
+            print(f"Régression : {name} ({size}) {reference:.3f} ms -> {value:.3f} ms")
+        if regressions:
+            return 1
+        print("Aucune régression")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
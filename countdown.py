@@ -0,0 +1,71 @@
+import math
+import time
+
+
+class Countdown:
+    """Compte à rebours calculé à partir d'une horloge monotone.
+
+    Le temps restant n'est jamais décrémenté à chaque tick : il est déduit
+    du temps écoulé depuis le démarrage (moins les pauses). Un tick en retard
+    ne fait donc pas dériver la séance, et ms_until_next_tick() donne le
+    délai exact jusqu'au prochain changement de seconde affichée.
+    """
+
+    def __init__(self, duration, clock=time.monotonic):
+        self.duration = duration
+        self.clock = clock
+        self._started_at = None
+        # Temps écoulé avant la dernière pause
+        self._elapsed = 0.0
+
+    @property
+    def running(self):
+        return self._started_at is not None
+
+    def start(self):
+        """Démarre ou reprend le compte à rebours"""
+        if self._started_at is None:
+            self._started_at = self.clock()
+
+    resume = start
+
+    def pause(self):
+        if self._started_at is not None:
+            self._elapsed += self.clock() - self._started_at
+            self._started_at = None
+
+    def reset(self, duration=None):
+        if duration is not None:
+            self.duration = duration
+        self._started_at = None
+        self._elapsed = 0.0
+
+    def elapsed(self):
+        if self._started_at is None:
+            return self._elapsed
+        return self._elapsed + self.clock() - self._started_at
+
+    def remaining(self):
+        return max(0.0, self.duration - self.elapsed())
+
+    def remaining_seconds(self):
+        """Secondes restantes à afficher (arrondi supérieur : 60, 59, ... 1, 0)"""
+        return math.ceil(self.remaining())
+
+    @property
+    def finished(self):
+        return self.remaining() <= 0
+
+    def progress(self):
+        """Fraction écoulée, entre 0 et 1"""
+        if not self.duration:
+            return 1.0
+        return min(1.0, self.elapsed() / self.duration)
+
+    def ms_until_next_tick(self):
+        """Délai en millisecondes jusqu'au prochain changement de seconde affichée"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            return 0
+        delay = remaining - (math.ceil(remaining) - 1)
+        return max(1, math.ceil(delay * 1000))
@@ -0,0 +1,128 @@
+import itertools
+import json
+import os
+
+from persistence import atomic_write_json
+
+
+class DataStore:
+    """Dépôt en mémoire des fichiers JSON de l'application.
+
+    Chaque fichier est chargé une seule fois puis servi depuis la mémoire ;
+    il n'est relu que si sa date de modification ou sa taille a changé.
+    Les données retournées sont partagées : un appelant qui les modifie
+    doit ensuite appeler save() pour les persister.
+
+    Avec un writer (GroupCommitWriter), les sauvegardes sont regroupées et
+    écrites plus tard ; le cache sert la version en mémoire en attendant.
+
+    Avec un shared_dir, les fichiers partagés par tous les profils (les
+    programmes) sont lus dans ce répertoire, les autres dans data_dir.
+    """
+
+    # Signature d'un fichier dont l'écriture est en attente
+    PENDING = object()
+
+    FILES = {
+        'settings': 'settings.json',
+        'programs': 'workout_programs.json',
+        'progress': 'progress.json',
+    }
+
+    # Fichiers communs à tous les profils
+    SHARED = {'programs'}
+
+    # Révisions communes à toutes les instances : le dépôt d'un autre
+    # profil ne redonne jamais un numéro déjà vu par une vue
+    _revision_counter = itertools.count(1)
+
+    def __init__(self, data_dir='data', writer=None, shared_dir=None):
+        self.data_dir = data_dir
+        self.shared_dir = shared_dir if shared_dir is not None else data_dir
+        self.writer = writer
+        # nom -> (signature du fichier, données chargées)
+        self._cache = {}
+        # nom -> numéro de révision, renouvelé à chaque changement de contenu
+        self._revisions = {}
+
+    def path(self, name):
+        directory = self.shared_dir if name in self.SHARED else self.data_dir
+        return os.path.join(directory, self.FILES[name])
+
+    @staticmethod
+    def _signature(path):
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def load(self, name):
+        """Retourne le contenu du fichier, relu seulement s'il a changé"""
+        path = self.path(name)
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] is self.PENDING:
+            # Écriture en attente : la mémoire est plus récente que le disque
+            return cached[1]
+
+        signature = self._signature(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self._cache[name] = (signature, data)
+        self._bump(name)
+        return data
+
+    def _bump(self, name):
+        self._revisions[name] = next(DataStore._revision_counter)
+
+    def revision(self, name):
+        """Numéro de révision du contenu : les vues ne se redessinent que s'il change"""
+        self.load(name)
+        return self._revisions.get(name, 0)
+
+    def save(self, name, data):
+        """Écrit le fichier (atomiquement) et garde le cache aligné sur le disque"""
+        path = self.path(name)
+        self._bump(name)
+        if self.writer is None:
+            atomic_write_json(path, data)
+            self._cache[name] = (self._signature(path), data)
+            return
+
+        self._cache[name] = (self.PENDING, data)
+        self.writer.write(path, data, on_commit=lambda: self._committed(name, data))
+
+    def _committed(self, name, data):
+        # Le fichier écrit devient la référence, sauf si une sauvegarde
+        # plus récente a déjà remplacé les données en cache
+        cached = self._cache.get(name)
+        if cached is not None and cached[1] is data:
+            self._cache[name] = (self._signature(self.path(name)), data)
+
+    def invalidate(self, name=None):
+        """Force la relecture d'un fichier (ou de tous) au prochain accès"""
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(name, None)
+
+    # Vues typées sur les données
+    @property
+    def settings(self):
+        return self.load('settings')
+
+    @property
+    def user(self):
+        return self.settings['user']
+
+    @property
+    def programs(self):
+        return self.load('programs')
+
+    @property
+    def progress(self):
+        return self.load('progress')
+
+    @property
+    def stats(self):
+        return self.progress['stats']
@@ -1,14 +1,36 @@
+import time
+
+# Début du chargement des modules, pour le rapport de démarrage
+_IMPORT_START = time.perf_counter()
+
 import customtkinter as ctk
-from PIL import Image, ImageTk
-import json
-from datetime import datetime
-import math
 import os
-import time
+import sys
 from tkinter import messagebox
 
+from fitness_core import FitnessCore
+from persistence import GroupCommitWriter
+from io_worker import IOWorker
+from frame_scheduler import FrameScheduler
+from countdown import Countdown
+from palette import CIRCLE_PALETTE, LOGO_CYCLE, TIMER_PALETTE, hsv_to_hex
+from render_pipeline import HIGH, RenderPipeline
+from sprite_atlas import circle_bbox
+from virtual_list import VirtualList
+from startup_timer import StartupTimer
+from instrumentation import Profiler
+
 class ModernFitnessApp:
+    # Hauteur fixe des lignes des listes virtualisées
+    PROGRAM_CARD_HEIGHT = 130
+    PROGRAM_ROW_HEIGHT = 60
+    # Entrée du menu des profils qui ouvre la création d'un membre
+    NEW_PROFILE_LABEL = "➕ Nouveau profil"
+
     def __init__(self):
+        self.startup = StartupTimer(start=_IMPORT_START)
+        self.startup.mark("chargement des modules")
+        
         # Configuration du thème
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
@@ -17,6 +39,15 @@ class ModernFitnessApp:
         self.window = ctk.CTk()
         self.window.title("FITNESS PRO")
         self.window.geometry("1400x800")
+        self.window.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Profilage optionnel (variable d'environnement FITNESS_PROFILE)
+        self.profiler = Profiler.from_environment()
+        
+        # Une seule boucle after() pour les animations et les minuteurs
+        self.scheduler = FrameScheduler(self.window, fps=30, profiler=self.profiler)
+        self.window.bind('<Unmap>', lambda e: self.on_window_visibility(e, False))
+        self.window.bind('<Map>', lambda e: self.on_window_visibility(e, True))
         
         # Couleurs modernes
         self.colors = {
@@ -32,15 +63,51 @@ class ModernFitnessApp:
         self.current_view = None
         self.timer_running = False
         self.time_remaining = 60
+        # Temps restant calculé sur une horloge monotone (sans dérive)
+        self.countdown = Countdown(self.time_remaining)
         self.progress = 0
         self.timer_completions = 0
         
-        # Création de l'interface
+        # Données chargées une seule fois puis servies depuis la mémoire ;
+        # les sauvegardes rapprochées sont regroupées en une seule écriture
+        # Les écritures disque se font sur des threads : la boucle Tk ne
+        # bloque pas sur un disque lent ; les callbacks reviennent via poll()
+        self.worker = IOWorker(on_pending=lambda: self.scheduler.register(
+            'io', self.worker.poll, interval_ms=50))
+        self.writer = GroupCommitWriter(
+            delay_ms=200, schedule=self.window.after, worker=self.worker,
+            on_error=lambda path, error: self.show_error_dialog(
+                f"Erreur lors de l'enregistrement de {os.path.basename(path)} : "
+                "la sauvegarde sera retentée")
+        )
+        # Moteur sans interface : programmes, séances, progression, paramètres
+        self.core = FitnessCore('data', writer=self.writer, worker=self.worker)
+        self.store = self.core.store
+        self.startup.mark("données")
+        if self.profiler is not None:
+            self.instrument()
+        
+        # Création de l'interface : seule la vue par défaut est construite,
+        # les autres le sont à leur première visite
         self.create_gui()
         self.start_animation()
         
         # Afficher la vue par défaut
         self.show_view("workout")
+        self.startup.mark("interface")
+        # Premier affichage : quand Tk a traité les dessins en attente
+        self.window.after_idle(self.on_first_paint)
+
+    def instrument(self):
+        """Chronomètre les lectures/écritures JSON et la construction des vues"""
+        self.profiler.instrument(self.store, ('load', 'save'), 'json')
+        self.profiler.instrument(self.writer, ('flush',), 'json')
+        self.profiler.instrument(self, (
+            'create_workout_view', 'refresh_workout_view',
+            'create_stats_view', 'refresh_stats_view',
+            'create_settings_view', 'refresh_programs_tab',
+            'create_manage_programs_view', 'refresh_manage_programs_view'
+        ), 'view')
 
     def create_gui(self):
         # Container principal
@@ -54,10 +121,7 @@ class ModernFitnessApp:
         self.content_frame = ctk.CTkFrame(self.main_frame, fg_color=self.colors['card'])
         self.content_frame.pack(side="right", fill="both", expand=True, padx=10)
         
-        # Création des vues
-        self.create_workout_view()
-        self.create_stats_view()
-        self.create_settings_view()
+        # Les vues sont créées par show_view() à leur première visite
 
     def create_sidebar(self):
         sidebar = ctk.CTkFrame(self.main_frame, fg_color=self.colors['card'])
@@ -87,8 +151,7 @@ class ModernFitnessApp:
         
         # Profil utilisateur
         try:
-            with open('data/settings.json', 'r', encoding='utf-8') as f:
-                settings = json.load(f)
+            settings = self.store.settings
                 
             profile_frame = ctk.CTkFrame(sidebar, fg_color='transparent')
             profile_frame.pack(fill="x", pady=20)
@@ -105,28 +168,45 @@ class ModernFitnessApp:
             avatar_frame.pack_propagate(False)
             
             initials = settings['user']['name'][0].upper() if settings['user']['name'] else "U"
-            ctk.CTkLabel(
+            self.avatar_label = ctk.CTkLabel(
                 avatar_frame,
                 text=initials,
                 font=("Roboto", 24, "bold"),
                 text_color=self.colors['card']
-            ).place(relx=0.5, rely=0.5, anchor="center")
+            )
+            self.avatar_label.place(relx=0.5, rely=0.5, anchor="center")
             
             # Infos utilisateur
-            ctk.CTkLabel(
+            self.profile_name_label = ctk.CTkLabel(
                 profile_frame,
                 text=settings['user']['name'],
                 font=("Roboto", 18, "bold"),
                 text_color=self.colors['text']
-            ).pack(pady=5)
+            )
+            self.profile_name_label.pack(pady=5)
             
             stats_text = f"{settings['user']['age']} ans • {settings['user']['weight']}kg"
-            ctk.CTkLabel(
+            self.profile_details_label = ctk.CTkLabel(
                 profile_frame,
                 text=stats_text,
                 font=("Roboto", 14),
                 text_color=self.colors['accent']
-            ).pack()
+            )
+            self.profile_details_label.pack()
+            
+            # Sélection du membre (poste partagé)
+            self.profile_menu = ctk.CTkOptionMenu(
+                profile_frame,
+                values=[],
+                command=self.on_profile_selected,
+                font=("Roboto", 14),
+                fg_color=self.colors['background'],
+                button_color=self.colors['primary'],
+                button_hover_color=self.colors['accent'],
+                width=180
+            )
+            self.profile_menu.pack(pady=(10, 0))
+            self.refresh_profile_menu()
             
         except Exception as e:
             print(f"Erreur lors du chargement du profil: {e}")
@@ -155,6 +235,25 @@ class ModernFitnessApp:
                 height=50
             )
             btn.pack(pady=10)
+        
+        # Durée des images en direct (profilage activé)
+        if self.profiler is not None:
+            self.profiler_label = ctk.CTkLabel(
+                sidebar,
+                text="",
+                font=("Roboto", 12),
+                text_color=self.colors['accent']
+            )
+            self.profiler_label.pack(side="bottom", pady=10)
+            self.scheduler.register('profiler_overlay', self.update_profiler_overlay,
+                                    interval_ms=500, visual=True)
+
+    def update_profiler_overlay(self):
+        fps, mean_ms, max_ms = self.profiler.frame_stats()
+        self.set_label_text(
+            self.profiler_label,
+            f"{fps:.0f} img/s • {mean_ms:.1f} ms (max {max_ms:.1f} ms)"
+        )
 
     def create_workout_view(self):
         # Supprimer l'ancienne vue si elle existe
@@ -164,45 +263,68 @@ class ModernFitnessApp:
         # Créer une nouvelle vue
         self.workout_frame = ctk.CTkFrame(self.content_frame, fg_color='transparent')
         
+        # Page de choix du programme (l'écran de séance est créé au premier départ)
+        self.programs_page = ctk.CTkFrame(self.workout_frame, fg_color='transparent')
+        self.programs_page.pack(fill="both", expand=True)
+        self.active_workout_frame = None
+        
         # Titre
         title = ctk.CTkLabel(
-            self.workout_frame,
+            self.programs_page,
             text="CHOISISSEZ VOTRE ENTRAÎNEMENT",
             font=("Roboto", 32, "bold"),
             text_color=self.colors['primary']
         )
         title.pack(pady=20)
         
+        # Liste virtualisée : seules les cartes visibles sont créées
+        self.workout_program_items = []
+        self.programs_list = VirtualList(
+            self.programs_page,
+            row_height=self.PROGRAM_CARD_HEIGHT,
+            create_row=self.create_program_card,
+            bind_row=self.bind_program_card,
+            canvas_color=self.colors['card'],
+            fg_color='transparent',
+            height=600  # Hauteur fixe pour activer le défilement
+        )
+        self.programs_list.pack(fill="both", expand=True, padx=20, pady=10)
+        
+        self.programs_error_label = ctk.CTkLabel(
+            self.programs_page,
+            text="Erreur lors du chargement des programmes",
+            font=("Roboto", 18),
+            text_color=self.colors['secondary']
+        )
+        
+        self.workout_programs_revision = None
+        self.refresh_workout_view()
+
+    def refresh_workout_view(self):
+        """Recharge la liste seulement si les programmes ont changé"""
         try:
-            # Charger les programmes d'entraînement
-            with open('data/workout_programs.json', 'r', encoding='utf-8') as f:
-                self.workout_programs = json.load(f)
-            
-            # Conteneur défilable pour les programmes
-            programs_container = ctk.CTkScrollableFrame(
-                self.workout_frame,
-                fg_color='transparent',
-                height=600  # Hauteur fixe pour activer le défilement
-            )
-            programs_container.pack(fill="x", padx=20, pady=10)
+            revision = self.store.revision('programs')
+            if revision == self.workout_programs_revision:
+                return
             
-            # Créer une carte pour chaque programme
-            for program_id, program in self.workout_programs.items():
-                self.create_program_card(programs_container, program_id, program)
+            # Charger les programmes d'entraînement
+            self.workout_programs = self.store.programs
+            self.workout_program_items = list(self.workout_programs.items())
+            self.programs_list.set_count(len(self.workout_program_items))
+            self.programs_error_label.pack_forget()
+            self.workout_programs_revision = revision
         
         except Exception as e:
             print(f"Erreur lors du chargement des programmes : {e}")
             # Afficher un message d'erreur dans l'interface
-            ctk.CTkLabel(
-                self.workout_frame,
-                text="Erreur lors du chargement des programmes",
-                font=("Roboto", 18),
-                text_color=self.colors['secondary']
-            ).pack(pady=20)
+            self.programs_list.set_count(0)
+            self.programs_error_label.pack(pady=20)
 
-    def create_program_card(self, container, program_id, program):
-        card = ctk.CTkFrame(container, fg_color=self.colors['card'])
-        card.pack(fill="x", padx=20, pady=5)
+    def create_program_card(self, container):
+        """Crée une carte vide, remplie ensuite par bind_program_card"""
+        row = ctk.CTkFrame(container, fg_color=self.colors['card'])
+        card = ctk.CTkFrame(row, fg_color=self.colors['card'])
+        card.pack(fill="both", expand=True, padx=20, pady=5)
         
         # En-tête
         header = ctk.CTkFrame(card, fg_color='transparent')
@@ -212,40 +334,62 @@ class ModernFitnessApp:
         info_frame = ctk.CTkFrame(header, fg_color='transparent')
         info_frame.pack(side="left", fill="x", expand=True)
         
-        ctk.CTkLabel(
+        row.name_label = ctk.CTkLabel(
             info_frame,
-            text=program['name'],
+            text="",
             font=("Roboto", 20, "bold"),
             text_color=self.colors['text']
-        ).pack(anchor="w")
+        )
+        row.name_label.pack(anchor="w")
         
-        ctk.CTkLabel(
+        row.description_label = ctk.CTkLabel(
             info_frame,
-            text=program['description'],
+            text="",
             font=("Roboto", 14),
             text_color=self.colors['text']
-        ).pack(anchor="w")
-        
-        # Boutons de durée
-        duration_frame = ctk.CTkFrame(card, fg_color='transparent')
-        duration_frame.pack(fill="x", padx=15, pady=10)
-        
-        for duration in program['durations']:
-            ctk.CTkButton(
-                duration_frame,
-                text=f"⏱️ {duration['name']}",
-                command=lambda p_id=program_id, d=duration: self.start_workout(p_id, d),
+        )
+        row.description_label.pack(anchor="w")
+        
+        # Boutons de durée (créés à la demande, réutilisés d'un programme à l'autre)
+        row.duration_frame = ctk.CTkFrame(card, fg_color='transparent')
+        row.duration_frame.pack(fill="x", padx=15, pady=10)
+        row.duration_buttons = []
+        row.visible_buttons = 0
+        return row
+
+    def bind_program_card(self, row, index):
+        """Affiche le programme index dans une carte existante"""
+        program_id, program = self.workout_program_items[index]
+        self.set_label_text(row.name_label, program['name'])
+        self.set_label_text(row.description_label, program['description'])
+        
+        durations = program['durations']
+        while len(row.duration_buttons) < len(durations):
+            row.duration_buttons.append(ctk.CTkButton(
+                row.duration_frame,
+                text="",
                 font=("Roboto", 16),
                 fg_color=self.colors['secondary'],
                 hover_color=self.colors['accent'],
                 width=120
-            ).pack(side="left", padx=5)
+            ))
+        
+        for button, duration in zip(row.duration_buttons, durations):
+            self.set_label_text(button, f"⏱️ {duration['name']}")
+            button.configure(command=lambda p_id=program_id, d=duration: self.start_workout(p_id, d))
+        
+        # Ne réorganiser les boutons que si leur nombre change
+        if row.visible_buttons != len(durations):
+            for button in row.duration_buttons:
+                button.pack_forget()
+            for button in row.duration_buttons[:len(durations)]:
+                button.pack(side="left", padx=5)
+            row.visible_buttons = len(durations)
 
     def create_stats_view(self):
-        # Nettoyer la vue précédente
+        # Supprimer la vue précédente
         if hasattr(self, 'stats_frame'):
-            for widget in self.stats_frame.winfo_children():
-                widget.destroy()
+            self.stats_frame.destroy()
         
         self.stats_frame = ctk.CTkFrame(self.content_frame, fg_color='transparent')
         
@@ -258,25 +402,56 @@ class ModernFitnessApp:
         ).pack(pady=20)
         
         # Conteneur pour les stats
-        stats_container = ctk.CTkFrame(self.stats_frame, fg_color=self.colors['card'])
-        stats_container.pack(fill="x", padx=20, pady=10)
-        
+        self.stats_container = ctk.CTkFrame(self.stats_frame, fg_color=self.colors['card'])
+        self.stats_container.pack(fill="x", padx=20, pady=10)
+        
+        # Labels des valeurs, créés une fois puis mis à jour
+        self.stat_labels = {}
+        self.stats_error_label = ctk.CTkLabel(
+            self.stats_container,
+            text="Erreur lors du chargement des statistiques",
+            font=("Roboto", 18),
+            text_color=self.colors['secondary']
+        )
+        self.refresh_stats_view()
+
+    def collect_stats(self):
+        """Liste des statistiques affichées : (libellé, valeur)"""
+        summary = self.core.stats_summary()
+        average = int(summary['average_duration'])
+        
+        # Statistiques principales (compteurs tenus à jour, sans parcourir
+        # l'historique)
+        stats = [
+            ("💪 Entraînements totaux", summary['total_workouts']),
+            ("🍖 Calories brûlées", summary['total_calories']),
+            ("🎯 Série actuelle", summary['streak']),
+            ("⭐ Meilleure série", summary['best_streak']),
+            ("⏱️ Séances minuteur complétées", self.timer_completions),
+            ("📅 Calories cette semaine", summary['week_calories']),
+            ("🗓️ Calories ce mois", summary['month_calories']),
+            ("⌛ Durée moyenne", f"{average // 60} min {average % 60:02d} s"),
+            ("🏆 Programme favori", summary['favorite_program'] or "-"),
+            ("📈 Calories / jour (7 jours)", f"{summary['week_average_calories']:.0f}"),
+            ("⏳ Durée médiane / 90e centile",
+             f"{summary['median_duration']:.0f} s / {summary['p90_duration']:.0f} s")
+        ]
+        return stats
+
+    def refresh_stats_view(self):
+        """Met à jour les valeurs affichées sans recréer les widgets"""
         try:
-            # Charger les données de progression
-            with open('data/progress.json', 'r') as f:
-                progress_data = json.load(f)
-            
-            # Afficher les statistiques principales
-            stats = [
-                ("💪 Entraînements totaux", progress_data['stats']['total_workouts']),
-                ("🍖 Calories brûlées", progress_data['stats']['total_calories']),
-                ("🎯 Série actuelle", progress_data['stats']['streak']),
-                ("⭐ Meilleure série", progress_data['stats']['best_streak']),
-                ("⏱️ Séances minuteur complétées", self.timer_completions)
-            ]
-            
-            for label, value in stats:
-                stat_frame = ctk.CTkFrame(stats_container, fg_color='transparent')
+            stats = self.collect_stats()
+        except Exception as e:
+            # Afficher un message d'erreur si le fichier ne peut pas être lu
+            print(f"Erreur lors du chargement des statistiques: {e}")
+            self.stats_error_label.pack(pady=20)
+            return
+        
+        self.stats_error_label.pack_forget()
+        for label, value in stats:
+            if label not in self.stat_labels:
+                stat_frame = ctk.CTkFrame(self.stats_container, fg_color='transparent')
                 stat_frame.pack(fill="x", padx=15, pady=10)
                 
                 ctk.CTkLabel(
@@ -286,21 +461,22 @@ class ModernFitnessApp:
                     text_color=self.colors['text']
                 ).pack(side="left")
                 
-                ctk.CTkLabel(
+                value_label = ctk.CTkLabel(
                     stat_frame,
-                    text=str(value),
+                    text="",
                     font=("Roboto", 18, "bold"),
                     text_color=self.colors['primary']
-                ).pack(side="right")
+                )
+                value_label.pack(side="right")
+                self.stat_labels[label] = value_label
             
-        except Exception as e:
-            # Afficher un message d'erreur si le fichier ne peut pas être lu
-            ctk.CTkLabel(
-                stats_container,
-                text="Erreur lors du chargement des statistiques",
-                font=("Roboto", 18),
-                text_color=self.colors['secondary']
-            ).pack(pady=20)
+            self.set_label_text(self.stat_labels[label], value)
+
+    def set_label_text(self, label, text):
+        """Reconfigure un label seulement si son texte change"""
+        text = str(text)
+        if label.cget('text') != text:
+            label.configure(text=text)
 
     def create_settings_view(self):
         self.settings_frame = ctk.CTkFrame(self.content_frame, fg_color='transparent')
@@ -316,6 +492,7 @@ class ModernFitnessApp:
         # Création des onglets
         tabs = ctk.CTkTabview(self.settings_frame)
         tabs.pack(fill="both", expand=True, padx=20, pady=10)
+        self.settings_tabs = tabs
         
         # Ajouter les onglets
         tabs.add("Général")
@@ -327,11 +504,23 @@ class ModernFitnessApp:
         # Onglet Programmes
         self.create_programs_settings(tabs.tab("Programmes"))
 
+    def refresh_programs_tab(self):
+        """Relie la liste de l'onglet Programmes aux données si elles ont changé"""
+        if not hasattr(self, 'settings_programs_list'):
+            return
+        revision = self.store.revision('programs')
+        if revision == self.settings_programs_revision:
+            return
+        
+        # Les lignes existantes sont réutilisées, seules les données changent
+        self.settings_program_items = list(self.store.programs.items())
+        self.settings_programs_list.set_count(len(self.settings_program_items))
+        self.settings_programs_revision = revision
+
     def create_general_settings(self, parent):
         # Charger les paramètres actuels
         try:
-            with open('data/settings.json', 'r', encoding='utf-8') as f:
-                settings = json.load(f)
+            settings = self.store.settings
             
             # Paramètres utilisateur
             user_frame = ctk.CTkFrame(parent, fg_color=self.colors['card'])
@@ -353,12 +542,13 @@ class ModernFitnessApp:
             avatar_frame.pack_propagate(False)
             
             initials = settings['user']['name'][0].upper() if settings['user']['name'] else "U"
-            ctk.CTkLabel(
+            self.settings_avatar_label = ctk.CTkLabel(
                 avatar_frame,
                 text=initials,
                 font=("Roboto", 24, "bold"),
                 text_color=self.colors['card']
-            ).place(relx=0.5, rely=0.5, anchor="center")
+            )
+            self.settings_avatar_label.place(relx=0.5, rely=0.5, anchor="center")
             
             ctk.CTkLabel(
                 header_frame,
@@ -418,19 +608,8 @@ class ModernFitnessApp:
 
     def save_user_settings(self):
         try:
-            with open('data/settings.json', 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-            
             # Mettre à jour les paramètres utilisateur
-            for key, var in self.user_vars.items():
-                value = var.get()
-                # Convertir en nombre si nécessaire
-                if key in ['age', 'weight', 'height']:
-                    value = int(value)
-                settings['user'][key] = value
-            
-            with open('data/settings.json', 'w', encoding='utf-8') as f:
-                json.dump(settings, f, indent=4)
+            self.core.update_user({key: var.get() for key, var in self.user_vars.items()})
             
             # Rafraîchir la barre latérale
             self.refresh_sidebar()
@@ -442,14 +621,88 @@ class ModernFitnessApp:
             self.show_error_dialog("Erreur lors de la sauvegarde des paramètres")
 
     def refresh_sidebar(self):
-        # Supprimer l'ancienne barre latérale
-        if hasattr(self, 'main_frame'):
+        """Met à jour le profil affiché dans la barre latérale"""
+        if not hasattr(self, 'profile_name_label'):
+            # Le profil n'a pas pu être affiché au démarrage : recréer la barre
             for widget in self.main_frame.winfo_children():
                 if isinstance(widget, ctk.CTkFrame) and widget != self.content_frame:
                     widget.destroy()
+            self.create_sidebar()
+            return
         
-        # Recréer la barre latérale
-        self.create_sidebar()
+        user = self.store.user
+        self.set_label_text(self.avatar_label, user['name'][0].upper() if user['name'] else "U")
+        self.set_label_text(self.profile_name_label, user['name'])
+        self.set_label_text(self.profile_details_label, f"{user['age']} ans • {user['weight']}kg")
+        self.refresh_profile_menu()
+
+    def refresh_profile_menu(self):
+        """Liste les profils dans le menu de la barre latérale"""
+        # libellé affiché -> id du profil (les homonymes sont numérotés)
+        self.profile_choices = {}
+        current = None
+        for profile_id, name in self.core.profiles.names():
+            label = name
+            number = 2
+            while label in self.profile_choices:
+                label = f"{name} ({number})"
+                number += 1
+            self.profile_choices[label] = profile_id
+            if profile_id == self.core.profile_id:
+                current = label
+        
+        self.profile_menu.configure(values=list(self.profile_choices) + [self.NEW_PROFILE_LABEL])
+        self.profile_menu.set(current)
+
+    def on_profile_selected(self, choice):
+        if choice == self.NEW_PROFILE_LABEL:
+            self.create_profile()
+        elif choice in self.profile_choices:
+            self.switch_profile(self.profile_choices[choice])
+
+    def create_profile(self):
+        dialog = ctk.CTkInputDialog(text="Nom du nouveau membre :", title="Nouveau profil")
+        name = (dialog.get_input() or "").strip()
+        if not name:
+            # Création annulée : revenir au profil courant
+            self.refresh_profile_menu()
+            return
+        try:
+            profile_id = self.core.create_profile(name)
+        except Exception as e:
+            print(f"Erreur lors de la création du profil : {e}")
+            self.show_error_dialog("Erreur lors de la création du profil")
+            self.refresh_profile_menu()
+            return
+        self.switch_profile(profile_id)
+
+    def switch_profile(self, profile_id):
+        """Affiche un autre membre ; seules ses données sont chargées"""
+        if self.timer_running:
+            messagebox.showinfo("Profil", "Terminez la séance en cours avant de changer de profil.")
+            self.refresh_profile_menu()
+            return
+        try:
+            self.core.switch_profile(profile_id)
+        except Exception as e:
+            print(f"Erreur lors du changement de profil : {e}")
+            self.show_error_dialog("Erreur lors du changement de profil")
+            self.refresh_profile_menu()
+            return
+        
+        self.store = self.core.store
+        if self.profiler is not None:
+            self.profiler.instrument(self.store, ('load', 'save'), 'json')
+        
+        # Mettre à jour les vues déjà construites
+        self.refresh_sidebar()
+        if hasattr(self, 'stats_frame'):
+            self.refresh_stats_view()
+        if hasattr(self, 'user_vars'):
+            user = self.store.user
+            for key, var in self.user_vars.items():
+                var.set(str(user[key]))
+            self.set_label_text(self.settings_avatar_label, user['name'][0].upper() if user['name'] else "U")
 
     def toggle_timer(self):
         """Démarre ou met en pause le minuteur"""
@@ -458,89 +711,54 @@ class ModernFitnessApp:
         
         if self.timer_running:
             self.timer_running = False
+            self.countdown.pause()
             self.start_button.configure(text="REPRENDRE")
         else:
             self.timer_running = True
+            self.countdown.start()
             self.start_button.configure(text="PAUSE")
-            self.update_timer()
+            self.scheduler.register('timer', self.update_timer, interval_ms=1000)
 
     def update_timer(self):
         if not self.timer_running:
-            return
+            return False
         
+        self.time_remaining = self.countdown.remaining_seconds()
         if self.time_remaining > 0:
             mins, secs = divmod(self.time_remaining, 60)
             self.timer_label.configure(text=f"{mins:02d}:{secs:02d}")
-            self.time_remaining -= 1
-            self.window.after(1000, self.update_timer)
+            # Prochain tick exactement au changement de seconde
+            return self.countdown.ms_until_next_tick()
         else:
             self.timer_running = False
             self.start_button.configure(text="DÉMARRER")
             self.timer_completions += 1
             self.update_progress_file()
             self.show_completion_message()
+            return False
 
     def update_progress_file(self, program):
         try:
-            with open('data/progress.json', 'r') as f:
-                progress_data = json.load(f)
-            
-            today = datetime.now().strftime("%Y-%m-%d")
-            
-            # Mettre à jour les statistiques
-            progress_data['stats']['total_workouts'] += 1
-            progress_data['stats']['total_calories'] += self.current_duration['calories']
-            
-            # Mettre à jour la série
-            last_date = progress_data['stats']['last_workout_date']
-            if last_date:
-                last_date = datetime.strptime(last_date, "%Y-%m-%d")
-                if (datetime.now() - last_date).days == 1:
-                    progress_data['stats']['streak'] += 1
-                    progress_data['stats']['best_streak'] = max(
-                        progress_data['stats']['streak'],
-                        progress_data['stats']['best_streak']
-                    )
-                elif (datetime.now() - last_date).days > 1:
-                    progress_data['stats']['streak'] = 1
+            session = getattr(self, 'session', None)
+            if session is not None and session.program is program:
+                # Exercices comptés sur le déroulé de la séance
+                self.core.complete_session(session)
             else:
-                progress_data['stats']['streak'] = 1
-            
-            progress_data['stats']['last_workout_date'] = today
-            
-            # Ajouter à l'historique
-            new_workout = {
-                "date": today,
-                "workout": program['name'],
-                "duration": self.current_duration['name'],
-                "completed": True,
-                "calories": self.current_duration['calories'],
-                "time": self.current_duration['time'],
-                "exercises_completed": len(program['exercises'])
-            }
-            progress_data['history'].append(new_workout)
-            
-            # Mettre à jour le compteur de ce type d'entraînement
-            program_type = program['name'].split()[0]
-            if program_type in progress_data['workout_counts']:
-                progress_data['workout_counts'][program_type] += 1
-            
-            with open('data/progress.json', 'w') as f:
-                json.dump(progress_data, f, indent=4)
-                
+                self.core.record_workout(program, self.current_duration)
         except Exception as e:
             print(f"Erreur lors de la mise à jour des statistiques: {e}")
 
     def reset_timer(self):
         self.timer_running = False
         self.time_remaining = 60
+        self.countdown.reset(self.time_remaining)
         self.timer_label.configure(text="01:00")
         self.start_button.configure(text="DÉMARRER")
 
     def show_completion_message(self):
         popup = ctk.CTkToplevel()
         popup.title("Exercice terminé!")
-        popup.geometry("300x200")
+        popup.geometry(f"300x{200 + 30 * len(self.core.new_achievements)}")
         
         # Centrer la fenêtre popup
         x = self.window.winfo_x() + (self.window.winfo_width() // 2) - 150
@@ -560,6 +778,15 @@ class ModernFitnessApp:
             text_color=self.colors['primary']
         ).pack(pady=20)
         
+        # Succès débloqués par cette séance
+        for achievement in self.core.new_achievements:
+            ctk.CTkLabel(
+                popup,
+                text=f"🏆 {achievement['name']}",
+                font=("Roboto", 16),
+                text_color=self.colors['text']
+            ).pack()
+        
         ctk.CTkButton(
             popup,
             text="OK",
@@ -569,54 +796,126 @@ class ModernFitnessApp:
         ).pack(pady=10)
 
     def show_view(self, view_name):
+        # Chaque vue est créée une fois puis seulement mise à jour
+        views = {
+            'workout': (self.create_workout_view, self.refresh_workout_view),
+            'stats': (self.create_stats_view, self.refresh_stats_view),
+            'manage_programs': (self.create_manage_programs_view, self.refresh_manage_programs_view),
+            'settings': (self.create_settings_view, self.refresh_programs_tab)
+        }
+        
         # Cacher toutes les vues
-        for view in ['workout', 'stats', 'manage_programs', 'settings']:
+        for view in views:
             if hasattr(self, f'{view}_frame'):
                 getattr(self, f'{view}_frame').pack_forget()
         
         # Afficher la vue demandée
-        if view_name == 'workout':
-            self.create_workout_view()  # Recréer la vue workout
-        elif view_name == 'stats':
-            self.create_stats_view()    # Recréer la vue stats
-        elif view_name == 'manage_programs':
-            self.create_manage_programs_view()
+        if view_name in views:
+            create, refresh = views[view_name]
+            if hasattr(self, f'{view_name}_frame'):
+                refresh()
+            else:
+                create()
         
         if hasattr(self, f'{view_name}_frame'):
             getattr(self, f'{view_name}_frame').pack(fill="both", expand=True)
+        self.current_view = view_name
+        
+        # Les animations des vues masquées sont suspendues
+        self.scheduler.set_active_view(view_name)
+
+    def on_window_visibility(self, event, visible):
+        # <Map>/<Unmap> remontent aussi des widgets enfants : seule la fenêtre compte
+        if event.widget is self.window:
+            self.scheduler.set_window_visible(visible)
 
     def start_animation(self):
         def animate():
-            self.progress = (self.progress + 2) % 360
-            r = int(abs(math.sin(math.radians(self.progress))) * 255)  # Ajout de la parenthèse fermante
-            g = int(abs(math.sin(math.radians(self.progress + 120))) * 255)  # Ajout de la parenthèse fermante
-            b = int(abs(math.sin(math.radians(self.progress + 240))) * 255)  # Ajout de la parenthèse fermante
-            color = f'#{r:02x}{g:02x}{b:02x}'
-            self.logo_label.configure(text_color=color)
-            self.window.after(50, animate)
+            # Couleurs du dégradé précalculées (un pas de 2° par image)
+            self.progress = (self.progress + 1) % len(LOGO_CYCLE)
+            self.logo_label.configure(text_color=LOGO_CYCLE[self.progress])
+        
+        self.scheduler.register('logo', animate, interval_ms=50, visual=True)
+
+    def on_first_paint(self):
+        self.startup.mark("premier affichage")
+        self.startup.print_report()
+
+    def run(self, use_asyncio=False):
+        if not use_asyncio:
+            self.window.mainloop()
+            return
         
-        animate()
+        # Boucle asyncio : Tk est traité par pump(), les tâches de fond
+        # s'écrivent en coroutines (self.spawn)
+        from async_loop import AsyncTkLoop
+        self.async_loop = AsyncTkLoop(self.window)
+        self.async_loop.run(self.compact_history())
+
+    def spawn(self, coro):
+        """Lance une coroutine à côté de l'interface (mode asyncio seulement)"""
+        return self.async_loop.spawn(coro)
+
+    async def compact_history(self):
+        """Fusionne les segments de l'historique en arrière-plan, au démarrage"""
+        from async_loop import worker_call
+        history = self.core.history
+        if self.core.database is not None or len(history.segments()) < 3:
+            return
+        # Même file que les ajouts de séances : jamais en même temps qu'eux
+        await worker_call(self.worker, history.directory, history.compact)
 
-    def run(self):
-        self.window.mainloop()
+    def on_close(self):
+        # Une séance en cours compte pour ses exercices déjà terminés
+        self.abandon_workout()
+        # Écrire les sauvegardes en attente avant de quitter
+        self.core.close()
+        self.worker.close()
+        self.scheduler.stop()
+        if self.profiler is not None:
+            path = self.profiler.export_chrome_trace(Profiler.trace_path())
+            print(f"Profil enregistré dans {path}")
+        self.window.destroy()
 
     def start_workout(self, program_id, duration):
-        self.current_program = self.workout_programs[program_id]
+        self.session = self.core.start_session(program_id, duration)
+        self.current_program = self.session.program
         self.current_duration = duration
         self.time_remaining = duration['time']
         self.total_time = duration['time']
+        self.countdown = self.session.countdown
         
-        # Nettoyer la vue précédente
-        for widget in self.workout_frame.winfo_children():
-            widget.destroy()
+        # L'écran de séance est créé une fois puis réutilisé
+        if self.active_workout_frame is None:
+            self.create_active_workout_view()
         
-        # Recréer le frame principal avec une taille fixe
-        self.workout_frame.configure(width=1200, height=700)
-        self.workout_frame.pack_propagate(False)  # Empêcher le redimensionnement automatique
+        # Afficher la vue d'exercice actif à la place de la liste
+        self.programs_page.pack_forget()
+        self.active_workout_frame.pack(expand=True)  # Centrer le frame
         
-        # Afficher la vue d'exercice actif
+        # Mettre à jour les informations de la séance
+        self.set_label_text(self.timer_label, f"{duration['time']:02d}")
+        self.set_label_text(self.workout_name_label, self.current_program['name'])
+        self.update_segment_label()
+        self.set_label_text(self.pause_button, "PAUSE")
+        self.progress_var.set(0)
+        
+        # Animation initiale
+        self.pulse_size = 1.0
+        self.pulse_growing = True
+        
+        # Démarrer l'animation puis le timer (une seule boucle chacun,
+        # même si l'entraînement est relancé)
+        self.timer_running = True
+        self.scheduler.register('circles', self.animate_circles, view='workout')
+        self.scheduler.register('workout_timer', self.update_workout_timer, interval_ms=1000)
+        
+        # Forcer une mise à jour immédiate de l'interface
+        self.window.update_idletasks()
+        self.window.update()
+
+    def create_active_workout_view(self):
         self.active_workout_frame = ctk.CTkFrame(self.workout_frame, fg_color=self.colors['card'])
-        self.active_workout_frame.place(relx=0.5, rely=0.5, anchor="center")  # Centrer le frame
         
         # Créer le canvas pour l'animation
         self.canvas = ctk.CTkCanvas(
@@ -638,23 +937,40 @@ class ModernFitnessApp:
                 dash=(1, 1)  # Créer un effet pointillé
             )
             self.circles.append(circle)
+        # Changements des cercles regroupés par image, qualité adaptative
+        self.circle_render = RenderPipeline(self.canvas)
+        # Option : images précalculées à la place des cercles vectoriels
+        self.circle_atlas = None
+        self.atlas_item = None
+        if self.store.settings.get('app', {}).get('animation') == 'atlas':
+            self.start_circle_atlas()
         
         # Timer au centre du cercle
         self.timer_label = ctk.CTkLabel(
             self.active_workout_frame,
-            text=f"{duration['time']:02d}",
+            text="00",
             font=("Roboto", 72, "bold"),
             text_color=self.colors['primary']
         )
         self.timer_label.pack(pady=10)
         
         # Nom de l'entraînement
-        ctk.CTkLabel(
+        self.workout_name_label = ctk.CTkLabel(
             self.active_workout_frame,
-            text=self.current_program['name'],
+            text="",
             font=("Roboto", 24, "bold"),
             text_color=self.colors['primary']
-        ).pack(pady=10)
+        )
+        self.workout_name_label.pack(pady=10)
+        
+        # Exercice et série en cours (ou repos)
+        self.segment_label = ctk.CTkLabel(
+            self.active_workout_frame,
+            text="",
+            font=("Roboto", 18),
+            text_color=self.colors['text']
+        )
+        self.segment_label.pack(pady=5)
         
         # Barre de progression
         self.progress_var = ctk.DoubleVar(value=0)
@@ -668,117 +984,129 @@ class ModernFitnessApp:
         )
         self.progress_bar.pack(pady=20)
         
-        # Animation initiale
-        self.pulse_size = 1.0
-        self.pulse_growing = True
-        self.animate_circles()
-        
-        # Démarrer le timer
-        self.timer_running = True
-        self.animate_circles()  # Démarrer l'animation avant le timer
-        self.update_workout_timer()
+        # Pause / reprise de la séance
+        self.pause_button = ctk.CTkButton(
+            self.active_workout_frame,
+            text="PAUSE",
+            command=self.toggle_workout_pause,
+            font=("Roboto", 16),
+            fg_color=self.colors['secondary'],
+            hover_color=self.colors['accent'],
+            width=120
+        )
+        self.pause_button.pack(pady=10)
         
-        # Forcer une mise à jour immédiate de l'interface
-        self.window.update_idletasks()
-        self.window.update()
+        # Arrêt avant la fin : les exercices terminés sont enregistrés
+        self.stop_button = ctk.CTkButton(
+            self.active_workout_frame,
+            text="ARRÊTER",
+            command=self.stop_workout,
+            font=("Roboto", 16),
+            fg_color=self.colors['background'],
+            hover_color=self.colors['accent'],
+            width=120
+        )
+        self.stop_button.pack(pady=5)
 
     def animate_circles(self):
         if not self.timer_running:
-            return
-        
-        center_x, center_y = 150, 150
-        base_radius = 100
-        
-        # Animation pour chaque cercle
-        for i, circle in enumerate(self.circles):
-            # Calculer l'angle et le rayon pour chaque cercle
-            phase = time.time() * (2 - i * 0.5)  # Vitesses différentes pour chaque cercle
-            scale = 0.1 * math.sin(phase * 2) + 1.0  # chelle d'oscillation
-            
-            # Rayon spécifique pour chaque cercle
-            radius = base_radius * (1 + i * 0.2) * scale
-            
-            # Ajouter un mouvement circulaire
-            orbit_radius = 10  # Rayon de l'orbite
-            orbit_speed = 2 * (i + 1)  # Vitesse de rotation différente pour chaque cercle
-            orbit_x = math.cos(time.time() * orbit_speed) * orbit_radius
-            orbit_y = math.sin(time.time() * orbit_speed) * orbit_radius
-            
-            # Mettre à jour la position du cercle avec le mouvement orbital
-            self.canvas.coords(circle,
-                center_x - radius + orbit_x,
-                center_y - radius + orbit_y,
-                center_x + radius + orbit_x,
-                center_y + radius + orbit_y
-            )
-            
-            # Couleur dynamique pour chaque cercle
-            hue = (time.time() * 50 + i * 30) % 360
-            color = self.hsv_to_rgb(hue, 1, 1)
-            self.canvas.itemconfig(circle, outline=color)
-            
-            # Faire tourner le motif pointillé
-            dash_offset = int(time.time() * 50) % 20
-            self.canvas.itemconfig(circle, dash=(1, 1), dashoffset=dash_offset)
-        
-        # Effet de pulsation pour le texte du timer
-        pulse = abs(math.sin(time.time() * 2)) * 0.2 + 0.8
-        self.timer_label.configure(text_color=self.hsv_to_rgb(time.time() * 50 % 360, 0.7, 1))
+            return False
+        
+        render = self.circle_render
+        render.begin()
+        level = render.level
+        now = time.time()
+        # Indice de teinte de l'image : 50° par seconde ; en qualité réduite,
+        # la couleur change par paliers (moins de reconfigurations)
+        hue = int(now * 50)
+        if level < HIGH:
+            hue -= hue % 4
+        
+        if self.circle_atlas is not None:
+            # Images précalculées : on affiche celle de l'instant
+            render.canvas.itemconfig(self.atlas_item, image=self.circle_atlas.frame_at(now))
+        else:
+            # Animation pour chaque cercle : orbite et pulsation
+            for i, circle in enumerate(self.circles):
+                render.canvas.coords(circle, *circle_bbox(now, i))
+                
+                # Couleur dynamique pour chaque cercle (palette précalculée) ;
+                # le motif pointillé ne tourne qu'en haute qualité
+                if level == HIGH:
+                    render.canvas.itemconfig(circle, outline=CIRCLE_PALETTE[hue + i * 30], dashoffset=hue % 20)
+                else:
+                    render.canvas.itemconfig(circle, outline=CIRCLE_PALETTE[hue + i * 30])
         
-        if self.timer_running:
-            self.window.after(20, self.animate_circles)  # Animation plus fluide (50 FPS)
+        # Couleur du texte du timer
+        render.configure(self.timer_label, text_color=TIMER_PALETTE[hue])
+        # Changements appliqués en une fois ; cadence selon la qualité
+        return render.end()
+
+    def start_circle_atlas(self):
+        """Dessine (ou relit) les images des cercles sur un thread d'écriture"""
+        from sprite_atlas import SpriteAtlas
+        atlas = SpriteAtlas(
+            background=self.colors['card'],
+            cache_dir=os.path.join(self.core.data_dir, 'cache')
+        )
+        self.worker.submit('sprite_atlas', atlas.build, on_done=lambda: self.use_circle_atlas(atlas))
+
+    def use_circle_atlas(self, atlas):
+        """Remplace les cercles vectoriels par les images précalculées"""
+        self.atlas_item = self.canvas.create_image(150, 150, image=atlas.frame_at(time.time()))
+        for circle in self.circles:
+            self.canvas.itemconfig(circle, state='hidden')
+        self.circle_atlas = atlas
 
     def hsv_to_rgb(self, h, s, v):
         """Convertit HSV en code couleur RGB hexadécimal"""
-        h = h / 360
-        if s == 0.0:
-            return '#%02x%02x%02x' % (v, v, v)
-        
-        i = int(h * 6.0)
-        f = (h * 6.0) - i
-        p = v * (1.0 - s)
-        q = v * (1.0 - s * f)
-        t = v * (1.0 - s * (1.0 - f))
-        i = i % 6
-        
-        if i == 0:
-            r, g, b = v, t, p
-        elif i == 1:
-            r, g, b = q, v, p
-        elif i == 2:
-            r, g, b = p, v, t
-        elif i == 3:
-            r, g, b = p, q, v
-        elif i == 4:
-            r, g, b = t, p, v
+        return hsv_to_hex(h, s, v)
+
+    def toggle_workout_pause(self):
+        """Met en pause ou reprend la séance sans fausser le temps restant"""
+        if self.countdown.running:
+            self.countdown.pause()
+            self.timer_running = False
+            self.pause_button.configure(text="REPRENDRE")
         else:
-            r, g, b = v, p, q
-        
-        return '#%02x%02x%02x' % (int(r * 255), int(g * 255), int(b * 255))
+            self.countdown.resume()
+            self.timer_running = True
+            self.pause_button.configure(text="PAUSE")
+            self.scheduler.register('circles', self.animate_circles, view='workout')
+            self.scheduler.register('workout_timer', self.update_workout_timer, interval_ms=1000)
 
     def update_workout_timer(self):
         if not self.timer_running:
-            return
+            return False
         
+        # Le temps restant est déduit de l'horloge monotone : un tick en
+        # retard ne rallonge pas la séance
+        self.time_remaining = self.countdown.remaining_seconds()
         if self.time_remaining > 0:
             # Afficher les secondes
-            self.timer_label.configure(text=f"{self.time_remaining:02d}")
+            self.set_label_text(self.timer_label, f"{self.time_remaining:02d}")
             
             # Mise à jour de la barre de progression
-            elapsed_time = self.total_time - self.time_remaining
-            progress = elapsed_time / self.total_time
-            self.progress_var.set(progress)
+            self.progress_var.set(self.countdown.progress())
+            self.update_segment_label()
             
             # Effet de "battement" plus prononcé à chaque seconde
-            def pulse_effect():
-                self.pulse_size = 1.2  # Expansion rapide
-                self.window.after(100, lambda: setattr(self, 'pulse_size', 1.0))  # Retour à la normale
+            def end_pulse():
+                self.pulse_size = 1.0  # Retour à la normale
+                return False
             
-            pulse_effect()
-            self.time_remaining -= 1
-            self.window.after(1000, self.update_workout_timer)
+            self.pulse_size = 1.2  # Expansion rapide
+            self.scheduler.register('pulse', end_pulse, delay_ms=100)
+            
+            # Prochain tick exactement au changement de seconde
+            return self.countdown.ms_until_next_tick()
         else:
             self.complete_workout()
+            return False
+
+    def update_segment_label(self):
+        segment = self.session.current_segment()
+        self.set_label_text(self.segment_label, segment.label if segment is not None else "")
 
     def complete_workout(self):
         self.timer_running = False
@@ -786,19 +1114,38 @@ class ModernFitnessApp:
         self.show_completion_message()
         
         # Attendre un court instant avant de réinitialiser la vue
-        self.window.after(1000, self.reset_workout_view)
+        def reset():
+            self.reset_workout_view()
+            return False
+        
+        self.scheduler.register('reset_workout', reset, delay_ms=1000)
+
+    def stop_workout(self):
+        """Arrête la séance en cours et revient à la liste des programmes"""
+        self.timer_running = False
+        self.countdown.pause()
+        self.abandon_workout()
+        self.reset_workout_view()
+
+    def abandon_workout(self):
+        """Enregistre la séance en cours comme non terminée, avec les
+        exercices réellement terminés"""
+        session = getattr(self, 'session', None)
+        if session is None or session.finished:
+            return
+        try:
+            self.core.abandon_session(session)
+        except Exception as e:
+            print(f"Erreur lors de la mise à jour des statistiques: {e}")
 
     def reset_workout_view(self):
         # Arrêter l'animation
         self.timer_running = False
         
-        # Nettoyer complètement la vue
-        for widget in self.workout_frame.winfo_children():
-            widget.destroy()
-        
-        # Réinitialiser la configuration du frame
-        self.workout_frame.pack_propagate(True)
-        self.workout_frame.configure(width=None, height=None)  # Réinitialiser les dimensions fixes
+        # Masquer l'écran de séance (conservé pour la prochaine séance)
+        if self.active_workout_frame is not None:
+            self.active_workout_frame.pack_forget()
+        self.programs_page.pack(fill="both", expand=True)
         
         # Retourner à la vue principale des entraînements
         self.show_view('workout')
@@ -828,13 +1175,25 @@ class ModernFitnessApp:
         ).pack(side="left", padx=5)
         
         # Liste des programmes existants
-        programs_frame = ctk.CTkFrame(self.manage_programs_frame, fg_color=self.colors['card'])
-        programs_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        self.manage_programs_list = ctk.CTkFrame(self.manage_programs_frame, fg_color=self.colors['card'])
+        self.manage_programs_list.pack(fill="both", expand=True, padx=20, pady=10)
+        
+        self.manage_programs_revision = None
+        self.refresh_manage_programs_view()
+
+    def refresh_manage_programs_view(self):
+        """Redessine la liste seulement si les programmes ont changé"""
+        programs_frame = self.manage_programs_list
         
         # Charger et afficher les programmes existants
         try:
-            with open('data/workout_programs.json', 'r', encoding='utf-8') as f:
-                programs = json.load(f)
+            revision = self.store.revision('programs')
+            if revision == self.manage_programs_revision:
+                return
+            programs = self.store.programs
+            
+            for widget in programs_frame.winfo_children():
+                widget.destroy()
                 
             for program_id, program in programs.items():
                 program_frame = ctk.CTkFrame(programs_frame, fg_color='transparent')
@@ -866,8 +1225,11 @@ class ModernFitnessApp:
                     hover_color=self.colors['accent'],
                     width=100
                 ).pack(side="right", padx=5)
+            self.manage_programs_revision = revision
                 
         except Exception as e:
+            for widget in programs_frame.winfo_children():
+                widget.destroy()
             ctk.CTkLabel(
                 programs_frame,
                 text="Erreur lors du chargement des programmes",
@@ -884,28 +1246,10 @@ class ModernFitnessApp:
     def delete_program(self, program_id):
         try:
             if messagebox.askyesno("Confirmation", "Voulez-vous vraiment supprimer ce programme ?"):
-                with open('data/workout_programs.json', 'r', encoding='utf-8') as f:
-                    programs = json.load(f)
-                
                 # Supprimer le programme
-                if program_id in programs:
-                    del programs[program_id]
-                    
-                    # Sauvegarder les modifications
-                    with open('data/workout_programs.json', 'w', encoding='utf-8') as f:
-                        json.dump(programs, f, indent=4)
-                    
+                if self.core.delete_program(program_id):
                     # Rafraîchir l'interface
-                    if hasattr(self, 'settings_frame'):
-                        tabs = [child for child in self.settings_frame.winfo_children() 
-                               if isinstance(child, ctk.CTkTabview)]
-                        if tabs:
-                            programs_tab = tabs[0].tab("Programmes")
-                            # Nettoyer l'onglet
-                            for widget in programs_tab.winfo_children():
-                                widget.destroy()
-                            # Recréer la liste des programmes
-                            self.create_programs_settings(programs_tab)
+                    self.refresh_programs_tab()
                     
                     messagebox.showinfo("Succès", "Programme supprimé avec succès!")
                 else:
@@ -937,11 +1281,9 @@ class ModernFitnessApp:
         
         # Charger les données si on modifie un programme existant
         if program_id:
-            with open('data/workout_programs.json', 'r', encoding='utf-8') as f:
-                programs = json.load(f)
-                program = programs[program_id]
-                program_name.set(program['name'])
-                program_desc.set(program['description'])
+            program = self.store.programs[program_id]
+            program_name.set(program['name'])
+            program_desc.set(program['description'])
         
         # Formulaire
         form_frame = ctk.CTkFrame(form_window, fg_color=self.colors['card'])
@@ -1022,39 +1364,12 @@ class ModernFitnessApp:
 
     def save_program(self, program_id, name, description, form_window):
         try:
-            with open('data/workout_programs.json', 'r', encoding='utf-8') as f:
-                programs = json.load(f)
-            
-            new_program = {
-                "name": name,
-                "description": description,
-                "durations": [
-                    {"time": 15, "name": "15 sec", "calories": 20},
-                    {"time": 30, "name": "30 sec", "calories": 40},
-                    {"time": 60, "name": "60 sec", "calories": 80}
-                ],
-                "exercises": []
-            }
-            
-            if program_id is None:
-                # Nouveau programme
-                program_id = f"program_{len(programs) + 1}"
-            
-            programs[program_id] = new_program
-            
-            with open('data/workout_programs.json', 'w', encoding='utf-8') as f:
-                json.dump(programs, f, indent=4)
+            self.core.save_program(program_id, name, description)
             
             form_window.destroy()
             
             # Rafraîchir l'onglet Programmes
-            if hasattr(self, 'settings_frame'):
-                tabs = [child for child in self.settings_frame.winfo_children() 
-                       if isinstance(child, ctk.CTkTabview)][0]
-                programs_tab = tabs.tab("Programmes")
-                for widget in programs_tab.winfo_children():
-                    widget.destroy()
-                self.create_programs_settings(programs_tab)
+            self.refresh_programs_tab()
                 
         except Exception as e:
             self.show_error_dialog("Erreur lors de la sauvegarde du programme")
@@ -1070,72 +1385,93 @@ class ModernFitnessApp:
             hover_color=self.colors['accent']
         ).pack(pady=10)
         
-        # Liste des programmes
-        programs_frame = ctk.CTkScrollableFrame(parent, fg_color=self.colors['card'])
-        programs_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        # Liste virtualisée des programmes
+        self.settings_program_items = []
+        self.settings_programs_list = VirtualList(
+            parent,
+            row_height=self.PROGRAM_ROW_HEIGHT,
+            create_row=self.create_program_row,
+            bind_row=self.bind_program_row,
+            canvas_color=self.colors['card'],
+            fg_color=self.colors['card']
+        )
+        self.settings_programs_list.pack(fill="both", expand=True, padx=20, pady=10)
+        self.settings_programs_revision = None
         
         try:
-            with open('data/workout_programs.json', 'r', encoding='utf-8') as f:
-                programs = json.load(f)
-                
-            for program_id, program in programs.items():
-                program_frame = ctk.CTkFrame(programs_frame, fg_color='transparent')
-                program_frame.pack(fill="x", padx=15, pady=5)
-                
-                # Conteneur pour le nom et la description
-                info_frame = ctk.CTkFrame(program_frame, fg_color='transparent')
-                info_frame.pack(side="left", fill="x", expand=True, padx=10)
-                
-                ctk.CTkLabel(
-                    info_frame,
-                    text=program['name'],
-                    font=("Roboto", 16, "bold"),
-                    text_color=self.colors['text']
-                ).pack(anchor="w")
-                
-                ctk.CTkLabel(
-                    info_frame,
-                    text=program['description'],
-                    font=("Roboto", 12),
-                    text_color=self.colors['accent']
-                ).pack(anchor="w")
-                
-                # Boutons d'action
-                buttons_frame = ctk.CTkFrame(program_frame, fg_color='transparent')
-                buttons_frame.pack(side="right")
-                
-                ctk.CTkButton(
-                    buttons_frame,
-                    text="✏️",
-                    command=lambda p=program_id: self.edit_program(p),
-                    font=("Roboto", 14),
-                    fg_color=self.colors['primary'],
-                    hover_color=self.colors['accent'],
-                    width=40
-                ).pack(side="left", padx=2)
-                
-                ctk.CTkButton(
-                    buttons_frame,
-                    text="🗑️",
-                    command=lambda p=program_id: self.delete_program(p),
-                    font=("Roboto", 14),
-                    fg_color=self.colors['secondary'],
-                    hover_color=self.colors['accent'],
-                    width=40
-                ).pack(side="left", padx=2)
+            self.settings_programs_revision = self.store.revision('programs')
+            self.settings_program_items = list(self.store.programs.items())
+            self.settings_programs_list.set_count(len(self.settings_program_items))
                 
         except Exception as e:
             ctk.CTkLabel(
-                programs_frame,
+                parent,
                 text="Erreur lors du chargement des programmes",
                 font=("Roboto", 16),
                 text_color=self.colors['secondary']
             ).pack(pady=20)
 
+    def create_program_row(self, container):
+        """Crée une ligne vide de l'onglet Programmes"""
+        program_frame = ctk.CTkFrame(container, fg_color=self.colors['card'])
+        
+        # Conteneur pour le nom et la description
+        info_frame = ctk.CTkFrame(program_frame, fg_color='transparent')
+        info_frame.pack(side="left", fill="x", expand=True, padx=25, pady=5)
+        
+        program_frame.name_label = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=("Roboto", 16, "bold"),
+            text_color=self.colors['text']
+        )
+        program_frame.name_label.pack(anchor="w")
+        
+        program_frame.description_label = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=("Roboto", 12),
+            text_color=self.colors['accent']
+        )
+        program_frame.description_label.pack(anchor="w")
+        
+        # Boutons d'action
+        buttons_frame = ctk.CTkFrame(program_frame, fg_color='transparent')
+        buttons_frame.pack(side="right", padx=15)
+        
+        program_frame.edit_button = ctk.CTkButton(
+            buttons_frame,
+            text="✏️",
+            font=("Roboto", 14),
+            fg_color=self.colors['primary'],
+            hover_color=self.colors['accent'],
+            width=40
+        )
+        program_frame.edit_button.pack(side="left", padx=2)
+        
+        program_frame.delete_button = ctk.CTkButton(
+            buttons_frame,
+            text="🗑️",
+            font=("Roboto", 14),
+            fg_color=self.colors['secondary'],
+            hover_color=self.colors['accent'],
+            width=40
+        )
+        program_frame.delete_button.pack(side="left", padx=2)
+        return program_frame
+
+    def bind_program_row(self, row, index):
+        """Affiche le programme index dans une ligne existante"""
+        program_id, program = self.settings_program_items[index]
+        self.set_label_text(row.name_label, program['name'])
+        self.set_label_text(row.description_label, program['description'])
+        row.edit_button.configure(command=lambda p=program_id: self.edit_program(p))
+        row.delete_button.configure(command=lambda p=program_id: self.delete_program(p))
+
     def show_error_dialog(self, message):
         """Affiche une boîte de dialogue d'erreur"""
         messagebox.showerror("Erreur", message)
 
 if __name__ == "__main__":
     app = ModernFitnessApp()
-    app.run()
\ No newline at end of file
+    app.run(use_asyncio='--asyncio' in sys.argv)
\ No newline at end of file
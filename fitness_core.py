@@ -0,0 +1,453 @@
+import copy
+import os
+from datetime import datetime
+
+from achievements import AchievementEngine
+from countdown import Countdown
+from data_store import DataStore
+from history_log import HistoryLog, migrate_history
+from profiles import ProfileIndex
+from records import duration_label
+from stats_aggregates import StatsAggregates
+from streaks import StreakIndex, activity_day, current_streak, load_timezone, localize, update_streak
+from timeline import Timeline
+
+
+class WorkoutSession:
+    """Séance en cours : programme, durée choisie, compte à rebours et
+    déroulé des exercices (calculé une fois, au démarrage)"""
+
+    def __init__(self, program_id, program, duration, clock=None):
+        self.program_id = program_id
+        self.program = program
+        self.duration = duration
+        if clock is None:
+            self.countdown = Countdown(duration['time'])
+        else:
+            self.countdown = Countdown(duration['time'], clock=clock)
+        self.timeline = Timeline.compile(program.get('exercises', []), duration['time'])
+        # Vrai une fois la séance enregistrée (terminée ou arrêtée)
+        self.recorded = False
+
+    @property
+    def finished(self):
+        return self.countdown.finished
+
+    def current_segment(self):
+        """Série d'effort ou repos en cours"""
+        return self.timeline.at(self.countdown.elapsed())
+
+    def exercises_completed(self):
+        return self.timeline.exercises_completed(self.countdown.elapsed())
+
+
+class FitnessCore:
+    """Moteur de l'application, sans interface graphique.
+
+    Regroupe les programmes, les séances, la progression et les paramètres.
+    Ce module n'importe ni customtkinter ni PIL (et numpy seulement à la
+    première requête d'analyse) : il peut servir aux scripts de rapport et
+    aux tests sans affichage. L'interface (fitness_app.py) ne fait que
+    l'afficher.
+
+    La progression est stockée en JSON (progress.json et journal
+    d'historique) ou, avec storage='sqlite' (ou "storage": "sqlite" dans la
+    section app de settings.json), dans une base SQLite indexée.
+
+    Chaque profil (membre) a ses propres paramètres et sa progression ;
+    les programmes sont communs. Seules les données du profil sélectionné
+    sont chargées.
+    """
+
+    # Profil d'un nouveau membre (le nom est fourni à la création)
+    DEFAULT_USER = {"name": "", "age": 25, "weight": 70, "height": 170}
+
+    def __init__(self, data_dir='data', writer=None, storage=None, profile=None, worker=None):
+        self.data_dir = data_dir
+        self.writer = writer
+        # Écritures de l'historique hors du thread de l'interface (IOWorker)
+        self.worker = worker
+        self.storage = storage
+        self.profiles = ProfileIndex(data_dir)
+        self.database = None
+        self.achievements = AchievementEngine()
+        # Succès débloqués par la dernière séance enregistrée
+        self.new_achievements = []
+        self.open_profile(profile or self.profiles.active)
+
+    def open_profile(self, profile_id):
+        """Ouvre les données du profil ; ses fichiers sont lus à la demande"""
+        self.profile_id = profile_id
+        directory = self.profiles.directory(profile_id)
+        self.store = DataStore(directory, writer=self.writer, shared_dir=self.data_dir)
+        self.history = HistoryLog(os.path.join(directory, 'history'))
+        self.database = None
+        self.prepare_progress_data()
+        storage = self.storage if self.storage is not None else self.storage_setting()
+        if storage == 'sqlite':
+            self.use_database()
+        # Historique en colonnes NumPy, construit à la première consultation
+        self.analytics = None
+        # Plages de jours consécutifs, construites à la première requête
+        self.streaks = None
+
+    def storage_setting(self):
+        try:
+            return self.store.settings.get('app', {}).get('storage', 'json')
+        except Exception as e:
+            print(f"Erreur lors du chargement des paramètres: {e}")
+            return 'json'
+
+    def use_database(self):
+        """Passe au stockage SQLite, en important les données JSON la première fois"""
+        from sqlite_store import ProgressDatabase
+        self.database = ProgressDatabase(os.path.join(self.store.data_dir, 'progress.db'))
+        if not self.database.imported:
+            self.database.import_json(self.store.progress, self.history)
+        self.history = self.database
+
+    def prepare_progress_data(self):
+        """Sort l'historique de progress.json vers le journal en ajout seul
+        et construit les compteurs de statistiques s'ils manquent"""
+        try:
+            progress_data = self.store.progress
+            changed = migrate_history(progress_data, self.history)
+            if 'durations' not in progress_data.get('aggregates', {}):
+                # Compteurs absents, ou écrits avant l'histogramme des durées
+                StatsAggregates.rebuild(self.history, progress_data.setdefault('aggregates', {}))
+                changed = True
+            elif StatsAggregates(progress_data['aggregates']).prune():
+                # Compteurs écrits avant la fenêtre glissante
+                changed = True
+            stats = progress_data.get('stats', {})
+            if stats.get('best_streak', 0) < stats.get('streak', 0):
+                # Séries écrites par l'ancien calcul (meilleure série oubliée)
+                StreakIndex.from_days(self.active_days()).apply(stats)
+                changed = True
+            if 'stats' in progress_data and self.achievements.backfill(
+                    progress_data, StatsAggregates(progress_data['aggregates']).program_counts()):
+                # Historique migré (ou succès ajoutés depuis) : succès déjà atteints
+                changed = True
+            if changed:
+                self.store.save('progress', progress_data)
+        except Exception as e:
+            print(f"Erreur lors de la préparation des statistiques: {e}")
+
+    def wait_for_history(self):
+        """Attend l'écriture des séances en cours avant de relire l'historique"""
+        if self.worker is None:
+            return
+        if self.database is not None:
+            self.worker.drain(self.database.path)
+        else:
+            self.worker.drain(self.history.directory)
+
+    # Séries
+    def day_settings(self):
+        """Fuseau horaire et heure de début de journée (section app des paramètres)"""
+        try:
+            app = self.store.settings.get('app', {})
+        except Exception as e:
+            print(f"Erreur lors du chargement des paramètres: {e}")
+            app = {}
+        return load_timezone(app.get('timezone')), app.get('day_start_hour', 0)
+
+    def today(self, now=None):
+        """Jour d'activité courant"""
+        tz, day_start_hour = self.day_settings()
+        return activity_day(now or datetime.now(), tz, day_start_hour)
+
+    def active_days(self):
+        """Jours (ordinaux) ayant au moins une séance"""
+        self.wait_for_history()
+        if self.database is not None:
+            return self.database.active_days()
+        return {record.day for record in self.history.records()}
+
+    def streak_index(self):
+        if self.streaks is None:
+            self.streaks = StreakIndex.from_days(self.active_days())
+        return self.streaks
+
+    def streak_as_of(self, day):
+        """Série en cours au jour day (date ou 'AAAA-MM-JJ')"""
+        return self.streak_index().as_of(day)
+
+    def recompute_streaks(self):
+        """Recalcule série et meilleure série depuis l'historique (après un
+        import, ou un changement de fuseau ou de début de journée : voir
+        update_app_settings)"""
+        self.streaks = StreakIndex.from_days(self.active_days())
+        progress_data = self.load_progress()
+        self.streaks.apply(progress_data['stats'])
+        self.save_progress(progress_data, None)
+
+    def get_analytics(self):
+        """Retourne l'historique en colonnes, construit une seule fois"""
+        if self.analytics is None:
+            # numpy n'est importé qu'au premier affichage des statistiques
+            from analytics import HistoryColumns
+            self.wait_for_history()
+            if self.database is None:
+                analytics = HistoryColumns()
+                analytics.extend_log(self.history)
+                self.analytics = analytics
+            else:
+                self.analytics = HistoryColumns.from_entries(self.history)
+        return self.analytics
+
+    # Profils
+    def switch_profile(self, profile_id):
+        """Sélectionne un autre membre : les données du profil courant sont
+        écrites, puis seules celles du nouveau profil sont ouvertes"""
+        if profile_id not in self.profiles:
+            raise KeyError(profile_id)
+        if profile_id == self.profile_id:
+            return
+        self.close()
+        self.profiles.select(profile_id)
+        self.open_profile(profile_id)
+
+    def create_profile(self, name, **user):
+        """Crée un profil avec les préférences du profil courant ; retourne son id"""
+        settings = copy.deepcopy(self.store.settings)
+        settings['user'] = dict(self.DEFAULT_USER, **user, name=name)
+        workout_counts = self.load_progress().get('workout_counts', {})
+        return self.profiles.create(name, settings, workout_counts)
+
+    # Paramètres
+    @property
+    def user(self):
+        return self.store.user
+
+    def update_user(self, values):
+        """Met à jour le profil ; l'âge, le poids et la taille sont des entiers"""
+        settings = self.store.settings
+        for key, value in values.items():
+            if key in ['age', 'weight', 'height']:
+                value = int(value)
+            settings['user'][key] = value
+        self.store.save('settings', settings)
+        self.profiles.rename(self.profile_id, settings['user']['name'])
+        return settings['user']
+
+    def update_app_settings(self, values):
+        """Met à jour la section app des paramètres ; retourne la section.
+
+        Un changement de fuseau ou d'heure de début de journée recalcule
+        les séries. Les séances déjà enregistrées gardent leur jour
+        d'activité : seules les suivantes sont datées avec les nouveaux
+        réglages.
+        """
+        settings = self.store.settings
+        app = settings.setdefault('app', {})
+        before = (app.get('timezone'), app.get('day_start_hour', 0))
+        if 'day_start_hour' in values:
+            values = dict(values, day_start_hour=int(values['day_start_hour']))
+        app.update(values)
+        self.store.save('settings', settings)
+        if (app.get('timezone'), app.get('day_start_hour', 0)) != before:
+            self.recompute_streaks()
+        return app
+
+    # Programmes
+    @property
+    def programs(self):
+        return self.store.programs
+
+    def save_program(self, program_id, name, description):
+        """Crée (program_id None) ou remplace un programme ; retourne son id"""
+        programs = self.store.programs
+
+        new_program = {
+            "name": name,
+            "description": description,
+            "durations": [
+                {"time": 15, "name": "15 sec", "calories": 20},
+                {"time": 30, "name": "30 sec", "calories": 40},
+                {"time": 60, "name": "60 sec", "calories": 80}
+            ],
+            "exercises": []
+        }
+
+        if program_id is None:
+            # Nouveau programme
+            program_id = f"program_{len(programs) + 1}"
+
+        programs[program_id] = new_program
+        self.store.save('programs', programs)
+        return program_id
+
+    def delete_program(self, program_id):
+        """Supprime un programme ; retourne False s'il n'existe pas"""
+        programs = self.store.programs
+        if program_id not in programs:
+            return False
+        del programs[program_id]
+        self.store.save('programs', programs)
+        return True
+
+    # Séances
+    def start_session(self, program_id, duration, clock=None):
+        """Démarre une séance du programme program_id pour la durée choisie"""
+        session = WorkoutSession(program_id, self.store.programs[program_id], duration, clock)
+        session.countdown.start()
+        return session
+
+    def complete_session(self, session, now=None):
+        """Enregistre une séance terminée dans la progression"""
+        session.recorded = True
+        return self.record_workout(session.program, session.duration, now,
+                                   exercises_completed=session.exercises_completed())
+
+    def abandon_session(self, session, now=None):
+        """Enregistre une séance arrêtée avant la fin, comme non terminée :
+        exercices réellement terminés, temps effectué et calories au
+        prorata. Retourne None (rien d'enregistré) si aucun exercice n'est
+        terminé ou si la séance l'est déjà."""
+        exercises_completed = session.exercises_completed()
+        if session.recorded or not exercises_completed:
+            return None
+        session.recorded = True
+        duration = session.duration
+        elapsed = min(int(session.countdown.elapsed()), duration['time'])
+        done = {
+            "time": elapsed,
+            "name": duration_label(elapsed),
+            "calories": round(duration['calories'] * elapsed / duration['time']) if duration['time'] else 0,
+        }
+        return self.record_workout(session.program, done, now,
+                                   exercises_completed=exercises_completed, completed=False)
+
+    # Progression
+    def load_progress(self):
+        """En-tête de progression : stats, workout_counts, ..."""
+        if self.database is not None:
+            return self.database.load_progress()
+        return self.store.progress
+
+    def save_progress(self, progress_data, entry):
+        """Enregistre l'en-tête de progression et la nouvelle séance (entry
+        None : l'en-tête seulement)"""
+        if self.database is not None:
+            if self.worker is not None:
+                # Transaction sur le thread d'écriture, avec une copie de
+                # l'en-tête : l'original reste servi depuis la mémoire
+                self.database.cache_progress(progress_data)
+                self.worker.submit(self.database.path, self.database.commit_progress,
+                                   copy.deepcopy(progress_data), entry)
+            else:
+                self.database.save_progress(progress_data, entry)
+            return
+        if entry is not None:
+            if self.worker is not None:
+                self.worker.submit(self.history.directory, self.history.append, entry)
+            else:
+                self.history.append(entry)
+            StatsAggregates(progress_data.setdefault('aggregates', {})).add(entry)
+        self.store.save('progress', progress_data)
+
+    def aggregates(self):
+        """Compteurs par jour, semaine, mois et programme"""
+        if self.database is not None:
+            # Les requêtes lisent la base : séances en cours d'écriture d'abord
+            self.wait_for_history()
+            return self.database
+        return StatsAggregates(self.store.progress.get('aggregates', {}))
+
+    def record_workout(self, program, duration, now=None, exercises_completed=None, completed=True):
+        """Met à jour les statistiques, la série, les succès et l'historique ;
+        retourne l'entrée ajoutée (les succès débloqués sont dans new_achievements).
+
+        exercises_completed : exercices réellement terminés (tous par défaut)
+        completed : False pour une séance arrêtée avant la fin
+        """
+        if exercises_completed is None:
+            exercises_completed = len(program['exercises'])
+        if now is None:
+            now = datetime.now()
+        progress_data = self.load_progress()
+
+        # Heure et jour d'activité de la séance (fuseau et début de journée
+        # choisis) : les mêmes pour la série et les succès par plage horaire
+        tz, day_start_hour = self.day_settings()
+        moment = localize(now, tz)
+        day = activity_day(moment, tz, day_start_hour)
+        today = day.isoformat()
+
+        # Mettre à jour les statistiques
+        progress_data['stats']['total_workouts'] += 1
+        progress_data['stats']['total_calories'] += duration['calories']
+
+        # Mettre à jour la série
+        last = progress_data['stats'].get('last_workout_date')
+        if last and today < last:
+            # Séance antérieure à la dernière (horloge, fuseau) : elle peut
+            # relier deux séries, recalculées sur l'index des jours
+            self.streak_index().add(day)
+            self.streaks.apply(progress_data['stats'])
+        else:
+            update_streak(progress_data['stats'], day)
+            if self.streaks is not None:
+                self.streaks.add(day)
+
+        # Ajouter à l'historique
+        new_workout = {
+            "date": today,
+            "workout": program['name'],
+            "duration": duration['name'],
+            "completed": completed,
+            "calories": duration['calories'],
+            "time": duration['time'],
+            "exercises_completed": exercises_completed
+        }
+
+        # Mettre à jour le compteur de ce type d'entraînement
+        program_type = program['name'].split()[0]
+        if program_type in progress_data['workout_counts']:
+            progress_data['workout_counts'][program_type] += 1
+
+        # Seules les règles concernées par cette séance sont évaluées
+        program_count = self.aggregates().program(program['name'])[0] + 1
+        self.new_achievements = self.achievements.record(progress_data, new_workout, moment, program_count)
+
+        self.save_progress(progress_data, new_workout)
+        if self.analytics is not None:
+            self.analytics.append(new_workout)
+        return new_workout
+
+    def stats_summary(self, today=None):
+        """Valeurs des statistiques affichées, calculées sans parcourir l'historique"""
+        if today is None:
+            today = self.today().isoformat()
+        stats = self.load_progress()['stats']
+        # Compteurs JSON ou tables de synthèse SQLite : ni numpy ni colonnes
+        aggregates = self.aggregates()
+        median, p90 = aggregates.duration_percentiles((50, 90))
+
+        return {
+            'total_workouts': stats['total_workouts'],
+            'total_calories': stats['total_calories'],
+            'streak': current_streak(stats, today),
+            'best_streak': stats['best_streak'],
+            'week_calories': aggregates.week(today)[1],
+            'month_calories': aggregates.month(today)[1],
+            'average_duration': aggregates.average_duration(),
+            'favorite_program': aggregates.favorite_program(),
+            'week_average_calories': aggregates.average_calories(today, window=7),
+            'median_duration': median,
+            'p90_duration': p90,
+        }
+
+    def flush(self):
+        """Écrit les sauvegardes en attente"""
+        if self.store.writer is not None:
+            self.store.writer.flush()
+        if self.worker is not None:
+            self.worker.drain()
+
+    def close(self):
+        """Écrit les sauvegardes en attente et ferme la base"""
+        self.flush()
+        if self.database is not None:
+            self.database.close()
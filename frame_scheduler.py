@@ -0,0 +1,158 @@
+import math
+import time
+
+
+class _Task:
+    __slots__ = ('callback', 'interval', 'view', 'visual', 'next_due')
+
+    def __init__(self, callback, interval, view, visual, next_due):
+        self.callback = callback
+        self.interval = interval
+        self.view = view
+        self.visual = visual
+        self.next_due = next_due
+
+
+class FrameScheduler:
+    """Une seule boucle after() pour toutes les animations et tous les minuteurs.
+
+    Les callbacks sont enregistrés sous une clé : un second enregistrement
+    avec la même clé remplace le callback sans créer de seconde boucle.
+    Un callback sans interval_ms est appelé à chaque image (au plus fps fois
+    par seconde). Sa valeur de retour pilote la suite :
+      - False : le callback est retiré ;
+      - un nombre : délai en millisecondes avant le prochain appel ;
+      - None : on garde l'intervalle (ou l'image suivante).
+    Un callback lié à une vue (view=...) est suspendu tant que cette vue
+    n'est pas affichée ; un callback visuel (visual=True) est suspendu quand
+    la fenêtre est réduite. Sans callback actif, aucun after() n'est planifié.
+
+    Avec un profiler (instrumentation.Profiler), la durée de chaque callback
+    et de chaque image est enregistrée.
+    """
+
+    def __init__(self, widget, fps=30, clock=time.monotonic, profiler=None):
+        self.widget = widget
+        self.frame = 1.0 / fps
+        self.clock = clock
+        self.active_view = None
+        self.window_visible = True
+        self._tasks = {}
+        self._after_id = None
+        self._due = None
+        self.profiler = profiler
+
+    def register(self, key, callback, interval_ms=None, view=None, visual=False, delay_ms=0):
+        task = self._tasks.get(key)
+        if task is not None:
+            # Déjà enregistré : même boucle, échéance recalculée depuis le
+            # dernier appel prévu avec le nouvel intervalle (inchangée si
+            # l'intervalle ne change pas)
+            interval = interval_ms / 1000 if interval_ms else None
+            now = self.clock()
+            if delay_ms:
+                task.next_due = now + delay_ms / 1000
+            elif interval != task.interval:
+                last = task.next_due - (task.interval or self.frame)
+                task.next_due = max(last + (interval or self.frame), now)
+            task.callback = callback
+            task.interval = interval
+            task.view = view
+            task.visual = visual or view is not None
+            self._reschedule()
+            return
+
+        self._tasks[key] = _Task(
+            callback,
+            interval_ms / 1000 if interval_ms else None,
+            view,
+            visual or view is not None,
+            self.clock() + delay_ms / 1000,
+        )
+        self._reschedule()
+
+    def unregister(self, key):
+        self._tasks.pop(key, None)
+
+    def is_registered(self, key):
+        return key in self._tasks
+
+    def set_active_view(self, view):
+        """Suspend les callbacks des vues masquées et réveille ceux de la vue affichée"""
+        self.active_view = view
+        self._reschedule()
+
+    def set_window_visible(self, visible):
+        self.window_visible = visible
+        self._reschedule()
+
+    def _is_running(self, task):
+        if task.visual and not self.window_visible:
+            return False
+        return task.view is None or task.view == self.active_view
+
+    def _tick(self):
+        self._after_id = None
+        self._due = None
+        now = self.clock()
+        profiler = self.profiler
+        if profiler is not None:
+            frame_start = profiler.clock()
+
+        for key, task in list(self._tasks.items()):
+            # Un callback précédent a pu retirer ou remplacer cette tâche
+            if self._tasks.get(key) is not task:
+                continue
+            if not self._is_running(task) or now < task.next_due:
+                continue
+
+            if profiler is not None:
+                start = profiler.clock()
+            try:
+                result = task.callback()
+            except Exception as e:
+                print(f"Erreur dans le callback {key}: {e}")
+                result = False
+            if profiler is not None:
+                profiler.record(key, 'callback', start, profiler.clock() - start)
+
+            if result is False:
+                if self._tasks.get(key) is task:
+                    del self._tasks[key]
+            elif isinstance(result, (int, float)) and not isinstance(result, bool):
+                task.next_due = now + result / 1000
+            elif task.interval:
+                # Cadence régulière sans dérive ; on ne rattrape pas le retard
+                task.next_due = max(task.next_due + task.interval, now)
+            else:
+                task.next_due = now + self.frame
+
+        if profiler is not None:
+            profiler.record('frame', 'frame', frame_start, profiler.clock() - frame_start)
+        self._reschedule()
+
+    def _reschedule(self):
+        running = [task.next_due for task in self._tasks.values() if self._is_running(task)]
+        if not running:
+            self._cancel()
+            return
+
+        due = min(running)
+        if self._after_id is not None and self._due is not None and self._due <= due:
+            return
+
+        self._cancel()
+        delay = max(0, math.ceil((due - self.clock()) * 1000))
+        self._due = due
+        self._after_id = self.widget.after(delay, self._tick)
+
+    def _cancel(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        self._after_id = None
+        self._due = None
+
+    def stop(self):
+        """Retire tous les callbacks (fermeture de l'application)"""
+        self._tasks.clear()
+        self._cancel()
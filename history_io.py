@@ -0,0 +1,222 @@
+"""Import et export de l'historique des séances, en CSV ou JSON Lines.
+
+Les séances circulent en générateurs : lecture, validation, normalisation,
+calcul des statistiques et écriture se font en un seul passage, en
+mémoire constante, quelle que soit la taille du fichier.
+
+    python history_io.py export historique.csv
+    python history_io.py import ancien_systeme.jsonl [--replace]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import date
+
+from records import InvalidRecord, normalize
+from stats_aggregates import StatsAggregates
+from streaks import StreakIndex
+
+CSV_FIELDS = ('date', 'workout', 'duration', 'time', 'calories', 'completed', 'exercises_completed')
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ValueError(f"Format non reconnu pour {path} (attendu .csv ou .jsonl)")
+
+
+# Lecture : (numéro de ligne dans le fichier, séance brute)
+def read_jsonl(f):
+    for number, line in enumerate(f, 1):
+        line = line.strip()
+        if line:
+            try:
+                yield number, json.loads(line)
+            except ValueError:
+                # Ligne illisible : signalée comme séance invalide
+                yield number, None
+
+
+def read_csv(f):
+    reader = csv.DictReader(f)
+    for record in reader:
+        # line_num compte l'en-tête et les champs sur plusieurs lignes
+        yield reader.line_num, record
+
+
+def read_records(path, fmt=None):
+    """Séances brutes d'un fichier, une par une, avec leur numéro de ligne"""
+    fmt = fmt or detect_format(path)
+    reader = read_csv if fmt == 'csv' else read_jsonl
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from reader(f)
+
+
+# Validation
+def normalized(records, errors=None):
+    """Séances valides ; les invalides sont comptées dans errors (numéro, message)"""
+    yield from normalized_lines(enumerate(records, 1), errors)
+
+
+def normalized_lines(numbered, errors=None):
+    """Comme normalized(), pour des paires (numéro de ligne, séance)"""
+    for number, record in numbered:
+        try:
+            yield normalize(record)
+        except InvalidRecord as e:
+            if errors is not None:
+                errors.append((number, str(e)))
+        except AttributeError:
+            if errors is not None:
+                errors.append((number, "séance illisible"))
+
+
+# Statistiques recalculées au fil du passage
+class ProgressRebuilder:
+    """Recalcule stats, workout_counts et compteurs en laissant passer les séances.
+
+    Les jours d'activité sont collectés au passage ; les séries sont
+    calculées à la fin (StreakIndex), quel que soit l'ordre du fichier.
+    """
+
+    def __init__(self, workout_counts=()):
+        self.stats = {
+            "total_workouts": 0,
+            "total_calories": 0,
+            "streak": 0,
+            "best_streak": 0,
+            "last_workout_date": None
+        }
+        self.workout_counts = dict.fromkeys(workout_counts, 0)
+        self.aggregates = StatsAggregates()
+        self.days = set()
+        self._last_text = None
+
+    def add(self, entry):
+        stats = self.stats
+        stats['total_workouts'] += 1
+        stats['total_calories'] += entry['calories']
+
+        # Les séances d'un même jour se suivent : une conversion par jour
+        if entry['date'] != self._last_text:
+            self._last_text = entry['date']
+            self.days.add(date.fromisoformat(entry['date']).toordinal())
+
+        program_type = entry['workout'].split()[0]
+        if program_type in self.workout_counts:
+            self.workout_counts[program_type] += 1
+        self.aggregates.add(entry)
+
+    def track(self, entries):
+        """Laisse passer les séances en mettant les statistiques à jour"""
+        for entry in entries:
+            self.add(entry)
+            yield entry
+
+    def apply(self, progress_data):
+        StreakIndex.from_days(self.days).apply(self.stats)
+        progress_data['stats'] = self.stats
+        progress_data['workout_counts'] = self.workout_counts
+        progress_data['aggregates'] = self.aggregates.data
+
+
+# Écriture
+def write_jsonl(entries, f):
+    for entry in entries:
+        f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+def write_csv(entries, f):
+    writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    for entry in entries:
+        writer.writerow(entry)
+
+
+def export_history(core, path, fmt=None):
+    """Écrit l'historique du profil courant ; retourne le nombre de séances"""
+    fmt = fmt or detect_format(path)
+    writer = write_csv if fmt == 'csv' else write_jsonl
+    count = 0
+
+    def counted(entries):
+        nonlocal count
+        for entry in entries:
+            count += 1
+            yield entry
+
+    core.wait_for_history()
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer(counted(normalized(core.history)), f)
+    return count
+
+
+def import_history(core, path, fmt=None, replace=False):
+    """Ajoute (ou remplace, avec replace) l'historique du profil courant par
+    celui du fichier et recalcule les statistiques.
+
+    Retourne (séances importées, [(numéro de ligne, erreur), ...]). Avec
+    replace, l'ancien historique n'est remplacé qu'une fois le fichier lu
+    en entier : si la lecture échoue, historique et statistiques restent
+    inchangés.
+    """
+    errors = []
+    progress_data = core.load_progress()
+    rebuilder = ProgressRebuilder(progress_data.get('workout_counts', {}))
+    history = core.history
+    core.wait_for_history()
+
+    if not replace:
+        # Les séances déjà présentes comptent aussi dans les statistiques
+        for entry in normalized(history):
+            rebuilder.add(entry)
+    before = rebuilder.stats['total_workouts']
+
+    entries = rebuilder.track(normalized_lines(read_records(path, fmt), errors))
+    if replace:
+        history.replace(entries)
+    else:
+        history.bulk_extend(entries)
+
+    rebuilder.apply(progress_data)
+    # Succès atteints par l'historique importé (sauf plages horaires)
+    core.achievements.backfill(progress_data, rebuilder.aggregates.program_counts())
+    core.save_progress(progress_data, None)
+    core.analytics = None
+    core.streaks = None
+    return rebuilder.stats['total_workouts'] - before, errors
+
+
+def main(argv=None):
+    from fitness_core import FitnessCore
+
+    parser = argparse.ArgumentParser(description="Import et export de l'historique des séances")
+    parser.add_argument('command', choices=('import', 'export'))
+    parser.add_argument('path', help="fichier .csv ou .jsonl")
+    parser.add_argument('--data', default='data', help="répertoire des données")
+    parser.add_argument('--profile', help="profil (par défaut : le profil sélectionné)")
+    parser.add_argument('--replace', action='store_true', help="remplacer l'historique existant")
+    args = parser.parse_args(argv)
+
+    core = FitnessCore(args.data, profile=args.profile)
+    try:
+        if args.command == 'export':
+            count = export_history(core, args.path)
+            print(f"{count} séances exportées dans {args.path}")
+        else:
+            count, errors = import_history(core, args.path, replace=args.replace)
+            for number, message in errors[:20]:
+                print(f"Ligne {number} ignorée : {message}")
+            print(f"{count} séances importées, {len(errors)} ignorées")
+    finally:
+        core.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
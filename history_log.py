@@ -0,0 +1,331 @@
+import json
+import os
+import shutil
+
+from persistence import atomic_open, atomic_write_json, fsync_directory
+from records import SCHEMA_VERSION, HistoryRecord, ProgramTable
+
+
+class HistoryLog:
+    """Historique des entraînements en ajout seul, découpé en segments JSON Lines.
+
+    Chaque séance est une ligne ajoutée à la fin du segment actif : enregistrer
+    une séance coûte une seule écriture, quelle que soit la taille de
+    l'historique. Quand le segment actif atteint segment_size lignes, un
+    nouveau segment est ouvert ; au-delà de max_segments segments fermés,
+    ceux-ci sont fusionnés en un seul (compaction).
+
+    Les lignes suivent le schéma de records.py : schema.json garde sa
+    version et la table des programmes. Un journal en version 1 (une
+    séance = un dict) est converti à l'ouverture, segment par segment.
+    schema.json note aussi (legacy_migrated) que l'ancienne liste de
+    progress.json a été entièrement recopiée (voir migrate_history), et
+    (compacted_through) une compaction validée mais pas encore terminée.
+    """
+
+    PREFIX = 'segment-'
+    SUFFIX = '.jsonl'
+    SCHEMA = 'schema.json'
+    # Taille des segments écrits par un import en masse
+    BULK_SEGMENT_SIZE = 1000000
+    # Répertoires voisins utilisés par replace()
+    STAGING_SUFFIX = '.import'
+    BACKUP_SUFFIX = '.old'
+    # Segment fusionné par compact(), avant de prendre sa place
+    MERGE_SUFFIX = '.merge'
+
+    def __init__(self, directory, segment_size=5000, max_segments=8):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        backup = self._sibling(self.BACKUP_SUFFIX)
+        if not os.path.exists(directory) and os.path.exists(backup):
+            # Arrêt au milieu de l'échange de replace() : l'ancien journal revient
+            os.replace(backup, directory)
+        os.makedirs(directory, exist_ok=True)
+        # Nombre de lignes du segment actif, calculé au premier ajout
+        self._active_lines = None
+        self.schema_path = os.path.join(directory, self.SCHEMA)
+        self._load_schema()
+        # Compaction interrompue : terminée (validée) ou abandonnée (sinon)
+        self._finish_compaction()
+        if self.version < SCHEMA_VERSION:
+            self.migrate_schema()
+
+    # Schéma
+    def _load_schema(self):
+        if os.path.exists(self.schema_path):
+            with open(self.schema_path, 'r', encoding='utf-8') as f:
+                schema = json.load(f)
+        else:
+            # Pas de schéma : ancien journal s'il a des segments, sinon journal neuf
+            schema = {"version": 1 if self.segments() else SCHEMA_VERSION, "programs": []}
+        self.version = schema['version']
+        self.programs = ProgramTable(schema['programs'])
+        self.legacy_migrated = schema.get('legacy_migrated', False)
+        self.compacted_through = schema.get('compacted_through')
+
+    def _save_schema(self):
+        atomic_write_json(self.schema_path, {
+            "version": self.version,
+            "programs": self.programs.names,
+            "legacy_migrated": self.legacy_migrated,
+            "compacted_through": self.compacted_through,
+        })
+        self.programs.changed = False
+
+    def mark_legacy_migrated(self):
+        """Note que l'historique de progress.json est entièrement dans le journal"""
+        self.legacy_migrated = True
+        self._save_schema()
+
+    def migrate_schema(self):
+        """Réécrit les segments en version 1 au format compact de la version 2.
+
+        La table des programmes est écrite avant chaque segment converti :
+        un arrêt en cours de migration laisse des segments lisibles, en
+        version 1 ou 2, et la migration reprend à l'ouverture suivante.
+        """
+        for path in self.segments():
+            with atomic_open(path) as out:
+                for row in self._read_rows(path):
+                    try:
+                        out.write(self._encode(row))
+                    except (KeyError, TypeError, ValueError) as e:
+                        print(f"Erreur lors de la migration d'une séance: {e}")
+                if self.programs.changed:
+                    self._save_schema()
+        self.version = SCHEMA_VERSION
+        self._save_schema()
+
+    def segments(self):
+        """Chemins des segments, du plus ancien au plus récent"""
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(self.PREFIX) and name.endswith(self.SUFFIX)
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _segment_path(self, number):
+        return os.path.join(self.directory, f"{self.PREFIX}{number:06d}{self.SUFFIX}")
+
+    @classmethod
+    def _segment_number(cls, path):
+        name = os.path.basename(path)
+        return int(name[len(cls.PREFIX):-len(cls.SUFFIX)])
+
+    def _active_segment(self):
+        segments = self.segments()
+        if not segments:
+            return self._segment_path(1)
+        return segments[-1]
+
+    @staticmethod
+    def _count_lines(path):
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'rb') as f:
+            return sum(1 for _ in f)
+
+    def append(self, entry):
+        """Ajoute une séance à la fin du journal"""
+        self.extend([entry])
+
+    def extend(self, entries, segment_size=None):
+        """Ajoute plusieurs séances en gardant le segment ouvert (migration, import)"""
+        if segment_size is None:
+            segment_size = self.segment_size
+        path = self._active_segment()
+        if self._active_lines is None:
+            self._active_lines = self._count_lines(path)
+
+        f = None
+        try:
+            for entry in entries:
+                if f is None or self._active_lines >= segment_size:
+                    if self._active_lines >= segment_size:
+                        path = self._segment_path(self._segment_number(path) + 1)
+                        self._active_lines = 0
+                    if f is not None:
+                        self._close(f)
+                    f = self._open_for_append(path)
+                line = self._encode(entry)
+                if self.programs.changed:
+                    # Un nouveau programme est connu avant la ligne qui le cite
+                    self._save_schema()
+                f.write(line)
+                self._active_lines += 1
+        finally:
+            if f is not None:
+                self._close(f)
+
+        if len(self.segments()) - 1 > self.max_segments:
+            self.compact()
+
+    @staticmethod
+    def _open_for_append(path):
+        # Une ligne tronquée par un arrêt brutal est terminée avant d'ajouter,
+        # pour que la nouvelle séance ne soit pas collée à elle
+        needs_newline = False
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b'\n'
+        f = open(path, 'a', encoding='utf-8')
+        if needs_newline:
+            f.write('\n')
+        return f
+
+    @staticmethod
+    def _close(f):
+        # Les séances ajoutées sont durables dès le retour de extend()
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+
+    def _record(self, row):
+        """HistoryRecord d'une ligne lue (liste en version 2, dict en version 1)"""
+        if isinstance(row, list):
+            return HistoryRecord.from_row(row)
+        if isinstance(row, HistoryRecord):
+            return row
+        return HistoryRecord.from_entry(row, self.programs)
+
+    def _encode(self, entry):
+        row = entry if isinstance(entry, list) else self._record(entry).to_row()
+        return json.dumps(row, separators=(',', ':')) + '\n'
+
+    def records(self):
+        """Parcourt les séances en HistoryRecord, sans construire de dict"""
+        for path in self.segments():
+            yield from self.segment_records(path)
+
+    def segment_records(self, path):
+        """Séances d'un segment, en HistoryRecord"""
+        for row in self._read_rows(path):
+            yield self._record(row)
+
+    def __iter__(self):
+        """Parcourt les séances dans l'ordre, sans tout charger en mémoire"""
+        programs = self.programs
+        for record in self.records():
+            yield record.to_entry(programs)
+
+    @staticmethod
+    def _read_rows(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Ligne tronquée par un arrêt brutal : on l'ignore
+                    continue
+
+    def __len__(self):
+        return sum(self._count_lines(path) for path in self.segments())
+
+    def bulk_extend(self, entries):
+        """Import en masse : grands segments, pas de compaction à réécrire"""
+        self.extend(entries, segment_size=max(self.segment_size, self.BULK_SEGMENT_SIZE))
+
+    def _sibling(self, suffix):
+        return os.path.normpath(self.directory) + suffix
+
+    def replace(self, entries):
+        """Remplace toutes les séances par entries.
+
+        Les séances sont d'abord écrites dans un journal voisin, qui ne
+        prend la place de celui-ci qu'une fois complet : si la lecture de
+        entries échoue, le journal est intact.
+        """
+        staging = self._sibling(self.STAGING_SUFFIX)
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            log = HistoryLog(staging, self.segment_size, self.max_segments)
+            log.legacy_migrated = self.legacy_migrated
+            log.bulk_extend(entries)
+            log._save_schema()
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        backup = self._sibling(self.BACKUP_SUFFIX)
+        shutil.rmtree(backup, ignore_errors=True)
+        os.replace(self.directory, backup)
+        os.replace(staging, self.directory)
+        fsync_directory(os.path.dirname(os.path.normpath(self.directory)))
+        shutil.rmtree(backup, ignore_errors=True)
+        self.version, self.programs = log.version, log.programs
+        self._active_lines = None
+
+    def clear(self):
+        """Supprime toutes les séances"""
+        for path in self.segments():
+            os.remove(path)
+        self._active_lines = None
+
+    def compact(self):
+        """Fusionne les segments fermés en un seul segment.
+
+        La fusion est écrite à côté (fichier .merge), puis validée dans
+        schema.json (compacted_through : numéro du dernier segment
+        fusionné) avant toute suppression. Un arrêt avant la validation
+        laisse les segments d'origine ; après, _finish_compaction() finit
+        le travail à l'ouverture suivante. Aucune séance n'est jamais lue
+        deux fois.
+        """
+        closed = self.segments()[:-1]
+        if len(closed) < 2:
+            return
+
+        last = self._segment_number(closed[-1])
+        with atomic_open(self._segment_path(last) + self.MERGE_SUFFIX) as out:
+            for path in closed:
+                for row in self._read_rows(path):
+                    out.write(self._encode(row))
+        self.compacted_through = last
+        self._save_schema()
+        self._finish_compaction()
+
+    def _finish_compaction(self):
+        """Remplace les segments jusqu'à compacted_through par leur fusion ;
+        peut être répété sans risque"""
+        last = self.compacted_through
+        if last is not None:
+            merged = self._segment_path(last) + self.MERGE_SUFFIX
+            if os.path.exists(merged):
+                for path in self.segments():
+                    if self._segment_number(path) <= last:
+                        os.remove(path)
+                os.replace(merged, self._segment_path(last))
+                fsync_directory(self.directory)
+            self.compacted_through = None
+            self._save_schema()
+        # Fusion jamais validée : les segments d'origine font foi
+        for name in os.listdir(self.directory):
+            if name.endswith(self.MERGE_SUFFIX):
+                os.remove(os.path.join(self.directory, name))
+
+
+def migrate_history(progress_data, log):
+    """Déplace l'ancienne liste 'history' de progress.json vers le journal.
+
+    Retourne True si progress_data a été modifié et doit être sauvegardé.
+    La migration n'est considérée comme faite qu'une fois toutes les
+    séances écrites (legacy_migrated dans schema.json) : une migration
+    interrompue est reprise depuis le début, une migration terminée mais
+    dont l'en-tête n'a pas été sauvegardé n'est pas refaite.
+    """
+    if 'history' not in progress_data:
+        return False
+
+    history = progress_data.pop('history')
+    if history and not log.legacy_migrated:
+        # Segments partiels d'une migration interrompue : on repart de zéro
+        log.clear()
+        log.bulk_extend(history)
+        log.mark_legacy_migrated()
+    return True
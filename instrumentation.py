@@ -0,0 +1,126 @@
+import functools
+import json
+import os
+import time
+
+
+class Profiler:
+    """Enregistre la durée des callbacks, des images, des lectures/écritures
+    JSON et des constructions de vues dans un tampon circulaire.
+
+    Le tampon a une taille fixe : les événements les plus anciens sont
+    écrasés, la mémoire reste constante pendant une longue séance.
+    Les événements s'exportent au format Chrome trace (chrome://tracing,
+    Perfetto) avec export_chrome_trace().
+    """
+
+    ENV_VAR = 'FITNESS_PROFILE'
+    DEFAULT_TRACE = 'fitness_trace.json'
+
+    def __init__(self, capacity=8192, clock=time.perf_counter):
+        self.capacity = capacity
+        self.clock = clock
+        self.start = clock()
+        # (nom, catégorie, début, durée) en secondes
+        self._events = [None] * capacity
+        self._index = 0
+
+    @classmethod
+    def from_environment(cls):
+        """Profiler activé par la variable FITNESS_PROFILE, ou None"""
+        if os.environ.get(cls.ENV_VAR):
+            return cls()
+        return None
+
+    @classmethod
+    def trace_path(cls):
+        """Fichier d'export : valeur de FITNESS_PROFILE si c'est un .json"""
+        value = os.environ.get(cls.ENV_VAR, '')
+        return value if value.endswith('.json') else cls.DEFAULT_TRACE
+
+    def record(self, name, category, start, duration):
+        self._events[self._index % self.capacity] = (name, category, start, duration)
+        self._index += 1
+
+    def wrap(self, func, name, category):
+        """Retourne func chronométrée"""
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = self.clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, category, start, self.clock() - start)
+        return timed
+
+    def instrument(self, obj, method_names, category):
+        """Remplace les méthodes de l'instance obj par leurs versions chronométrées"""
+        for method_name in method_names:
+            method = getattr(obj, method_name)
+            setattr(obj, method_name, self.wrap(method, method_name, category))
+
+    def __len__(self):
+        return min(self._index, self.capacity)
+
+    def events(self, category=None):
+        """Événements conservés, du plus ancien au plus récent"""
+        if self._index <= self.capacity:
+            events = self._events[:self._index]
+        else:
+            split = self._index % self.capacity
+            events = self._events[split:] + self._events[:split]
+        if category is not None:
+            events = [event for event in events if event[1] == category]
+        return events
+
+    def summary(self):
+        """Par nom d'événement : nombre, durée moyenne et maximale (ms)"""
+        totals = {}
+        for name, category, _, duration in self.events():
+            count, total, longest = totals.get((category, name), (0, 0.0, 0.0))
+            totals[(category, name)] = (count + 1, total + duration, max(longest, duration))
+        return {
+            f"{category}/{name}": {
+                'count': count,
+                'mean_ms': total * 1000 / count,
+                'max_ms': longest * 1000,
+            }
+            for (category, name), (count, total, longest) in totals.items()
+        }
+
+    def frame_stats(self, window=1.0):
+        """(images par seconde, durée moyenne et maximale d'une image en ms)
+        sur la dernière fenêtre de window secondes"""
+        since = self.clock() - window
+        durations = [event[3] for event in self.events('frame') if event[2] >= since]
+        if not durations:
+            return 0.0, 0.0, 0.0
+        return (
+            len(durations) / window,
+            sum(durations) * 1000 / len(durations),
+            max(durations) * 1000,
+        )
+
+    def chrome_trace(self):
+        """Événements au format Chrome trace (temps en microsecondes)"""
+        pid = os.getpid()
+        return {
+            'traceEvents': [
+                {
+                    'name': name,
+                    'cat': category,
+                    'ph': 'X',
+                    'ts': (start - self.start) * 1e6,
+                    'dur': duration * 1e6,
+                    'pid': pid,
+                    'tid': 0,
+                }
+                for name, category, start, duration in self.events()
+            ],
+            'displayTimeUnit': 'ms',
+        }
+
+    def export_chrome_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+        return path
@@ -0,0 +1,93 @@
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class IOWorker:
+    """Exécute les écritures disque sur des threads, hors de la boucle Tk.
+
+    Les tâches sont soumises avec une clé (en général le chemin du
+    fichier) : deux tâches de même clé s'exécutent dans l'ordre de
+    soumission, jamais en même temps ; des clés différentes s'écrivent en
+    parallèle. Les callbacks (on_done, on_error) ne sont jamais appelés sur
+    un thread d'écriture : poll(), appelé depuis la boucle Tk (par exemple
+    via FrameScheduler), les exécute sur le thread de l'interface.
+
+    on_pending est appelé à chaque soumission, pour que l'interface
+    planifie poll() ; poll() retourne False quand plus rien n'est en cours.
+    """
+
+    def __init__(self, max_workers=2, on_pending=None):
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='fitness-io')
+        # Tâches terminées, en attente de leurs callbacks (thread-safe)
+        self._done = queue.SimpleQueue()
+        # Les attributs suivants ne sont utilisés que sur le thread Tk
+        self._running = set()
+        self._waiting = {}
+        self.on_pending = on_pending
+
+    def submit(self, key, func, *args, on_done=None, on_error=None):
+        job = (func, args, on_done, on_error)
+        if key in self._running:
+            # Une écriture de ce fichier est en cours : on passe après elle
+            self._waiting.setdefault(key, deque()).append(job)
+        else:
+            self._start(key, job)
+        if self.on_pending is not None:
+            self.on_pending()
+
+    def _start(self, key, job):
+        self._running.add(key)
+        func, args, on_done, on_error = job
+
+        def run():
+            try:
+                func(*args)
+                error = None
+            except Exception as e:
+                error = e
+            self._done.put((key, error, on_done, on_error))
+
+        self._executor.submit(run)
+
+    def _finish(self, key, error, on_done, on_error):
+        self._running.discard(key)
+        waiting = self._waiting.get(key)
+        if waiting:
+            self._start(key, waiting.popleft())
+            if not waiting:
+                del self._waiting[key]
+
+        if error is None:
+            if on_done is not None:
+                on_done()
+        elif on_error is not None:
+            on_error(error)
+        else:
+            print(f"Erreur lors de l'écriture de {key}: {error}")
+
+    def is_pending(self, key=None):
+        if key is None:
+            return bool(self._running)
+        return key in self._running
+
+    def poll(self):
+        """Exécute les callbacks des tâches terminées (thread Tk)"""
+        while True:
+            try:
+                done = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._finish(*done)
+        return None if self._running else False
+
+    def drain(self, key=None):
+        """Attend la fin des écritures (de key, ou de toutes) et exécute leurs callbacks"""
+        while self.is_pending(key):
+            self._finish(*self._done.get())
+        self.poll()
+
+    def close(self):
+        """Termine les écritures en attente (fermeture de l'application)"""
+        self.drain()
+        self._executor.shutdown(wait=True)
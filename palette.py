@@ -0,0 +1,67 @@
+import math
+
+
+def hsv_to_hex(h, s, v):
+    """Convertit HSV (h en degrés, s et v entre 0 et 1) en code couleur hexadécimal"""
+    h = h / 360
+    if s == 0.0:
+        return '#%02x%02x%02x' % (v, v, v)
+
+    i = int(h * 6.0)
+    f = (h * 6.0) - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i % 6
+
+    if i == 0:
+        r, g, b = v, t, p
+    elif i == 1:
+        r, g, b = q, v, p
+    elif i == 2:
+        r, g, b = p, v, t
+    elif i == 3:
+        r, g, b = p, q, v
+    elif i == 4:
+        r, g, b = t, p, v
+    else:
+        r, g, b = v, p, q
+
+    return '#%02x%02x%02x' % (int(r * 255), int(g * 255), int(b * 255))
+
+
+class HuePalette:
+    """Table précalculée des couleurs d'un tour de roue chromatique.
+
+    palette[i] retourne la chaîne hexadécimale de la teinte i (en degrés,
+    modulo steps) : aucun calcul flottant ni nouvelle chaîne par image.
+    """
+
+    def __init__(self, saturation=1.0, value=1.0, steps=360):
+        self.steps = steps
+        self.colors = tuple(
+            hsv_to_hex(i * 360 / steps, saturation, value) for i in range(steps)
+        )
+
+    def __getitem__(self, index):
+        return self.colors[index % self.steps]
+
+    def __len__(self):
+        return self.steps
+
+
+def logo_cycle(step=2):
+    """Couleurs successives du logo : un tour complet par pas de step degrés"""
+    colors = []
+    for degrees in range(0, 360, step):
+        r = int(abs(math.sin(math.radians(degrees))) * 255)
+        g = int(abs(math.sin(math.radians(degrees + 120))) * 255)
+        b = int(abs(math.sin(math.radians(degrees + 240))) * 255)
+        colors.append(f'#{r:02x}{g:02x}{b:02x}')
+    return tuple(colors)
+
+
+# Palettes des animations, calculées une fois au chargement
+CIRCLE_PALETTE = HuePalette(saturation=1.0)
+TIMER_PALETTE = HuePalette(saturation=0.7)
+LOGO_CYCLE = logo_cycle()
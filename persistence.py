@@ -0,0 +1,142 @@
+import contextlib
+import json
+import os
+import stat
+import tempfile
+
+# Masque de création des fichiers, lu une fois (os.umask n'a pas de lecture seule)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def fsync_directory(directory):
+    """Rend durable le renommage d'un fichier dans ce répertoire (POSIX)"""
+    if os.name != 'posix':
+        return
+    fd = os.open(directory or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def atomic_open(path, mode='w', encoding='utf-8'):
+    """Ouvre un fichier temporaire qui remplace path seulement en cas de succès.
+
+    Le contenu est écrit à côté de la cible, synchronisé sur le disque puis
+    renommé : un arrêt brutal laisse soit l'ancien fichier, soit le nouveau,
+    jamais un fichier tronqué. mode='wb' ouvre le fichier en binaire. Le
+    fichier garde les permissions de celui qu'il remplace (celles d'un
+    nouveau fichier sinon), pas les 0600 du fichier temporaire.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            permissions = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            permissions = 0o666 & ~_UMASK
+        os.chmod(tmp_path, permissions)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    fsync_directory(directory)
+
+
+def atomic_write_json(path, data, indent=4):
+    with atomic_open(path) as f:
+        json.dump(data, f, indent=indent)
+
+
+def atomic_write_text(path, text):
+    with atomic_open(path) as f:
+        f.write(text)
+
+
+class GroupCommitWriter:
+    """Regroupe les sauvegardes rapprochées en un seul commit synchronisé.
+
+    write() ne fait que mémoriser le dernier état de chaque fichier ; le
+    commit a lieu delay_ms plus tard via schedule (par exemple window.after).
+    Plusieurs modifications d'un même fichier dans cette fenêtre ne donnent
+    qu'une seule écriture atomique. Sans schedule, l'écriture est immédiate.
+
+    Avec un worker (IOWorker), les données sont sérialisées sur le thread
+    appelant puis écrites sur un thread d'écriture ; les callbacks sont
+    appelés après l'écriture, sur le thread de l'interface.
+
+    Une écriture qui échoue est signalée (on_error(path, erreur)) et
+    remise en attente : elle est retentée au commit suivant, et les
+    données en mémoire restent la référence d'ici là.
+    """
+
+    def __init__(self, delay_ms=200, schedule=None, worker=None, on_error=None):
+        self.delay_ms = delay_ms
+        self.schedule = schedule
+        self.worker = worker
+        self.on_error = on_error
+        # chemin -> (données, callbacks à appeler après l'écriture)
+        self._pending = {}
+        self._scheduled = False
+
+    def write(self, path, data, on_commit=None):
+        _, callbacks = self._pending.get(path, (None, []))
+        if on_commit is not None:
+            callbacks.append(on_commit)
+        self._pending[path] = (data, callbacks)
+
+        if self.schedule is None:
+            self.flush()
+        elif not self._scheduled:
+            self._scheduled = True
+            self.schedule(self.delay_ms, self.flush)
+
+    def is_pending(self, path):
+        return path in self._pending
+
+    def flush(self):
+        """Écrit tous les fichiers en attente"""
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+        for path, (data, callbacks) in pending.items():
+            if self.worker is not None:
+                # Copie figée des données : elles peuvent changer pendant l'écriture
+                text = json.dumps(data, indent=4)
+                self.worker.submit(
+                    path, atomic_write_text, path, text,
+                    on_done=lambda callbacks=callbacks: self._committed(callbacks),
+                    on_error=lambda e, path=path, data=data, callbacks=callbacks:
+                        self._failed(path, data, callbacks, e)
+                )
+                continue
+            try:
+                atomic_write_json(path, data)
+            except Exception as e:
+                self._failed(path, data, callbacks, e)
+                continue
+            self._committed(callbacks)
+
+    def _failed(self, path, data, callbacks, error):
+        print(f"Erreur lors de l'écriture de {path}: {error}")
+        if path in self._pending:
+            # Une sauvegarde plus récente attend déjà : elle sera écrite à la place
+            newer, newer_callbacks = self._pending[path]
+            self._pending[path] = (newer, callbacks + newer_callbacks)
+        else:
+            self._pending[path] = (data, callbacks)
+        if self.on_error is not None:
+            self.on_error(path, error)
+
+    @staticmethod
+    def _committed(callbacks):
+        for callback in callbacks:
+            callback()
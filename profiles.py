@@ -0,0 +1,100 @@
+import json
+import os
+
+from persistence import atomic_write_json
+
+
+def empty_progress(workout_counts=None):
+    """Progression d'un nouveau membre"""
+    return {
+        "stats": {
+            "total_workouts": 0,
+            "total_calories": 0,
+            "streak": 0,
+            "best_streak": 0,
+            "last_workout_date": None
+        },
+        "achievements": [],
+        "workout_counts": dict.fromkeys(workout_counts or (), 0)
+    }
+
+
+class ProfileIndex:
+    """Index des profils d'un poste partagé (profiles.json).
+
+    Chaque profil a son propre répertoire de données (paramètres,
+    progression, historique) ; l'index ne garde que son nom et son
+    répertoire, en mémoire. Le profil d'origine utilise directement le
+    répertoire data/, les suivants data/profiles/<id>/. Sélectionner un
+    profil ne lit que les fichiers de ce profil, quel que soit le nombre
+    de membres.
+    """
+
+    FILENAME = 'profiles.json'
+    DEFAULT = 'default'
+
+    def __init__(self, data_dir='data'):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, self.FILENAME)
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        else:
+            data = {"active": self.DEFAULT, "profiles": {}}
+        self.active = data['active']
+        # id -> {"name": ..., "path": ...} (chemin relatif à data_dir)
+        self.profiles = data['profiles']
+        self.profiles.setdefault(self.DEFAULT, {"name": self._legacy_name(), "path": "."})
+
+    def _legacy_name(self):
+        # Nom du profil d'origine, lu dans settings.json s'il existe
+        try:
+            with open(os.path.join(self.data_dir, 'settings.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)['user']['name']
+        except (OSError, ValueError, KeyError):
+            return "Profil"
+
+    def save(self):
+        atomic_write_json(self.path, {"active": self.active, "profiles": self.profiles})
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def __contains__(self, profile_id):
+        return profile_id in self.profiles
+
+    def names(self):
+        """(id, nom) des profils, dans l'ordre de création"""
+        return [(profile_id, profile['name']) for profile_id, profile in self.profiles.items()]
+
+    def directory(self, profile_id):
+        return os.path.normpath(os.path.join(self.data_dir, self.profiles[profile_id]['path']))
+
+    def select(self, profile_id):
+        if profile_id not in self.profiles:
+            raise KeyError(profile_id)
+        if profile_id != self.active:
+            self.active = profile_id
+            self.save()
+
+    def rename(self, profile_id, name):
+        if self.profiles[profile_id]['name'] != name:
+            self.profiles[profile_id]['name'] = name
+            self.save()
+
+    def create(self, name, settings, workout_counts=()):
+        """Crée le répertoire d'un nouveau profil ; retourne son id"""
+        number = len(self.profiles)
+        while f"profile_{number}" in self.profiles:
+            number += 1
+        profile_id = f"profile_{number}"
+        relative = os.path.join('profiles', profile_id)
+
+        directory = os.path.join(self.data_dir, relative)
+        os.makedirs(directory, exist_ok=True)
+        atomic_write_json(os.path.join(directory, 'settings.json'), settings)
+        atomic_write_json(os.path.join(directory, 'progress.json'), empty_progress(workout_counts))
+
+        self.profiles[profile_id] = {"name": name, "path": relative}
+        self.save()
+        return profile_id
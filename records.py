@@ -0,0 +1,176 @@
+"""Schéma des séances de l'historique et enregistrement compact.
+
+Version 1 : chaque séance est un dict JSON ; la durée est dans 'duration'
+(en secondes ou en libellé "15 min"), parfois aussi dans 'time', et le
+programme est stocké par son nom complet.
+
+Version 2 : chaque séance est une ligne [jour ordinal, id programme,
+secondes, calories, exercices, terminée] ; les noms de programmes ne sont
+stockés qu'une fois, dans une ProgramTable. En mémoire, une séance est un
+HistoryRecord (dataclass à __slots__), environ quatre fois plus petit que
+le dict correspondant.
+"""
+import functools
+from dataclasses import dataclass
+from datetime import date
+
+from stats_aggregates import entry_seconds, parse_duration
+
+SCHEMA_VERSION = 2
+# Champs d'une ligne en version 2, dans l'ordre
+ROW_FIELDS = ('day', 'program', 'seconds', 'calories', 'exercises', 'completed')
+
+
+class InvalidRecord(ValueError):
+    """Séance invalide dans un fichier importé"""
+
+
+def duration_label(seconds):
+    """Libellé d'une durée, comme ceux des programmes : "15 sec", "60 sec", "15 min\""""
+    if seconds > 60 and seconds % 60 == 0:
+        return f"{seconds // 60} min"
+    return f"{seconds} sec"
+
+
+def _integer(record, key, default=0):
+    value = record.get(key)
+    if value in (None, ''):
+        return default
+    try:
+        number = int(float(value))
+    except (TypeError, ValueError):
+        raise InvalidRecord(f"{key} invalide : {value!r}")
+    if number < 0:
+        raise InvalidRecord(f"{key} négatif : {value!r}")
+    return number
+
+
+def _boolean(value):
+    if isinstance(value, str):
+        return value.strip().lower() not in ('', '0', 'false', 'faux', 'non', 'no')
+    return True if value is None else bool(value)
+
+
+def normalize(record):
+    """Séance au format de l'historique, ou InvalidRecord.
+
+    La durée est unifiée : 'time' contient toujours les secondes et
+    'duration' un libellé, que la source ait 900, "900" ou "15 min".
+    """
+    day = str(record.get('date') or '').strip()
+    try:
+        day = date.fromisoformat(day[:10]).isoformat()
+    except ValueError:
+        raise InvalidRecord(f"date invalide : {record.get('date')!r}")
+
+    workout = str(record.get('workout') or '').strip()
+    if not workout:
+        raise InvalidRecord("programme manquant")
+
+    try:
+        if record.get('time') not in (None, ''):
+            seconds = int(float(record['time']))
+        else:
+            seconds = parse_duration(record.get('duration'))
+    except (TypeError, ValueError):
+        raise InvalidRecord(f"durée invalide : {record.get('duration')!r}")
+    if seconds < 0:
+        raise InvalidRecord(f"durée négative : {seconds}")
+
+    label = record.get('duration')
+    if not isinstance(label, str) or not label.strip() or label.strip().isdigit():
+        label = duration_label(seconds)
+
+    return {
+        "date": day,
+        "workout": workout,
+        "duration": label.strip(),
+        "completed": _boolean(record.get('completed')),
+        "calories": _integer(record, 'calories'),
+        "time": seconds,
+        "exercises_completed": _integer(record, 'exercises_completed'),
+    }
+
+
+@functools.lru_cache(maxsize=4096)
+def day_ordinal(day):
+    return date.fromisoformat(day).toordinal()
+
+
+@functools.lru_cache(maxsize=4096)
+def ordinal_day(ordinal):
+    return date.fromordinal(ordinal).isoformat()
+
+
+class ProgramTable:
+    """Noms de programmes internés : chaque nom reçoit un id entier stable"""
+
+    def __init__(self, names=()):
+        self.names = list(names)
+        self._ids = {name: i for i, name in enumerate(self.names)}
+        # Vrai quand un nom a été ajouté depuis la dernière sauvegarde
+        self.changed = False
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, name):
+        program_id = self._ids.get(name)
+        if program_id is None:
+            program_id = len(self.names)
+            self._ids[name] = program_id
+            self.names.append(name)
+            self.changed = True
+        return program_id
+
+    def name(self, program_id):
+        return self.names[program_id]
+
+
+@dataclass(slots=True)
+class HistoryRecord:
+    """Séance de l'historique (schéma version 2)"""
+
+    day: int
+    program: int
+    seconds: int
+    calories: int = 0
+    exercises: int = 0
+    completed: bool = True
+
+    @classmethod
+    def from_entry(cls, entry, programs):
+        """Convertit une séance au format dict (versions 1 et 2)"""
+        return cls(
+            day_ordinal(entry['date'][:10]),
+            programs.intern(entry['workout']),
+            entry_seconds(entry),
+            int(entry.get('calories') or 0),
+            int(entry.get('exercises_completed') or 0),
+            bool(entry.get('completed', True)),
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        day, program, seconds, calories, exercises, completed = row
+        return cls(day, program, seconds, calories, exercises, bool(completed))
+
+    def to_row(self):
+        return [self.day, self.program, self.seconds, self.calories,
+                self.exercises, int(self.completed)]
+
+    @property
+    def date(self):
+        return ordinal_day(self.day)
+
+    def to_entry(self, programs):
+        """Séance au format dict, celui de normalize()"""
+        return {
+            "date": self.date,
+            "workout": programs.name(self.program),
+            "duration": duration_label(self.seconds),
+            "completed": self.completed,
+            "calories": self.calories,
+            "time": self.seconds,
+            "exercises_completed": self.exercises,
+        }
@@ -0,0 +1,140 @@
+import time
+
+# Niveaux de qualité de l'animation
+LOW, MEDIUM, HIGH = 0, 1, 2
+
+
+class CanvasBatch:
+    """Changements d'une image sur un canvas, appliqués en une fois.
+
+    coords() et itemconfig() ne font que noter l'état voulu de chaque
+    élément ; flush() n'envoie à Tk que ce qui diffère de l'état déjà
+    appliqué : un élément immobile ne coûte aucun appel, et les options
+    modifiées d'un élément partent en un seul itemconfig. Les coordonnées
+    sont arrondies au pixel, la précision de l'affichage.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        # État appliqué : élément -> coordonnées, élément -> {option: valeur}
+        self._coords = {}
+        self._options = {}
+        self._pending_coords = {}
+        self._pending_options = {}
+        # Appels Tk envoyés et évités (statistiques)
+        self.calls = 0
+        self.skipped = 0
+
+    def coords(self, item, *xy):
+        self._pending_coords[item] = tuple(map(round, xy))
+
+    def itemconfig(self, item, **options):
+        self._pending_options.setdefault(item, {}).update(options)
+
+    def flush(self):
+        for item, xy in self._pending_coords.items():
+            if self._coords.get(item) == xy:
+                self.skipped += 1
+                continue
+            self.canvas.coords(item, *xy)
+            self._coords[item] = xy
+            self.calls += 1
+
+        for item, options in self._pending_options.items():
+            applied = self._options.setdefault(item, {})
+            changed = {key: value for key, value in options.items() if applied.get(key) != value}
+            if not changed:
+                self.skipped += 1
+                continue
+            self.canvas.itemconfig(item, **changed)
+            applied.update(changed)
+            self.calls += 1
+
+        self._pending_coords.clear()
+        self._pending_options.clear()
+
+    def forget(self):
+        """Oublie l'état appliqué (éléments recréés ou modifiés ailleurs)"""
+        self._coords.clear()
+        self._options.clear()
+
+
+class QualityGovernor:
+    """Ajuste la qualité de l'animation au temps de calcul des images.
+
+    La durée de chaque image est lissée (moyenne exponentielle) : au-delà
+    du budget pendant quelques images, la qualité baisse d'un niveau ;
+    bien en dessous pendant plus longtemps, elle remonte. L'écart entre
+    les deux seuils évite d'osciller entre deux niveaux.
+    """
+
+    def __init__(self, budget_ms=8.0, level=HIGH, smoothing=0.2, degrade_after=5, upgrade_after=60):
+        self.budget = budget_ms / 1000
+        self.level = level
+        self.smoothing = smoothing
+        self.degrade_after = degrade_after
+        self.upgrade_after = upgrade_after
+        self.average = 0.0
+        self._over = 0
+        self._under = 0
+
+    def record(self, duration):
+        """Ajoute la durée d'une image (en secondes) ; retourne le niveau"""
+        self.average += (duration - self.average) * self.smoothing
+        if self.average > self.budget:
+            self._over += 1
+            self._under = 0
+            if self._over >= self.degrade_after and self.level > LOW:
+                self.level -= 1
+                self._over = 0
+        elif self.average < self.budget / 2:
+            self._under += 1
+            self._over = 0
+            if self._under >= self.upgrade_after and self.level < HIGH:
+                self.level += 1
+                self._under = 0
+        else:
+            self._over = self._under = 0
+        return self.level
+
+
+class RenderPipeline:
+    """Rendu d'une animation image par image, à qualité adaptative.
+
+    Entre begin() et end(), les changements passent par canvas (un
+    CanvasBatch) et configure() (options de widgets hors canvas, envoyées
+    seulement si elles changent). end() applique le tout, mesure l'image
+    et retourne le délai avant la suivante pour le FrameScheduler : None
+    (image suivante) en haute qualité, une cadence réduite sinon.
+    """
+
+    # Délai entre deux images par niveau (None : cadence du FrameScheduler)
+    FRAME_MS = {HIGH: None, MEDIUM: 50, LOW: 100}
+
+    def __init__(self, canvas, governor=None, clock=time.perf_counter):
+        self.canvas = CanvasBatch(canvas)
+        self.governor = governor if governor is not None else QualityGovernor()
+        self.clock = clock
+        self._widget_options = {}
+        self._frame_start = None
+
+    @property
+    def level(self):
+        return self.governor.level
+
+    def begin(self):
+        self._frame_start = self.clock()
+
+    def configure(self, widget, **options):
+        applied = self._widget_options.setdefault(id(widget), {})
+        changed = {key: value for key, value in options.items() if applied.get(key) != value}
+        if changed:
+            widget.configure(**changed)
+            applied.update(changed)
+
+    def end(self):
+        self.canvas.flush()
+        if self._frame_start is not None:
+            self.governor.record(self.clock() - self._frame_start)
+            self._frame_start = None
+        return self.FRAME_MS[self.governor.level]
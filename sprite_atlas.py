@@ -0,0 +1,151 @@
+"""Images précalculées de l'animation des cercles de la séance.
+
+Les trois cercles (orbite, pulsation, couleur, pointillés qui tournent)
+ne dépendent que du temps. Un cycle complet est dessiné une fois avec
+Pillow, hors du thread de l'interface, dans une planche d'images
+(sprite atlas) gardée en mémoire et enregistrée sur le disque ; à chaque
+image, l'animation se contente alors d'afficher l'image du moment.
+
+L'option s'active avec "animation": "atlas" dans la section app de
+settings.json ; Pillow n'est importé qu'au dessin de la planche.
+"""
+import math
+import os
+
+from palette import CIRCLE_PALETTE
+from persistence import atomic_open
+
+# Période commune des orbites et des pulsations des trois cercles
+CYCLE = 2 * math.pi
+CENTER = 150
+BASE_RADIUS = 100
+# Version du dessin : change le nom des planches en cache
+VERSION = 1
+
+
+def circle_bbox(t, i, center=CENTER, base_radius=BASE_RADIUS):
+    """Rectangle englobant du cercle i à l'instant t (secondes)"""
+    # Vitesses différentes pour chaque cercle
+    phase = t * (2 - i * 0.5)
+    scale = 0.1 * math.sin(phase * 2) + 1.0
+    radius = base_radius * (1 + i * 0.2) * scale
+
+    # Mouvement circulaire autour du centre
+    orbit_radius = 10
+    orbit_speed = 2 * (i + 1)
+    orbit_x = math.cos(t * orbit_speed) * orbit_radius
+    orbit_y = math.sin(t * orbit_speed) * orbit_radius
+    return (
+        center - radius + orbit_x,
+        center - radius + orbit_y,
+        center + radius + orbit_x,
+        center + radius + orbit_y,
+    )
+
+
+def render_frame(t, hue, size=300, background='#000000', supersample=2):
+    """Dessine les trois cercles pointillés à l'instant t (Image RGB)"""
+    from PIL import Image, ImageDraw
+    k = supersample
+    image = Image.new('RGB', (size * k, size * k), background)
+    draw = ImageDraw.Draw(image)
+    center = size / 2
+    for i in range(3):
+        x0, y0, x1, y1 = circle_bbox(t, i, center, BASE_RADIUS * size / 300)
+        cx, cy = (x0 + x1) / 2 * k, (y0 + y1) / 2 * k
+        radius = (x1 - x0) / 2 * k
+        color = CIRCLE_PALETTE[hue + i * 30]
+        # Pointillé de 2 px (dash=(1, 1) de largeur 2), décalé avec la teinte
+        dashes = max(1, int(math.pi * radius / (2 * k)))
+        offset = (hue % 20) / 20
+        for d in range(dashes):
+            a0 = 2 * math.pi * (d + offset) / dashes
+            a1 = 2 * math.pi * (d + offset + 0.5) / dashes
+            draw.line(
+                (cx + radius * math.cos(a0), cy + radius * math.sin(a0),
+                 cx + radius * math.cos(a1), cy + radius * math.sin(a1)),
+                fill=color, width=2 * k
+            )
+    if k > 1:
+        image = image.resize((size, size), Image.LANCZOS)
+    return image
+
+
+class SpriteAtlas:
+    """Planche des images d'un cycle de l'animation.
+
+    build() dessine (ou relit depuis cache_dir) la planche ; il ne touche
+    pas à Tk et peut tourner sur un thread (IOWorker). frame_at() retourne
+    le PhotoImage de l'instant : il doit être appelé sur le thread de
+    l'interface, et chaque image n'est convertie qu'à son premier
+    affichage.
+    """
+
+    def __init__(self, size=300, fps=15, background='#000000', cache_dir=None):
+        self.size = size
+        self.frame_count = max(1, round(CYCLE * fps))
+        self.background = background
+        self.cache_dir = cache_dir
+        self.columns = math.ceil(math.sqrt(self.frame_count))
+        self.sheet = None
+        self._photos = [None] * self.frame_count
+
+    @property
+    def ready(self):
+        return self.sheet is not None
+
+    def cache_path(self):
+        if self.cache_dir is None:
+            return None
+        name = f"circles-v{VERSION}-{self.size}-{self.frame_count}-{self.background.lstrip('#')}.png"
+        return os.path.join(self.cache_dir, name)
+
+    def render_sheet(self):
+        from PIL import Image
+        rows = math.ceil(self.frame_count / self.columns)
+        sheet = Image.new('RGB', (self.columns * self.size, rows * self.size), self.background)
+        for index in range(self.frame_count):
+            t = index * CYCLE / self.frame_count
+            # Un tour de roue chromatique par cycle
+            hue = index * 360 // self.frame_count
+            frame = render_frame(t, hue, self.size, self.background)
+            sheet.paste(frame, self._origin(index))
+        return sheet
+
+    def build(self):
+        """Relit la planche en cache ou la dessine (et l'enregistre)"""
+        from PIL import Image
+        path = self.cache_path()
+        if path is not None and os.path.exists(path):
+            try:
+                with Image.open(path) as cached:
+                    self.sheet = cached.convert('RGB')
+                return
+            except OSError as e:
+                print(f"Erreur lors de la lecture de {path}: {e}")
+
+        sheet = self.render_sheet()
+        if path is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with atomic_open(path, 'wb') as f:
+                sheet.save(f, format='PNG')
+        self.sheet = sheet
+
+    def _origin(self, index):
+        row, column = divmod(index, self.columns)
+        return column * self.size, row * self.size
+
+    def index_at(self, t):
+        return int((t % CYCLE) / CYCLE * self.frame_count) % self.frame_count
+
+    def frame(self, index):
+        photo = self._photos[index]
+        if photo is None:
+            from PIL import ImageTk
+            x, y = self._origin(index)
+            photo = ImageTk.PhotoImage(self.sheet.crop((x, y, x + self.size, y + self.size)))
+            self._photos[index] = photo
+        return photo
+
+    def frame_at(self, t):
+        return self.frame(self.index_at(t))
@@ -0,0 +1,359 @@
+import json
+import os
+import sqlite3
+import sys
+from datetime import date, timedelta
+
+from stats_aggregates import entry_seconds, histogram_percentiles
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    workout TEXT NOT NULL,
+    calories INTEGER NOT NULL DEFAULT 0,
+    seconds INTEGER NOT NULL DEFAULT 0,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_date ON history(date);
+CREATE INDEX IF NOT EXISTS history_workout ON history(workout, date);
+CREATE TABLE IF NOT EXISTS stats (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS workout_counts (
+    type TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS progress (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS program_totals (
+    workout TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0,
+    calories INTEGER NOT NULL DEFAULT 0,
+    seconds INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS duration_counts (
+    seconds INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Version des tables de synthèse (PRAGMA user_version)
+SUMMARY_VERSION = 1
+
+
+def week_bounds(day):
+    """[lundi, lundi suivant) de la semaine ISO d'une date 'AAAA-MM-JJ'"""
+    start = date.fromisoformat(day)
+    start -= timedelta(days=start.weekday())
+    return start.isoformat(), (start + timedelta(days=7)).isoformat()
+
+
+def month_bounds(day):
+    """[premier jour du mois, premier jour du mois suivant)"""
+    year, month = int(day[:4]), int(day[5:7])
+    if month == 12:
+        return f"{year}-12-01", f"{year + 1}-01-01"
+    return f"{year}-{month:02d}-01", f"{year}-{month + 1:02d}-01"
+
+
+class ProgressDatabase:
+    """Historique, statistiques et compteurs dans une base SQLite locale.
+
+    Remplace progress.json et le journal d'historique quand le stockage
+    'sqlite' est choisi. La classe se parcourt comme HistoryLog (append,
+    extend, itération, len) et répond aux mêmes requêtes que
+    StatsAggregates (day, week, month, program, average_duration,
+    favorite_program) : les requêtes par période passent par l'index sur
+    la date ; les totaux par programme et le nombre de séances par durée
+    sont tenus dans des tables de synthèse, mises à jour dans la même
+    transaction que l'ajout des séances. Aucune requête des statistiques
+    ne parcourt l'historique.
+
+    La connexion peut servir à un thread d'écriture (IOWorker) : les
+    transactions de commit_progress() y sont exécutées l'une après
+    l'autre, pendant que l'en-tête reste servi depuis la mémoire.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version < SUMMARY_VERSION:
+            self._build_summaries()
+        # En-tête de progression (stats, workout_counts, ...) en mémoire
+        self._progress = None
+
+    def close(self):
+        self.connection.close()
+
+    @property
+    def imported(self):
+        row = self.connection.execute(
+            "SELECT 1 FROM progress WHERE key = 'imported'"
+        ).fetchone()
+        return row is not None
+
+    def import_json(self, progress_data, entries):
+        """Importe en une fois l'en-tête de progress.json et l'historique"""
+        with self.connection:
+            self._insert_entries(entries)
+            self._write_progress(progress_data)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO progress (key, value) VALUES ('imported', 'true')"
+            )
+        self._progress = None
+
+    def _build_summaries(self):
+        """Remplit les tables de synthèse depuis l'historique (base créée
+        avant elles)"""
+        with self.connection:
+            self.connection.execute("DELETE FROM program_totals")
+            self.connection.execute("DELETE FROM duration_counts")
+            self.connection.execute(
+                "INSERT INTO program_totals (workout, count, calories, seconds) "
+                "SELECT workout, COUNT(*), SUM(calories), SUM(seconds) FROM history "
+                "GROUP BY workout ORDER BY MIN(id)"
+            )
+            self.connection.execute(
+                "INSERT INTO duration_counts (seconds, count) "
+                "SELECT seconds, COUNT(*) FROM history GROUP BY seconds"
+            )
+            self.connection.execute(f"PRAGMA user_version = {SUMMARY_VERSION}")
+
+    # Historique
+    def _insert_entries(self, entries):
+        # Synthèses des séances ajoutées, écrites après elles
+        programs = {}
+        durations = {}
+
+        def rows():
+            for entry in entries:
+                calories = entry.get('calories', 0)
+                seconds = entry_seconds(entry)
+                totals = programs.setdefault(entry['workout'], [0, 0, 0])
+                totals[0] += 1
+                totals[1] += calories
+                totals[2] += seconds
+                durations[seconds] = durations.get(seconds, 0) + 1
+                yield (
+                    entry['date'],
+                    entry['workout'],
+                    calories,
+                    seconds,
+                    json.dumps(entry, ensure_ascii=False, separators=(',', ':')),
+                )
+
+        self.connection.executemany(
+            "INSERT INTO history (date, workout, calories, seconds, entry) VALUES (?, ?, ?, ?, ?)",
+            rows()
+        )
+        self.connection.executemany(
+            "INSERT INTO program_totals (workout, count, calories, seconds) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(workout) DO UPDATE SET count = count + excluded.count, "
+            "calories = calories + excluded.calories, seconds = seconds + excluded.seconds",
+            ((name, *totals) for name, totals in programs.items())
+        )
+        self.connection.executemany(
+            "INSERT INTO duration_counts (seconds, count) VALUES (?, ?) "
+            "ON CONFLICT(seconds) DO UPDATE SET count = count + excluded.count",
+            durations.items()
+        )
+
+    def append(self, entry):
+        self.extend([entry])
+
+    def extend(self, entries):
+        with self.connection:
+            self._insert_entries(entries)
+
+    # Une seule transaction : rien à regrouper de plus pour un import en masse
+    bulk_extend = extend
+
+    def _delete_history(self):
+        for table in ('history', 'program_totals', 'duration_counts'):
+            self.connection.execute(f"DELETE FROM {table}")
+
+    def clear(self):
+        with self.connection:
+            self._delete_history()
+
+    def replace(self, entries):
+        """Remplace l'historique en une transaction : si la lecture de
+        entries échoue, rien n'est effacé"""
+        with self.connection:
+            self._delete_history()
+            self._insert_entries(entries)
+
+    def __iter__(self):
+        for (entry,) in self.connection.execute("SELECT entry FROM history ORDER BY id"):
+            yield json.loads(entry)
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def active_days(self):
+        """Jours (ordinaux) ayant au moins une séance, par l'index sur la date"""
+        return [
+            date.fromisoformat(day).toordinal()
+            for (day,) in self.connection.execute("SELECT DISTINCT date FROM history ORDER BY date")
+        ]
+
+    def entries_between(self, start, end):
+        """Séances du jour start (inclus) au jour end (exclu)"""
+        rows = self.connection.execute(
+            "SELECT entry FROM history WHERE date >= ? AND date < ? ORDER BY date, id",
+            (start, end)
+        )
+        return [json.loads(entry) for (entry,) in rows]
+
+    # En-tête de progression
+    def load_progress(self):
+        """Retourne stats, workout_counts et les autres clés de progress.json"""
+        if self._progress is None:
+            progress = {}
+            for key, value in self.connection.execute(
+                    "SELECT key, value FROM progress WHERE key != 'imported'"):
+                progress[key] = json.loads(value)
+            progress['stats'] = {
+                key: json.loads(value)
+                for key, value in self.connection.execute("SELECT key, value FROM stats")
+            }
+            progress['workout_counts'] = dict(
+                self.connection.execute("SELECT type, count FROM workout_counts ORDER BY rowid")
+            )
+            self._progress = progress
+        return self._progress
+
+    def _write_progress(self, progress_data):
+        for key, value in progress_data.items():
+            if key == 'stats':
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO stats (key, value) VALUES (?, ?)",
+                    ((k, json.dumps(v)) for k, v in value.items())
+                )
+            elif key == 'workout_counts':
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO workout_counts (type, count) VALUES (?, ?)",
+                    value.items()
+                )
+            elif key not in ('history', 'aggregates'):
+                # L'historique a sa table, les compteurs sont des requêtes
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO progress (key, value) VALUES (?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False))
+                )
+
+    def save_progress(self, progress_data, entry=None):
+        """Enregistre l'en-tête (et la nouvelle séance) en une transaction"""
+        self.commit_progress(progress_data, entry)
+        self._progress = progress_data
+
+    def cache_progress(self, progress_data):
+        """Sert progress_data comme en-tête avant son commit"""
+        self._progress = progress_data
+
+    def commit_progress(self, progress_data, entry=None):
+        """Transaction seule, sans toucher l'en-tête en mémoire (thread d'écriture)"""
+        with self.connection:
+            if entry is not None:
+                self._insert_entries([entry])
+            self._write_progress(progress_data)
+
+    # Requêtes, mêmes résultats que StatsAggregates : [séances, calories, secondes]
+    def _summary(self, where='', params=()):
+        row = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(calories), 0), COALESCE(SUM(seconds), 0) "
+            f"FROM history {where}",
+            params
+        ).fetchone()
+        return list(row)
+
+    def range_summary(self, start, end):
+        """Séances du jour start (inclus) au jour end (exclu)"""
+        return self._summary("WHERE date >= ? AND date < ?", (start, end))
+
+    def day(self, day):
+        return self._summary("WHERE date = ?", (day,))
+
+    def week(self, day):
+        return self.range_summary(*week_bounds(day))
+
+    def month(self, day):
+        return self.range_summary(*month_bounds(day))
+
+    def program(self, name):
+        row = self.connection.execute(
+            "SELECT count, calories, seconds FROM program_totals WHERE workout = ?", (name,)
+        ).fetchone()
+        return list(row) if row else [0, 0, 0]
+
+    def program_counts(self):
+        """Nombre de séances de chaque programme"""
+        return dict(self.connection.execute("SELECT workout, count FROM program_totals"))
+
+    @property
+    def totals(self):
+        # Une ligne par programme : quelques lignes, quelle que soit la taille de l'historique
+        row = self.connection.execute(
+            "SELECT COALESCE(SUM(count), 0), COALESCE(SUM(calories), 0), COALESCE(SUM(seconds), 0) "
+            "FROM program_totals"
+        ).fetchone()
+        return list(row)
+
+    def average_duration(self):
+        """Durée moyenne d'une séance, en secondes"""
+        count, _, seconds = self.totals
+        return seconds / count if count else 0
+
+    def favorite_program(self):
+        """Programme le plus pratiqué (ou None)"""
+        row = self.connection.execute(
+            "SELECT workout FROM program_totals ORDER BY count DESC, rowid LIMIT 1"
+        ).fetchone()
+        return row[0] if row else None
+
+    def average_calories(self, day, window=7):
+        """Calories moyennes par jour sur les window jours se terminant en day"""
+        end = date.fromisoformat(day) + timedelta(days=1)
+        return self.range_summary((end - timedelta(days=window)).isoformat(), end.isoformat())[1] / window
+
+    def duration_percentiles(self, q=(50, 90)):
+        """Percentiles q des durées de séance, en secondes (interpolation
+        linéaire, comme numpy.percentile), lus dans duration_counts"""
+        counts = self.connection.execute(
+            "SELECT seconds, count FROM duration_counts WHERE count > 0 ORDER BY seconds"
+        ).fetchall()
+        return histogram_percentiles(counts, q)
+
+
+def import_json_files(data_dir='data', db_path=None):
+    """Importe progress.json et le journal d'historique dans la base SQLite"""
+    from data_store import DataStore
+    from history_log import HistoryLog
+
+    store = DataStore(data_dir)
+    progress_data = store.progress
+    if db_path is None:
+        db_path = os.path.join(data_dir, 'progress.db')
+
+    database = ProgressDatabase(db_path)
+    if database.imported:
+        return database
+    if 'history' in progress_data:
+        entries = progress_data['history']
+    else:
+        entries = HistoryLog(os.path.join(data_dir, 'history'))
+    database.import_json(progress_data, entries)
+    return database
+
+
+if __name__ == '__main__':
+    database = import_json_files(*sys.argv[1:2])
+    print(f"{len(database)} séances dans {database.path}")
@@ -0,0 +1,40 @@
+import os
+import time
+
+
+class StartupTimer:
+    """Mesure les étapes du démarrage (chargement des modules, données,
+    interface, premier affichage).
+
+    mark(nom) enregistre la durée écoulée depuis l'étape précédente.
+    Le rapport est affiché si la variable d'environnement
+    FITNESS_STARTUP_REPORT est définie.
+    """
+
+    ENV_VAR = 'FITNESS_STARTUP_REPORT'
+
+    def __init__(self, start=None, clock=time.perf_counter):
+        self.clock = clock
+        self.start = clock() if start is None else start
+        self._last = self.start
+        # (étape, durée de l'étape, temps écoulé depuis le début), en secondes
+        self.steps = []
+
+    def mark(self, name):
+        now = self.clock()
+        self.steps.append((name, now - self._last, now - self.start))
+        self._last = now
+
+    def total(self):
+        return self._last - self.start
+
+    def report(self):
+        lines = ["Démarrage :"]
+        for name, duration, elapsed in self.steps:
+            lines.append(f"  {name:<28} {duration * 1000:8.1f} ms  (à {elapsed * 1000:8.1f} ms)")
+        lines.append(f"  {'total':<28} {self.total() * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+    def print_report(self, force=False):
+        if force or os.environ.get(self.ENV_VAR):
+            print(self.report())
@@ -0,0 +1,195 @@
+import functools
+from datetime import date, timedelta
+
+
+# Unités acceptées dans les durées texte ("15 sec", "15 min", "1 h")
+DURATION_UNITS = {
+    's': 1, 'sec': 1, 'secs': 1, 'seconde': 1, 'secondes': 1,
+    'min': 60, 'mins': 60, 'minute': 60, 'minutes': 60,
+    'h': 3600, 'heure': 3600, 'heures': 3600,
+}
+
+
+def parse_duration(value):
+    """Convertit une durée (900, "900", "15 min", "15 sec") en secondes"""
+    if value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    parts = str(value).strip().lower().split()
+    if not parts:
+        return 0
+    amount = int(float(parts[0].replace(',', '.')))
+    unit = parts[1] if len(parts) > 1 else 's'
+    return amount * DURATION_UNITS.get(unit, 1)
+
+
+def entry_seconds(entry):
+    """Durée d'une séance de l'historique, en secondes.
+
+    Les anciennes entrées stockent les secondes dans 'duration', les plus
+    récentes dans 'time' (et un libellé comme "15 min" dans 'duration').
+    """
+    if isinstance(entry.get('time'), (int, float)):
+        return int(entry['time'])
+    return parse_duration(entry.get('duration'))
+
+
+def histogram_percentiles(counts, q=(50, 90)):
+    """Percentiles q d'un histogramme [(valeur, nombre)] trié par valeur,
+    par interpolation linéaire (comme numpy.percentile)"""
+    total = sum(count for _, count in counts)
+    if not total:
+        return [0.0] * len(q)
+
+    def value(rank):
+        # Valeur de rang rank (0 : la plus petite)
+        for item, count in counts:
+            if rank < count:
+                return item
+            rank -= count
+        return counts[-1][0]
+
+    percentiles = []
+    for p in q:
+        position = p / 100 * (total - 1)
+        lower = int(position)
+        low, high = value(lower), value(min(lower + 1, total - 1))
+        percentiles.append(float(low + (high - low) * (position - lower)))
+    return percentiles
+
+
+@functools.lru_cache(maxsize=4096)
+def period_keys(day):
+    """Clés jour / semaine ISO / mois d'une date 'AAAA-MM-JJ'"""
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return day, f"{year}-W{week:02d}", day[:7]
+
+
+class StatsAggregates:
+    """Compteurs de statistiques tenus à jour à chaque séance.
+
+    Les compteurs sont stockés dans un dict (l'entrée 'aggregates' de
+    progress.json) sous la forme [séances, calories, secondes] par jour,
+    par semaine ISO, par mois et par programme, avec le nombre de séances
+    par durée (pour les percentiles). Ajouter une séance ou lire un
+    compteur coûte O(1), quelle que soit la taille de l'historique.
+
+    Les compteurs par jour et par semaine sont glissants : seuls les
+    DAILY_RETENTION derniers jours et WEEKLY_RETENTION dernières semaines
+    (par rapport à la séance la plus récente) sont gardés, pour que
+    l'en-tête de progress.json, réécrit à chaque séance, reste petit. Les
+    périodes plus anciennes se lisent dans l'historique (analytics.py).
+    """
+
+    SECTIONS = ('daily', 'weekly', 'monthly', 'programs', 'durations')
+    DAILY_RETENTION = 92
+    WEEKLY_RETENTION = 53
+
+    def __init__(self, data=None):
+        self.data = data if data is not None else {}
+        for section in self.SECTIONS:
+            self.data.setdefault(section, {})
+        self.data.setdefault('totals', [0, 0, 0])
+
+    @classmethod
+    def rebuild(cls, entries, data=None):
+        """Recalcule les compteurs en un seul passage sur l'historique"""
+        if data is not None:
+            data.clear()
+        aggregates = cls(data)
+        for entry in entries:
+            aggregates.add(entry)
+        return aggregates
+
+    @staticmethod
+    def _bump(bucket, calories, seconds):
+        bucket[0] += 1
+        bucket[1] += calories
+        bucket[2] += seconds
+
+    def add(self, entry):
+        """Prend en compte une nouvelle séance"""
+        calories = entry.get('calories', 0)
+        seconds = entry_seconds(entry)
+        day, week, month = period_keys(entry['date'])
+
+        new_day = day not in self.data['daily']
+        for section, key in (('daily', day), ('weekly', week),
+                             ('monthly', month), ('programs', entry['workout'])):
+            bucket = self.data[section].setdefault(key, [0, 0, 0])
+            self._bump(bucket, calories, seconds)
+        self._bump(self.data['totals'], calories, seconds)
+        # Clés texte : le dict est enregistré en JSON
+        durations = self.data['durations']
+        durations[str(seconds)] = durations.get(str(seconds), 0) + 1
+        if new_day:
+            # Une fois par jour : la fenêtre glissante avance au plus
+            self.prune()
+
+    def prune(self):
+        """Retire les jours et semaines sortis de la fenêtre glissante ;
+        retourne True si des compteurs ont été retirés"""
+        daily, weekly = self.data['daily'], self.data['weekly']
+        if not daily:
+            return False
+        latest = date.fromisoformat(max(daily))
+        first_day = (latest - timedelta(days=self.DAILY_RETENTION - 1)).isoformat()
+        first_week = period_keys((latest - timedelta(weeks=self.WEEKLY_RETENTION - 1)).isoformat())[1]
+        # Les clés 'AAAA-MM-JJ' et 'AAAA-Wss' se comparent dans l'ordre chronologique
+        old_days = [key for key in daily if key < first_day]
+        old_weeks = [key for key in weekly if key < first_week]
+        for key in old_days:
+            del daily[key]
+        for key in old_weeks:
+            del weekly[key]
+        return bool(old_days or old_weeks)
+
+    def _get(self, section, key):
+        return self.data[section].get(key, (0, 0, 0))
+
+    def day(self, day):
+        # Jours et semaines : 0 en dehors de la fenêtre glissante
+        return self._get('daily', day)
+
+    def week(self, day):
+        return self._get('weekly', period_keys(day)[1])
+
+    def month(self, day):
+        return self._get('monthly', day[:7])
+
+    def program(self, name):
+        return self._get('programs', name)
+
+    def program_counts(self):
+        """Nombre de séances de chaque programme"""
+        return {name: counts[0] for name, counts in self.data['programs'].items()}
+
+    @property
+    def totals(self):
+        return self.data['totals']
+
+    def average_duration(self):
+        """Durée moyenne d'une séance, en secondes"""
+        count, _, seconds = self.totals
+        return seconds / count if count else 0
+
+    def favorite_program(self):
+        """Programme le plus pratiqué (ou None)"""
+        programs = self.data['programs']
+        if not programs:
+            return None
+        return max(programs, key=lambda name: programs[name][0])
+
+    def average_calories(self, day, window=7):
+        """Calories moyennes par jour sur les window jours se terminant en day
+        (window au plus DAILY_RETENTION)"""
+        last = date.fromisoformat(day)
+        days = ((last - timedelta(days=i)).isoformat() for i in range(window))
+        return sum(self.day(key)[1] for key in days) / window
+
+    def duration_percentiles(self, q=(50, 90)):
+        """Percentiles q des durées de séance, en secondes"""
+        counts = sorted((int(seconds), count) for seconds, count in self.data['durations'].items())
+        return histogram_percentiles(counts, q)
@@ -0,0 +1,155 @@
+"""Séries de jours d'entraînement consécutifs.
+
+Une séance compte pour un « jour d'activité » : sa date dans le fuseau
+horaire choisi, la journée commençant à day_start_hour (une séance à 1 h
+du matin, avec un début de journée à 4 h, compte pour la veille).
+
+StreakIndex découpe l'ensemble trié des jours d'activité en plages de
+jours consécutifs, en un seul passage. Série actuelle, meilleure série et
+« série au jour X » se lisent ensuite sur ces plages (recherche
+dichotomique), sans relire l'historique.
+"""
+import bisect
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+def load_timezone(name):
+    """Fuseau horaire IANA ("Europe/Paris"), ou None pour l'heure locale"""
+    if not name:
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        print(f"Erreur lors du chargement du fuseau horaire {name}: {e}")
+        return None
+
+
+def localize(moment, tz=None):
+    """Heure de moment (datetime) dans le fuseau tz, ou en heure locale"""
+    if tz is not None:
+        # Un datetime naïf est pris en heure locale du système
+        return moment.astimezone(tz)
+    if moment.tzinfo is not None:
+        return moment.astimezone()
+    return moment
+
+
+def activity_day(moment, tz=None, day_start_hour=0):
+    """Jour d'activité d'une séance commencée à moment (datetime)"""
+    return (localize(moment, tz) - timedelta(hours=day_start_hour)).date()
+
+
+def _ordinal(day):
+    if isinstance(day, int):
+        return day
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    return day.toordinal()
+
+
+def update_streak(stats, day):
+    """Met à jour streak, best_streak et last_workout_date pour une séance
+    du jour day (date), en O(1)"""
+    last = stats.get('last_workout_date')
+    if last:
+        gap = (day - date.fromisoformat(last)).days
+        if gap < 0:
+            # Séance antérieure à la dernière (import, horloge) : voir StreakIndex
+            return
+        if gap == 1:
+            stats['streak'] += 1
+        elif gap > 1:
+            stats['streak'] = 1
+    else:
+        stats['streak'] = 1
+    stats['best_streak'] = max(stats.get('best_streak', 0), stats['streak'])
+    stats['last_workout_date'] = day.isoformat()
+
+
+class StreakIndex:
+    """Plages de jours d'activité consécutifs : [(premier jour, dernier jour)]"""
+
+    def __init__(self, runs=()):
+        self.runs = list(runs)
+        # Premiers jours des plages, pour la recherche dichotomique
+        self._starts = [start for start, _ in self.runs]
+        self.best = max((end - start + 1 for start, end in self.runs), default=0)
+
+    @classmethod
+    def from_days(cls, days):
+        """Construit l'index à partir de jours (ordinaux, dates ou 'AAAA-MM-JJ')"""
+        runs = []
+        for day in sorted({_ordinal(day) for day in days}):
+            if runs and day == runs[-1][1] + 1:
+                runs[-1][1] = day
+            else:
+                runs.append([day, day])
+        return cls((start, end) for start, end in runs)
+
+    @property
+    def last_day(self):
+        return date.fromordinal(self.runs[-1][1]) if self.runs else None
+
+    @property
+    def last_streak(self):
+        """Longueur de la dernière série (celle de stats['streak'])"""
+        if not self.runs:
+            return 0
+        start, end = self.runs[-1]
+        return end - start + 1
+
+    def add(self, day):
+        """Ajoute un jour d'activité (O(1) pour un jour récent)"""
+        day = _ordinal(day)
+        if self.runs and day >= self.runs[-1][0]:
+            start, end = self.runs[-1]
+            if day <= end:
+                return
+            if day == end + 1:
+                self.runs[-1] = (start, day)
+            else:
+                self.runs.append((day, day))
+                self._starts.append(day)
+            start, end = self.runs[-1]
+            self.best = max(self.best, end - start + 1)
+            return
+        # Jour ancien : l'index est reconstruit
+        rebuilt = StreakIndex.from_days(
+            [d for start, end in self.runs for d in range(start, end + 1)] + [day]
+        )
+        self.runs, self._starts, self.best = rebuilt.runs, rebuilt._starts, rebuilt.best
+
+    def as_of(self, day):
+        """Série en cours au jour day : jours consécutifs jusqu'à day, ou
+        jusqu'à la veille si day n'a pas (encore) de séance ; 0 sinon"""
+        day = _ordinal(day)
+        i = bisect.bisect_right(self._starts, day) - 1
+        if i < 0:
+            return 0
+        start, end = self.runs[i]
+        if day <= end:
+            return day - start + 1
+        if day == end + 1:
+            return end - start + 1
+        return 0
+
+    def apply(self, stats):
+        """Écrit série, meilleure série et dernier jour dans les stats"""
+        stats['streak'] = self.last_streak
+        stats['best_streak'] = self.best
+        last_day = self.last_day
+        stats['last_workout_date'] = last_day.isoformat() if last_day else None
+
+
+def current_streak(stats, today):
+    """Série affichée le jour today : celle des stats si elle est encore
+    en cours (séance aujourd'hui ou hier), 0 sinon"""
+    last = stats.get('last_workout_date')
+    if not last:
+        return 0
+    if isinstance(today, str):
+        today = date.fromisoformat(today)
+    elif isinstance(today, datetime):
+        today = today.date()
+    return stats['streak'] if (today - date.fromisoformat(last)).days <= 1 else 0
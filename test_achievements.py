@@ -0,0 +1,79 @@
+import unittest
+from datetime import datetime
+
+from achievements import AchievementEngine, ProgramRule, StreakRule, TimeOfDayRule, TotalRule
+
+
+def progress(**stats):
+    data = {"total_workouts": 0, "total_calories": 0, "streak": 0}
+    data.update(stats)
+    return {"stats": data, "achievements": []}
+
+
+ENTRY = {"date": "2024-12-03", "workout": "HIIT Intensif", "calories": 20}
+MORNING = datetime(2024, 12, 3, 7)
+EVENING = datetime(2024, 12, 3, 18)
+
+
+class TestAchievementEngine(unittest.TestCase):
+    def test_thresholds(self):
+        """Totaux et séries sont débloqués au seuil, une seule fois"""
+        engine = AchievementEngine([
+            TotalRule('first', "Premier pas", 'total_workouts', 1),
+            TotalRule('calories', "Brûleur", 'total_calories', 100),
+            StreakRule('streak_3', "Régulier", 3),
+        ])
+        data = progress(total_workouts=1, total_calories=20, streak=1)
+        new = engine.record(data, ENTRY, EVENING, 1)
+        self.assertEqual([a['id'] for a in new], ['first'])
+        self.assertEqual(data['achievements'], [{"id": "first", "name": "Premier pas", "date": "2024-12-03"}])
+
+        data['stats'].update(total_workouts=2, total_calories=120, streak=3)
+        new = engine.record(data, ENTRY, EVENING, 2)
+        self.assertEqual(sorted(a['id'] for a in new), ['calories', 'streak_3'])
+        self.assertEqual(engine.record(data, ENTRY, EVENING, 3), [])
+        self.assertEqual(len(data['achievements']), 3)
+
+    def test_only_affected_rules(self):
+        """Les règles d'autres programmes ou d'autres heures ne sont pas évaluées"""
+        yoga = ProgramRule('yoga', "Zen", 1, program="Yoga")
+        early = TimeOfDayRule('early', "Lève-tôt", 5, 8, 2)
+        any_program = ProgramRule('any', "Spécialiste", 2)
+        engine = AchievementEngine([yoga, early, any_program])
+        self.assertEqual(list(engine.affected_rules(ENTRY, EVENING)), [any_program])
+
+        yoga.reached = early.reached = None  # une évaluation échouerait
+        data = progress()
+        self.assertEqual(engine.record(data, ENTRY, EVENING, 1), [])
+        self.assertEqual(data['achievement_counters'], {})
+        self.assertEqual([a['id'] for a in engine.record(data, ENTRY, EVENING, 2)], ['any'])
+
+    def test_backfill(self):
+        """Un historique importé débloque ses succès, sauf par plage horaire"""
+        engine = AchievementEngine([
+            TotalRule('first', "Premier pas", 'total_workouts', 1),
+            StreakRule('streak_3', "Régulier", 3),
+            ProgramRule('any', "Spécialiste", 2),
+            ProgramRule('yoga', "Zen", 1, program="Yoga"),
+            TimeOfDayRule('early', "Lève-tôt", 5, 8, 1),
+        ])
+        data = progress(total_workouts=3, streak=1, best_streak=3, last_workout_date="2024-12-05")
+        new = engine.backfill(data, {"HIIT Intensif": 2, "Cardio Express": 1})
+        self.assertEqual([a['id'] for a in new], ['first', 'streak_3', 'any'])
+        self.assertEqual(new[0]['date'], "2024-12-05")
+        new = engine.backfill(data, {"HIIT Intensif": 2, "Yoga": 1})
+        self.assertEqual([a['id'] for a in new], ['yoga'])
+        self.assertEqual(len(data['achievements']), 4)
+
+    def test_time_of_day(self):
+        """Les séances d'une plage horaire sont comptées"""
+        engine = AchievementEngine([TimeOfDayRule('early', "Lève-tôt", 5, 8, 2)])
+        data = progress()
+        self.assertEqual(engine.record(data, ENTRY, MORNING, 1), [])
+        self.assertEqual(engine.record(data, ENTRY, EVENING, 2), [])
+        self.assertEqual([a['id'] for a in engine.record(data, ENTRY, MORNING, 3)], ['early'])
+        self.assertEqual(data['achievement_counters'], {'early': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+
+from analytics import HistoryColumns
+
+
+HISTORY = [
+    {"date": "2024-12-01", "workout": "Cardio Express", "calories": 100, "duration": 900},
+    {"date": "2024-12-03", "workout": "HIIT Intensif", "calories": 20, "time": 15},
+    {"date": "2024-12-03", "workout": "HIIT Intensif", "calories": 40, "time": 30},
+    {"date": "2024-12-07", "workout": "Cardio Express", "calories": 60, "time": 60},
+]
+
+
+class TestHistoryColumns(unittest.TestCase):
+    def setUp(self):
+        self.columns = HistoryColumns.from_entries(HISTORY)
+
+    def test_columns(self):
+        """Chaque séance devient une ligne des tableaux"""
+        self.assertEqual(len(self.columns), 4)
+        self.assertEqual(self.columns.program_names, ["Cardio Express", "HIIT Intensif"])
+        self.assertEqual(self.columns.programs.tolist(), [0, 1, 1, 0])
+        self.assertEqual(self.columns.seconds.tolist(), [900, 15, 30, 60])
+
+    def test_growth(self):
+        """Les tableaux s'agrandissent au-delà de la capacité initiale"""
+        columns = HistoryColumns(capacity=2)
+        columns.extend(HISTORY * 3)
+        self.assertEqual(len(columns), 12)
+        self.assertEqual(columns.range_sum("2024-12-01", "2024-12-31"), 660)
+
+    def test_extend_records(self):
+        """Les HistoryRecord donnent les mêmes colonnes que les dicts"""
+        from records import HistoryRecord, ProgramTable
+        programs = ProgramTable()
+        records = [HistoryRecord.from_entry(entry, programs) for entry in HISTORY]
+        columns = HistoryColumns(capacity=2)
+        columns.extend_records(records, programs)
+        for name in HistoryColumns.COLUMNS:
+            self.assertEqual(getattr(columns, name).tolist(), getattr(self.columns, name).tolist())
+
+    def test_extend_log(self):
+        """Les segments du journal sont lus en tableaux, ou ligne par ligne
+        s'ils ont une ligne tronquée"""
+        import shutil
+        import tempfile
+        from history_log import HistoryLog
+        directory = tempfile.mkdtemp()
+        try:
+            log = HistoryLog(directory, segment_size=2)
+            log.extend(HISTORY)
+            with open(log.segments()[0], 'a', encoding='utf-8') as f:
+                f.write('[739')
+            columns = HistoryColumns(capacity=2)
+            columns.extend_log(HistoryLog(directory))
+            for name in HistoryColumns.COLUMNS:
+                self.assertEqual(getattr(columns, name).tolist(), getattr(self.columns, name).tolist())
+            self.assertEqual(columns.program_names, self.columns.program_names)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_range_queries(self):
+        """Sommes et comptes sur une période, triée ou non"""
+        self.assertEqual(self.columns.range_sum("2024-12-02", "2024-12-03"), 60)
+        self.assertEqual(self.columns.range_count("2024-12-03", "2024-12-07"), 3)
+        self.assertEqual(self.columns.range_sum("2024-12-01", "2024-12-31", 'seconds'), 1005)
+
+        unsorted = HistoryColumns.from_entries(reversed(HISTORY))
+        self.assertEqual(unsorted.range_sum("2024-12-02", "2024-12-03"), 60)
+        self.assertEqual(unsorted.range_count("2024-12-03", "2024-12-07"), 3)
+
+    def test_daily_series_and_moving_average(self):
+        """Série quotidienne complétée de zéros et moyenne glissante"""
+        series = self.columns.daily_series("2024-12-01", "2024-12-04")
+        self.assertEqual(series.tolist(), [100, 0, 60, 0])
+
+        averages = self.columns.moving_average("2024-12-02", "2024-12-03", window=2)
+        self.assertEqual(averages.tolist(), [50.0, 30.0])
+
+    def test_group_by_program(self):
+        """Totaux par programme"""
+        self.assertEqual(self.columns.group_by_program(),
+                         {"Cardio Express": 160, "HIIT Intensif": 60})
+        self.assertEqual(self.columns.group_by_program('count'),
+                         {"Cardio Express": 2, "HIIT Intensif": 2})
+
+    def test_percentiles(self):
+        """Percentiles des durées"""
+        median, maximum = self.columns.duration_percentiles((50, 100))
+        self.assertEqual(median, 45)
+        self.assertEqual(maximum, 900)
+        self.assertEqual(HistoryColumns().duration_percentiles((50, 90)), [0.0, 0.0])
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            self.columns.range_sum("2024-12-01", "2024-12-31", 'poids')
+
+
+if __name__ == '__main__':
+    unittest.main()
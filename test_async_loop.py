@@ -0,0 +1,115 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from async_loop import AsyncTkLoop, worker_call
+from io_worker import IOWorker
+
+
+class FakeTk:
+    def __init__(self):
+        self.events = 0
+
+    def dooneevent(self, flags):
+        self.events += 1
+        # Un événement prêt sur deux appels
+        return self.events % 2
+
+
+class IdleTk:
+    """Aucun événement, sauf aux appels listés"""
+
+    def __init__(self, busy_calls=()):
+        self.calls = 0
+        self.busy_calls = set(busy_calls)
+
+    def dooneevent(self, flags):
+        self.calls += 1
+        return self.calls in self.busy_calls
+
+
+class FakeWindow:
+    """Fenêtre fermée après un nombre donné de tours de boucle"""
+
+    def __init__(self, turns):
+        self.tk = FakeTk()
+        self.turns = turns
+
+    def winfo_exists(self):
+        self.turns -= 1
+        return self.turns >= 0
+
+
+class TestAsyncTkLoop(unittest.TestCase):
+    def test_pump_until_window_closed(self):
+        """Tk et les coroutines avancent ensemble jusqu'à la fermeture"""
+        window = FakeWindow(turns=20)
+        loop = AsyncTkLoop(window, interval=0)
+        ticks = []
+
+        async def timer():
+            while True:
+                ticks.append(window.tk.events)
+                await asyncio.sleep(0)
+
+        loop.run(timer())
+        self.assertGreater(window.tk.events, 20)
+        self.assertGreater(len(ticks), 5)
+        # La tâche encore active a été annulée à la fermeture
+        self.assertEqual(loop._tasks, set())
+
+    def test_idle_backoff(self):
+        """Sans événement Tk, l'attente s'allonge jusqu'à max_interval ;
+        un événement la ramène à interval"""
+        window = FakeWindow(turns=10)
+        # Le 7e tour traite un événement (appels 7 et 8 : événement puis fin)
+        window.tk = IdleTk(busy_calls={7})
+        loop = AsyncTkLoop(window, interval=0.001, max_interval=0.004, idle_after=0)
+        delays = []
+        sleep = asyncio.sleep
+
+        async def record_sleep(delay):
+            delays.append(delay)
+            await sleep(0)
+
+        with patch('async_loop.asyncio.sleep', record_sleep):
+            loop.run()
+        self.assertEqual(delays, [0.002, 0.004, 0.004, 0.004, 0.004, 0.004, 0.001, 0.002, 0.004, 0.004])
+
+    def test_failing_task(self):
+        """L'erreur d'une tâche n'arrête pas la boucle"""
+        loop = AsyncTkLoop(FakeWindow(turns=5), interval=0)
+
+        async def broken():
+            raise RuntimeError("export impossible")
+
+        loop.run(broken())
+
+    def test_worker_call(self):
+        """Une coroutine attend une écriture de l'IOWorker sans bloquer la boucle"""
+        worker = IOWorker()
+        results = []
+
+        async def main():
+            async def poll():
+                while True:
+                    worker.poll()
+                    await asyncio.sleep(0.001)
+
+            poller = asyncio.ensure_future(poll())
+            await worker_call(worker, 'history', results.append, 'compacté')
+            with self.assertRaises(OSError):
+                await worker_call(worker, 'history', self.fail_write)
+            poller.cancel()
+
+        asyncio.run(main())
+        worker.close()
+        self.assertEqual(results, ['compacté'])
+
+    @staticmethod
+    def fail_write():
+        raise OSError("disque plein")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+import benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_generators(self):
+        """Les jeux synthétiques ont la taille demandée et un format valide"""
+        programs = benchmarks.make_programs(50)
+        history = benchmarks.make_history(200, programs)
+        progress = benchmarks.make_progress(history)
+
+        self.assertEqual(len(programs), 50)
+        self.assertEqual(len(history), 200)
+        self.assertEqual([e['date'] for e in history], sorted(e['date'] for e in history))
+        self.assertEqual(progress['stats']['total_workouts'], 200)
+        self.assertEqual(sum(progress['workout_counts'].values()), 200)
+        # Reproductible avec la même graine
+        self.assertEqual(history, benchmarks.make_history(200, programs))
+
+    def test_percentile(self):
+        values = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.assertEqual(benchmarks.percentile(values, 50), 3.0)
+        self.assertEqual(benchmarks.percentile(values, 100), 5.0)
+        self.assertAlmostEqual(benchmarks.percentile(values, 90), 4.6)
+
+    def test_compare(self):
+        """Seuls les ralentissements au-delà de la tolérance sont signalés"""
+        baseline = {'load_programs': {'100': {'p50': 1.0}}}
+        self.assertEqual(benchmarks.compare({'load_programs': {'100': {'p50': 1.2}}}, baseline), [])
+        self.assertEqual(
+            benchmarks.compare({'load_programs': {'100': {'p50': 2.0}}}, baseline),
+            [('load_programs', '100', 1.0, 2.0)]
+        )
+
+    def test_run(self):
+        """Exécution rapide des bancs sur un petit jeu de données"""
+        results = benchmarks.run(
+            sizes=[20], repeat=2,
+            names=['update_progress_file', 'stats_summary', 'animate_circles'],
+            log=lambda message: None
+        )
+        self.assertEqual(set(results), {'update_progress_file', 'stats_summary', 'animate_circles'})
+        for sizes in results.values():
+            self.assertGreaterEqual(sizes['20']['p90'], sizes['20']['p50'])
+
+
+if __name__ == '__main__':
+    unittest.main()
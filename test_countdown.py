@@ -0,0 +1,68 @@
+import unittest
+
+from countdown import Countdown
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCountdown(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.countdown = Countdown(60, clock=self.clock)
+
+    def test_remaining_from_clock(self):
+        """Le temps restant dépend de l'horloge, pas du nombre de ticks"""
+        self.countdown.start()
+        self.assertEqual(self.countdown.remaining_seconds(), 60)
+        self.clock.now += 0.4
+        self.assertEqual(self.countdown.remaining_seconds(), 60)
+        self.clock.now += 0.6
+        self.assertEqual(self.countdown.remaining_seconds(), 59)
+
+        # Un tick très en retard ne rallonge pas la séance
+        self.clock.now += 58.0
+        self.assertEqual(self.countdown.remaining_seconds(), 1)
+        self.clock.now += 1.0
+        self.assertTrue(self.countdown.finished)
+        self.assertEqual(self.countdown.remaining_seconds(), 0)
+
+    def test_pause_and_resume(self):
+        """Le temps passé en pause n'est pas décompté"""
+        self.countdown.start()
+        self.clock.now += 10
+        self.countdown.pause()
+        self.assertFalse(self.countdown.running)
+        self.clock.now += 100
+        self.assertEqual(self.countdown.remaining(), 50)
+        self.countdown.resume()
+        self.clock.now += 5
+        self.assertEqual(self.countdown.remaining(), 45)
+        self.assertAlmostEqual(self.countdown.progress(), 0.25)
+
+    def test_next_tick_on_second_boundary(self):
+        """Le prochain tick tombe exactement au changement de seconde"""
+        self.countdown.start()
+        self.assertEqual(self.countdown.ms_until_next_tick(), 1000)
+        self.clock.now += 0.25
+        self.assertEqual(self.countdown.ms_until_next_tick(), 750)
+        self.clock.now += 1.5
+        self.assertEqual(self.countdown.ms_until_next_tick(), 250)
+        self.clock.now += 60
+        self.assertEqual(self.countdown.ms_until_next_tick(), 0)
+
+    def test_reset(self):
+        self.countdown.start()
+        self.clock.now += 10
+        self.countdown.reset(30)
+        self.assertFalse(self.countdown.running)
+        self.assertEqual(self.countdown.remaining(), 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
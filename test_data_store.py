@@ -0,0 +1,75 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from data_store import DataStore
+
+
+class TestDataStore(unittest.TestCase):
+    def setUp(self):
+        """Crée un répertoire de données temporaire"""
+        self.data_dir = tempfile.mkdtemp()
+        self.write('settings.json', {"user": {"name": "TEST", "age": 25}})
+        self.write('workout_programs.json', {"HIIT": {"name": "HIIT Intensif"}})
+        self.store = DataStore(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def write(self, filename, data):
+        with open(os.path.join(self.data_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def test_load_once(self):
+        """Un fichier inchangé n'est lu qu'une seule fois"""
+        self.assertEqual(self.store.user['name'], "TEST")
+        with patch('builtins.open', side_effect=open) as mock_open:
+            self.assertEqual(self.store.user['name'], "TEST")
+            self.assertIn('HIIT', self.store.programs)
+            # Seul le fichier des programmes, jamais chargé, a été ouvert
+            self.assertEqual(mock_open.call_count, 1)
+
+    def test_reload_when_file_changes(self):
+        """Le fichier est relu quand sa taille ou sa date change"""
+        self.assertEqual(self.store.user['name'], "TEST")
+        self.write('settings.json', {"user": {"name": "AUTRE NOM", "age": 30}})
+        self.assertEqual(self.store.user['name'], "AUTRE NOM")
+
+    def test_save_updates_cache(self):
+        """save() écrit le fichier sans provoquer de relecture"""
+        settings = self.store.settings
+        settings['user']['name'] = "NOUVEAU"
+        self.store.save('settings', settings)
+
+        with patch('builtins.open', side_effect=open) as mock_open:
+            self.assertEqual(self.store.user['name'], "NOUVEAU")
+            mock_open.assert_not_called()
+
+        with open(self.store.path('settings'), encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['user']['name'], "NOUVEAU")
+
+    def test_revision(self):
+        """La révision change à chaque rechargement ou sauvegarde, pas à la lecture"""
+        revision = self.store.revision('programs')
+        self.assertEqual(self.store.revision('programs'), revision)
+        self.store.save('programs', self.store.programs)
+        self.assertGreater(self.store.revision('programs'), revision)
+
+    def test_revision_across_stores(self):
+        """Un nouveau dépôt (changement de profil) ne reprend pas les révisions d'un autre"""
+        revision = self.store.revision('programs')
+        other = DataStore(self.store.data_dir)
+        self.assertNotEqual(other.revision('programs'), revision)
+
+    def test_invalidate(self):
+        """invalidate() force la relecture au prochain accès"""
+        self.store.settings['user']['name'] = "MODIFIÉ EN MÉMOIRE"
+        self.store.invalidate('settings')
+        self.assertEqual(self.store.user['name'], "TEST")
+
+
+if __name__ == '__main__':
+    unittest.main()
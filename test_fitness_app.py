@@ -38,12 +38,25 @@ class TestModernFitnessApp(unittest.TestCase):
         self.assertEqual(self.app.time_remaining, 60)
         self.assertEqual(self.app.timer_completions, 0)
 
-    @patch('builtins.open', new_callable=unittest.mock.mock_open, 
-           read_data='{"user": {"name": "TEST", "age": 25, "weight": 70, "height": 180}}')
-    def test_load_user_settings(self, mock_open):
-        """Test du chargement des paramètres utilisateur"""
-        self.app.create_sidebar()
-        mock_open.assert_called_with('data/settings.json', 'r', encoding='utf-8')
+    def test_lazy_views(self):
+        """Seule la vue par défaut est construite au démarrage"""
+        app = ModernFitnessApp()
+        try:
+            self.assertTrue(hasattr(app, 'workout_frame'))
+            self.assertFalse(hasattr(app, 'stats_frame'))
+            self.assertFalse(hasattr(app, 'settings_frame'))
+            app.show_view('settings')
+            self.assertTrue(hasattr(app, 'settings_frame'))
+        finally:
+            app.window.destroy()
+
+    def test_load_user_settings(self):
+        """Test du chargement des paramètres utilisateur depuis le cache"""
+        with patch('builtins.open', new_callable=unittest.mock.mock_open) as mock_open:
+            self.app.create_sidebar()
+            # Les paramètres sont déjà en mémoire : aucune relecture du fichier
+            mock_open.assert_not_called()
+        self.assertIn('name', self.app.store.user)
 
     def test_show_view(self):
         """Test du changement de vue"""
@@ -53,6 +66,33 @@ class TestModernFitnessApp(unittest.TestCase):
         self.app.show_view('workout')
         self.assertTrue(hasattr(self.app, 'workout_frame'))
 
+    def test_views_are_cached(self):
+        """La navigation réutilise les vues au lieu de les recréer"""
+        self.app.show_view('stats')
+        stats_frame = self.app.stats_frame
+        widget_count = len(self.app.content_frame.winfo_children())
+        
+        for _ in range(3):
+            self.app.show_view('workout')
+            self.app.show_view('stats')
+        
+        self.assertIs(self.app.stats_frame, stats_frame)
+        self.assertEqual(len(self.app.content_frame.winfo_children()), widget_count)
+
+    def test_program_list_is_virtualized(self):
+        """Seules les cartes visibles sont créées, quel que soit le nombre de programmes"""
+        self.app.workout_program_items = [
+            (str(i), {
+                'name': f'Programme {i}',
+                'description': 'Test',
+                'durations': [{'name': '5 min', 'duration': 300}]
+            })
+            for i in range(1000)
+        ]
+        self.app.programs_list.set_count(1000)
+        self.app.window.update_idletasks()
+        self.assertLess(self.app.programs_list.row_widget_count(), 50)
+
     @patch('json.dump')
     @patch('builtins.open', new_callable=unittest.mock.mock_open)
     def test_save_user_settings(self, mock_open, mock_json_dump):
@@ -97,11 +137,9 @@ class TestModernFitnessApp(unittest.TestCase):
         self.assertEqual(self.app.time_remaining, 60)
         self.assertFalse(self.app.timer_running)
 
-    @patch('json.load')
-    @patch('builtins.open', new_callable=unittest.mock.mock_open)
-    def test_update_progress_file(self, mock_open, mock_json_load):
+    def test_update_progress_file(self):
         """Test de la mise à jour du fichier de progression"""
-        mock_json_load.return_value = {
+        progress_data = {
             'stats': {
                 'total_workouts': 0,
                 'total_calories': 0,
@@ -109,9 +147,11 @@ class TestModernFitnessApp(unittest.TestCase):
                 'best_streak': 0,
                 'last_workout_date': None
             },
-            'history': [],
             'workout_counts': {'HIIT': 0}
         }
+        self.app.store.load = Mock(return_value=progress_data)
+        self.app.core.history = Mock()
+        self.app.store.save = Mock()
         
         test_program = {
             'name': 'HIIT Test',
@@ -125,7 +165,11 @@ class TestModernFitnessApp(unittest.TestCase):
         }
         
         self.app.update_progress_file(test_program)
-        mock_open.assert_called()
+        # L'historique est écrit sur un thread d'écriture
+        self.app.worker.drain()
+        self.app.store.save.assert_called_once_with('progress', progress_data)
+        self.assertEqual(progress_data['stats']['total_workouts'], 1)
+        self.app.core.history.append.assert_called_once()
 
     def test_hsv_to_rgb(self):
         """Test de la conversion HSV vers RGB"""
@@ -158,23 +202,23 @@ class TestWorkoutPrograms(unittest.TestCase):
     def tearDown(self):
         self.app.window.destroy()
 
-    @patch('json.load')
-    @patch('builtins.open', new_callable=unittest.mock.mock_open)
-    def test_create_new_program(self, mock_open, mock_json_load):
+    def test_create_new_program(self):
         """Test de la création d'un nouveau programme"""
-        mock_json_load.return_value = {}
+        programs = {}
+        self.app.store.load = Mock(return_value=programs)
+        self.app.store.save = Mock()
         
         with patch('tkinter.messagebox.showinfo') as mock_showinfo:
             self.app.save_program(None, "Test Program", "Test Description", Mock())
-            mock_open.assert_called()
+            self.app.store.save.assert_called_once_with('programs', programs)
+            self.assertEqual(programs['program_1']['name'], "Test Program")
 
-    @patch('json.load')
-    @patch('builtins.open', new_callable=unittest.mock.mock_open)
-    def test_delete_program(self, mock_open, mock_json_load):
+    def test_delete_program(self):
         """Test de la suppression d'un programme"""
-        mock_json_load.return_value = {
+        self.app.store.load = Mock(return_value={
             'program_1': {'name': 'Test Program'}
-        }
+        })
+        self.app.store.save = Mock()
         
         with patch('tkinter.messagebox.askyesno', return_value=True):
             with patch('tkinter.messagebox.showinfo') as mock_showinfo:
@@ -0,0 +1,278 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from fitness_core import FitnessCore
+
+
+class TestFitnessCore(unittest.TestCase):
+    def setUp(self):
+        """Crée un répertoire de données temporaire"""
+        self.data_dir = tempfile.mkdtemp()
+        self.write('settings.json', {"user": {"name": "TEST", "age": 25, "weight": 70, "height": 180}})
+        self.write('workout_programs.json', {
+            "HIIT": {
+                "name": "HIIT Intensif",
+                "description": "Test",
+                "durations": [{"time": 30, "name": "30 sec", "calories": 40}],
+                "exercises": [{"name": "Burpees"}]
+            }
+        })
+        self.write('progress.json', {
+            "history": [],
+            "stats": {
+                "total_workouts": 0,
+                "total_calories": 0,
+                "streak": 0,
+                "best_streak": 0,
+                "last_workout_date": None
+            },
+            "workout_counts": {"HIIT": 0}
+        })
+        self.core = FitnessCore(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def write(self, filename, data):
+        with open(os.path.join(self.data_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def read(self, filename):
+        with open(os.path.join(self.data_dir, filename), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_session_measures_exercises(self):
+        """exercises_completed vient du déroulé, pas du nombre d'exercices"""
+        program = self.core.programs['HIIT']
+        program['exercises'] = [{"name": "Burpees", "duration": 30, "sets": 1},
+                                {"name": "Squats", "duration": 30, "sets": 1}]
+        now = [0.0]
+        session = self.core.start_session('HIIT', program['durations'][0], clock=lambda: now[0])
+        now[0] = 20.0
+        self.assertEqual(session.current_segment().name, "Squats")
+        entry = self.core.complete_session(session, now=datetime(2024, 12, 3, 18))
+        self.assertEqual(entry['exercises_completed'], 1)
+
+    def test_abandoned_session(self):
+        """Une séance arrêtée avant la fin enregistre les exercices terminés"""
+        program = self.core.programs['HIIT']
+        program['exercises'] = [{"name": "Burpees", "duration": 10, "sets": 1},
+                                {"name": "Squats", "duration": 10, "sets": 1},
+                                {"name": "Pompes", "duration": 10, "sets": 1}]
+        now = [0.0]
+        session = self.core.start_session('HIIT', program['durations'][0], clock=lambda: now[0])
+        now[0] = 5.0
+        self.assertIsNone(self.core.abandon_session(session))
+
+        now[0] = 21.0
+        entry = self.core.abandon_session(session, now=datetime(2024, 12, 3, 18))
+        self.assertEqual((entry['exercises_completed'], entry['completed']), (2, False))
+        self.assertEqual((entry['time'], entry['calories']), (21, 28))
+        # Une séance n'est enregistrée qu'une fois
+        self.assertIsNone(self.core.abandon_session(session))
+        self.assertEqual(len(self.core.history), 1)
+
+    def test_session_unlocks_achievements(self):
+        """Une séance enregistrée débloque les succès atteints"""
+        program = self.core.programs['HIIT']
+        self.core.record_workout(program, program['durations'][0], now=datetime(2024, 12, 3, 7))
+        self.assertEqual([a['id'] for a in self.core.new_achievements], ['first_workout'])
+        self.assertEqual(self.read('progress.json')['achievements'][0]['id'], 'first_workout')
+
+        self.core.record_workout(program, program['durations'][0], now=datetime(2024, 12, 4, 7))
+        self.assertEqual(self.core.new_achievements, [])
+        self.assertEqual(self.core.load_progress()['achievement_counters']['early_bird'], 2)
+
+    def test_achievements_use_local_time(self):
+        """Plage horaire et jour d'une séance sont lus dans le fuseau choisi ;
+        le nombre de séances du programme vient des compteurs"""
+        self.core.store.settings['app'] = {"timezone": "Asia/Tokyo"}
+        program = self.core.programs['HIIT']
+        # 21 h 30 UTC : 6 h 30 le lendemain à Tokyo
+        entry = self.core.record_workout(program, program['durations'][0],
+                                         now=datetime(2024, 12, 3, 21, 30, tzinfo=timezone.utc))
+        self.assertEqual(entry['date'], "2024-12-04")
+        counters = self.core.load_progress()['achievement_counters']
+        self.assertEqual(counters, {'early_bird': 1})
+        self.assertEqual(list(self.core.aggregates().program("HIIT Intensif")), [1, 40, 30])
+
+    def test_streaks_backfill(self):
+        """Des séries incohérentes (ancien calcul) sont recalculées depuis l'historique"""
+        entry = {"workout": "HIIT Intensif", "calories": 20, "time": 30}
+        self.write('progress.json', {
+            "history": [dict(entry, date=day) for day in ("2024-12-01", "2024-12-02", "2024-12-04")],
+            "stats": {"total_workouts": 3, "total_calories": 60, "streak": 1,
+                      "best_streak": 0, "last_workout_date": "2024-12-04"},
+            "workout_counts": {"HIIT": 3}
+        })
+        core = FitnessCore(self.data_dir)
+        stats = core.load_progress()['stats']
+        self.assertEqual((stats['streak'], stats['best_streak']), (1, 2))
+        self.assertEqual(core.streak_as_of("2024-12-02"), 2)
+
+        # Une séance à 2 h du matin compte pour la veille avec "day_start_hour": 4
+        core.store.settings['app'] = {"day_start_hour": 4}
+        program = core.programs['HIIT']
+        entry = core.record_workout(program, program['durations'][0], now=datetime(2024, 12, 6, 2))
+        self.assertEqual(entry['date'], "2024-12-05")
+        self.assertEqual(core.load_progress()['stats']['streak'], 2)
+        self.assertEqual(core.streak_as_of("2024-12-05"), 2)
+
+        # Une séance antérieure à la dernière relie les deux séries
+        core.record_workout(program, program['durations'][0], now=datetime(2024, 12, 3, 18))
+        stats = core.load_progress()['stats']
+        self.assertEqual((stats['streak'], stats['best_streak']), (5, 5))
+        self.assertEqual(stats['last_workout_date'], "2024-12-05")
+
+    def test_day_settings_recompute_streaks(self):
+        """Changer le fuseau ou le début de journée recalcule les séries"""
+        from unittest.mock import patch
+        with patch.object(FitnessCore, 'recompute_streaks') as recompute:
+            self.core.update_app_settings({"animation": "atlas"})
+            recompute.assert_not_called()
+            app = self.core.update_app_settings({"timezone": "Europe/Paris", "day_start_hour": "4"})
+            recompute.assert_called_once_with()
+        self.assertEqual(app['day_start_hour'], 4)
+        self.assertEqual(self.core.store.settings['app']['animation'], "atlas")
+
+    def test_no_gui_import(self):
+        """Le moteur s'importe sans customtkinter, PIL ni numpy"""
+        code = (
+            "import sys, fitness_core; "
+            "print(any(m in sys.modules for m in ('customtkinter', 'PIL', 'numpy', 'tkinter')))"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_session_updates_progress(self):
+        """Une séance terminée met à jour statistiques, série et historique"""
+        duration = self.core.programs['HIIT']['durations'][0]
+        session = self.core.start_session('HIIT', duration)
+        self.assertTrue(session.countdown.running)
+
+        self.core.complete_session(session, now=datetime(2024, 12, 3, 18))
+        self.core.complete_session(session, now=datetime(2024, 12, 4, 18))
+
+        progress = self.read('progress.json')
+        self.assertEqual(progress['stats']['total_workouts'], 2)
+        self.assertEqual(progress['stats']['total_calories'], 80)
+        self.assertEqual(progress['stats']['streak'], 2)
+        self.assertEqual(progress['stats']['last_workout_date'], "2024-12-04")
+        self.assertEqual(progress['workout_counts']['HIIT'], 2)
+        self.assertEqual(len(self.core.history), 2)
+
+        summary = self.core.stats_summary(today="2024-12-04")
+        self.assertEqual(summary['favorite_program'], "HIIT Intensif")
+        self.assertEqual(summary['week_calories'], 80)
+
+    def test_sqlite_storage(self):
+        """Avec SQLite, les données JSON sont importées puis mises à jour dans la base"""
+        duration = self.core.programs['HIIT']['durations'][0]
+        self.core.record_workout(self.core.programs['HIIT'], duration, now=datetime(2024, 12, 3, 18))
+
+        core = FitnessCore(self.data_dir, storage='sqlite')
+        try:
+            self.assertEqual(len(core.history), 1)
+            core.record_workout(core.programs['HIIT'], duration, now=datetime(2024, 12, 4, 18))
+            self.assertEqual(core.load_progress()['stats']['streak'], 2)
+            self.assertEqual(len(core.history), 2)
+
+            summary = core.stats_summary(today="2024-12-04")
+            self.assertEqual(summary['total_workouts'], 2)
+            self.assertEqual(summary['week_calories'], 80)
+            self.assertEqual(summary['favorite_program'], "HIIT Intensif")
+            # Séances par programme tenues dans program_totals
+            self.assertEqual(core.aggregates().program("HIIT Intensif")[0], 2)
+        finally:
+            core.close()
+        # Le fichier JSON n'est plus modifié
+        self.assertEqual(self.read('progress.json')['stats']['total_workouts'], 1)
+
+    def test_sqlite_writes_on_worker(self):
+        """Avec un IOWorker, la transaction SQLite se fait hors du thread appelant"""
+        import threading
+        from unittest.mock import patch
+        from io_worker import IOWorker
+        from sqlite_store import ProgressDatabase
+
+        worker = IOWorker()
+        core = FitnessCore(self.data_dir, storage='sqlite', worker=worker)
+        threads = []
+        commit = ProgressDatabase.commit_progress
+
+        def record_thread(database, *args):
+            threads.append(threading.current_thread())
+            commit(database, *args)
+
+        duration = core.programs['HIIT']['durations'][0]
+        try:
+            with patch.object(ProgressDatabase, 'commit_progress', record_thread):
+                core.record_workout(core.programs['HIIT'], duration, now=datetime(2024, 12, 4, 18))
+                # L'en-tête est à jour sans attendre le commit
+                self.assertEqual(core.load_progress()['stats']['total_workouts'], 1)
+                core.wait_for_history()
+            self.assertEqual(len(threads), 1)
+            self.assertIsNot(threads[0], threading.current_thread())
+            self.assertEqual(len(core.history), 1)
+        finally:
+            core.close()
+            worker.close()
+
+        core = FitnessCore(self.data_dir, storage='sqlite')
+        try:
+            self.assertEqual(core.load_progress()['stats']['total_workouts'], 1)
+            self.assertEqual(core.aggregates().day("2024-12-04")[0], 1)
+        finally:
+            core.close()
+
+    def test_profiles(self):
+        """Chaque membre a sa progression ; les programmes sont partagés"""
+        duration = self.core.programs['HIIT']['durations'][0]
+        self.core.record_workout(self.core.programs['HIIT'], duration)
+
+        profile_id = self.core.create_profile("Alice", age=30)
+        self.core.switch_profile(profile_id)
+        self.assertEqual(self.core.user['name'], "Alice")
+        self.assertEqual(self.core.user['age'], 30)
+        self.assertEqual(self.core.load_progress()['stats']['total_workouts'], 0)
+        self.assertIn('HIIT', self.core.programs)
+        self.core.record_workout(self.core.programs['HIIT'], duration)
+        self.assertEqual(len(self.core.history), 1)
+
+        # La sélection est conservée au redémarrage
+        core = FitnessCore(self.data_dir)
+        self.assertEqual(core.profile_id, profile_id)
+        core.switch_profile('default')
+        self.assertEqual(core.user['name'], "TEST")
+        self.assertEqual(core.load_progress()['stats']['total_workouts'], 1)
+
+    def test_programs(self):
+        """Création et suppression de programmes"""
+        program_id = self.core.save_program(None, "Yoga", "Souplesse")
+        self.assertEqual(program_id, "program_2")
+        self.assertEqual(self.read('workout_programs.json')[program_id]['name'], "Yoga")
+
+        self.assertTrue(self.core.delete_program(program_id))
+        self.assertFalse(self.core.delete_program(program_id))
+        self.assertNotIn(program_id, self.read('workout_programs.json'))
+
+    def test_update_user(self):
+        """Les valeurs numériques du profil sont converties en entiers"""
+        self.core.update_user({"name": "BOB", "age": "31"})
+        user = self.read('settings.json')['user']
+        self.assertEqual(user['name'], "BOB")
+        self.assertEqual(user['age'], 31)
+
+
+if __name__ == '__main__':
+    unittest.main()
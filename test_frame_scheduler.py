@@ -0,0 +1,142 @@
+import unittest
+
+from frame_scheduler import FrameScheduler
+from instrumentation import Profiler
+
+
+class FakeWidget:
+    """Remplace window.after avec une horloge simulée"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, delay, callback):
+        self.next_id += 1
+        self.pending[self.next_id] = (self.clock.now + delay / 1000, callback)
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_for(self, seconds):
+        end = self.clock.now + seconds
+        while self.pending:
+            after_id, (due, callback) = min(self.pending.items(), key=lambda item: item[1][0])
+            if due > end:
+                break
+            del self.pending[after_id]
+            self.clock.now = max(self.clock.now, due)
+            callback()
+        self.clock.now = end
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFrameScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.widget = FakeWidget(self.clock)
+        self.scheduler = FrameScheduler(self.widget, fps=20, clock=self.clock)
+        self.calls = []
+
+    def counter(self, name, result=None):
+        def callback():
+            self.calls.append(name)
+            return result
+        return callback
+
+    def test_single_pending_after(self):
+        """Plusieurs callbacks partagent une seule boucle after()"""
+        self.scheduler.register('a', self.counter('a'))
+        self.scheduler.register('b', self.counter('b'), interval_ms=1000)
+        self.assertEqual(len(self.widget.pending), 1)
+        self.widget.run_for(1.0)
+        self.assertEqual(len(self.widget.pending), 1)
+
+    def test_fps_cap_and_interval(self):
+        """Callbacks par image limités à fps, callbacks périodiques à leur intervalle"""
+        self.scheduler.register('frame', self.counter('frame'))
+        self.scheduler.register('second', self.counter('second'), interval_ms=1000)
+        self.widget.run_for(2.01)
+        self.assertLessEqual(self.calls.count('frame'), 41)
+        self.assertGreaterEqual(self.calls.count('frame'), 39)
+        self.assertEqual(self.calls.count('second'), 3)
+
+    def test_deduplicated_registration(self):
+        """Enregistrer deux fois la même clé ne crée pas deux boucles"""
+        self.scheduler.register('circles', self.counter('circles'))
+        self.scheduler.register('circles', self.counter('circles'))
+        self.widget.run_for(1.0)
+        self.assertLessEqual(self.calls.count('circles'), 21)
+
+    def test_reregistration_uses_new_interval(self):
+        """Réenregistrer une clé avec un autre intervalle replanifie la tâche"""
+        self.scheduler.register('timer', self.counter('timer'), interval_ms=1000)
+        self.widget.run_for(0.1)
+        self.scheduler.register('timer', self.counter('timer'), interval_ms=200)
+        self.assertEqual(len(self.widget.pending), 1)
+        self.widget.run_for(0.4)
+        # Appels à 0, 0.2 et 0.4 (et non à 1.0)
+        self.assertEqual(self.calls.count('timer'), 3)
+
+    def test_return_values(self):
+        """False retire le callback, un nombre fixe le prochain délai"""
+        self.scheduler.register('once', self.counter('once', False))
+        self.scheduler.register('custom', self.counter('custom', 300))
+        self.widget.run_for(1.0)
+        self.assertEqual(self.calls.count('once'), 1)
+        self.assertFalse(self.scheduler.is_registered('once'))
+        self.assertEqual(self.calls.count('custom'), 4)
+
+    def test_hidden_view_is_paused(self):
+        """Les callbacks d'une vue masquée ne tournent pas"""
+        self.scheduler.set_active_view('stats')
+        self.scheduler.register('circles', self.counter('circles'), view='workout')
+        self.widget.run_for(1.0)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.widget.pending, {})
+
+        self.scheduler.set_active_view('workout')
+        self.widget.run_for(0.5)
+        self.assertGreater(self.calls.count('circles'), 0)
+
+    def test_minimized_window_pauses_visuals(self):
+        """Une fenêtre réduite suspend les animations, pas les minuteurs"""
+        self.scheduler.register('logo', self.counter('logo'), visual=True)
+        self.scheduler.register('timer', self.counter('timer'), interval_ms=1000)
+        self.scheduler.set_window_visible(False)
+        self.widget.run_for(2.0)
+        self.assertNotIn('logo', self.calls)
+        self.assertEqual(self.calls.count('timer'), 3)
+
+    def test_failing_callback_is_removed(self):
+        """Une exception retire le callback sans arrêter la boucle"""
+        def broken():
+            raise RuntimeError("widget détruit")
+        self.scheduler.register('broken', broken)
+        self.scheduler.register('ok', self.counter('ok'), interval_ms=100)
+        self.widget.run_for(0.5)
+        self.assertFalse(self.scheduler.is_registered('broken'))
+        self.assertGreater(self.calls.count('ok'), 3)
+
+    def test_profiler_records_callbacks(self):
+        """Avec un profiler, chaque callback et chaque image sont chronométrés"""
+        profiler = Profiler(clock=self.clock)
+        self.scheduler.profiler = profiler
+        self.scheduler.register('timer', self.counter('timer'), interval_ms=1000)
+        self.widget.run_for(2.0)
+        names = [event[0] for event in profiler.events('callback')]
+        self.assertEqual(names, ['timer'] * 3)
+        self.assertEqual(len(profiler.events('frame')), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
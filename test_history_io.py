@@ -0,0 +1,126 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import history_io
+from fitness_core import FitnessCore
+
+
+class TestNormalize(unittest.TestCase):
+    def test_durations(self):
+        """Les durées numériques et texte sont unifiées"""
+        old = history_io.normalize({"date": "2024-12-03", "workout": "Cardio Express",
+                                    "duration": 900, "calories": 200})
+        self.assertEqual((old['time'], old['duration']), (900, "15 min"))
+
+        new = history_io.normalize({"date": "2024-12-03", "workout": "HIIT Intensif",
+                                    "duration": "15 sec", "time": "15", "calories": "20"})
+        self.assertEqual((new['time'], new['duration'], new['calories']), (15, "15 sec", 20))
+
+        text = history_io.normalize({"date": "2024-12-03T10:00:00", "workout": "Yoga",
+                                     "duration": "15 min"})
+        self.assertEqual((text['date'], text['time']), ("2024-12-03", 900))
+
+    def test_invalid(self):
+        """Les séances invalides sont écartées et signalées"""
+        errors = []
+        records = [
+            {"date": "03/12/2024", "workout": "HIIT"},
+            {"date": "2024-12-03", "workout": ""},
+            {"date": "2024-12-03", "workout": "HIIT", "calories": "-5"},
+            None,
+            {"date": "2024-12-03", "workout": "HIIT"},
+        ]
+        valid = list(history_io.normalized(records, errors))
+        self.assertEqual(len(valid), 1)
+        self.assertEqual([number for number, _ in errors], [1, 2, 3, 4])
+
+
+class TestImportExport(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.write('settings.json', {"user": {"name": "TEST", "age": 25, "weight": 70, "height": 180}})
+        self.write('workout_programs.json', {})
+        self.write('progress.json', {
+            "history": [{"date": "2024-12-01", "workout": "HIIT Intensif", "duration": 900, "calories": 100}],
+            "stats": {"total_workouts": 1, "total_calories": 100, "streak": 1,
+                      "best_streak": 0, "last_workout_date": "2024-12-01"},
+            "workout_counts": {"HIIT": 1, "Cardio": 0}
+        })
+        self.core = FitnessCore(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def write(self, filename, data):
+        with open(os.path.join(self.data_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def test_import_recomputes_stats(self):
+        """L'import ajoute les séances et recalcule stats et compteurs"""
+        path = os.path.join(self.data_dir, 'import.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("date,workout,duration,calories\n"
+                    "2024-12-02,Cardio Express,15 min,150\n"
+                    "2024-12-03,HIIT Intensif,30 sec,40\n"
+                    "pas une date,HIIT Intensif,30 sec,40\n")
+
+        count, errors = history_io.import_history(self.core, path)
+        self.assertEqual(count, 2)
+        # Numéro de ligne du fichier, en-tête compris
+        self.assertEqual(errors[0][0], 4)
+
+        progress = self.core.load_progress()
+        self.assertEqual(progress['stats']['total_workouts'], 3)
+        self.assertEqual(progress['stats']['total_calories'], 290)
+        self.assertEqual(progress['stats']['streak'], 3)
+        self.assertEqual(progress['stats']['last_workout_date'], "2024-12-03")
+        self.assertEqual(progress['workout_counts'], {"HIIT": 2, "Cardio": 1})
+        self.assertEqual(len(self.core.history), 3)
+        self.assertEqual(self.core.stats_summary("2024-12-03")['week_calories'], 190)
+        # Succès débloqués par l'historique migré, puis par l'import
+        self.assertEqual([(a['id'], a['date']) for a in progress['achievements']],
+                         [('first_workout', "2024-12-01"), ('streak_3', "2024-12-03")])
+
+    def test_round_trip(self):
+        """Un export JSONL réimporté (remplacement) redonne le même historique"""
+        path = os.path.join(self.data_dir, 'export.jsonl')
+        self.assertEqual(history_io.export_history(self.core, path), 1)
+        exported = list(self.core.history)
+
+        count, errors = history_io.import_history(self.core, path, replace=True)
+        self.assertEqual((count, errors), (1, []))
+        self.assertEqual(len(self.core.history), 1)
+        self.assertEqual(list(self.core.history)[0]['time'], 900)
+        self.assertEqual(list(self.core.history)[0]['date'], exported[0]['date'])
+
+    def test_jsonl_line_numbers(self):
+        """Les erreurs JSONL donnent la ligne du fichier, lignes vides comprises"""
+        path = os.path.join(self.data_dir, 'import.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"date": "2024-12-02", "workout": "Yoga"}\n\n{"date": "hier"}\n{pas du json\n')
+        count, errors = history_io.import_history(self.core, path)
+        self.assertEqual(count, 1)
+        self.assertEqual([number for number, _ in errors], [3, 4])
+
+    def test_failed_replace_keeps_history(self):
+        """Un fichier illisible en cours d'import ne vide pas l'historique"""
+        path = os.path.join(self.data_dir, 'import.jsonl')
+        with open(path, 'wb') as f:
+            f.write(b'{"date": "2024-12-02", "workout": "Yoga"}\n\xff\xfe\n')
+        for core in (self.core, FitnessCore(self.data_dir, storage='sqlite')):
+            try:
+                stats = dict(core.load_progress()['stats'])
+                with self.assertRaises(UnicodeDecodeError):
+                    history_io.import_history(core, path, replace=True)
+                self.assertEqual([entry['workout'] for entry in core.history], ["HIIT Intensif"])
+                self.assertEqual(core.load_progress()['stats'], stats)
+            finally:
+                core.close()
+        self.assertEqual(os.listdir(os.path.dirname(self.core.history.directory)).count('history.import'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
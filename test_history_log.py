@@ -0,0 +1,125 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from history_log import HistoryLog, migrate_history
+
+
+def make_entry(i):
+    return {"date": "2024-12-03", "workout": "HIIT Intensif", "calories": i, "time": 15}
+
+
+class TestHistoryLog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.log = HistoryLog(self.directory, segment_size=3, max_segments=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_append_and_iterate(self):
+        """Les séances sont relues dans l'ordre d'ajout"""
+        for i in range(5):
+            self.log.append(make_entry(i))
+        self.assertEqual([e['calories'] for e in self.log], [0, 1, 2, 3, 4])
+        self.assertEqual(len(self.log), 5)
+
+    def test_segments_roll_over(self):
+        """Un nouveau segment est ouvert quand le segment actif est plein"""
+        self.log.extend(make_entry(i) for i in range(7))
+        self.assertEqual(len(self.log.segments()), 3)
+
+    def test_compaction(self):
+        """Les segments fermés sont fusionnés au-delà de max_segments"""
+        self.log.extend(make_entry(i) for i in range(12))
+        self.assertLessEqual(len(self.log.segments()), self.log.max_segments + 1)
+        self.assertEqual([e['calories'] for e in self.log], list(range(12)))
+
+        # Les ajouts continuent après la compaction
+        self.log.append(make_entry(12))
+        self.assertEqual([e['calories'] for e in self.log][-1], 12)
+
+    def test_interrupted_compaction(self):
+        """Un arrêt pendant la compaction ne perd ni ne duplique de séance"""
+        from unittest.mock import patch
+        self.log.extend(make_entry(i) for i in range(7))
+        self.log.max_segments = 1
+
+        # Arrêt après la validation de la fusion, pendant les suppressions
+        with patch('history_log.os.remove', side_effect=OSError("arrêt brutal")):
+            with self.assertRaises(OSError):
+                self.log.compact()
+        log = HistoryLog(self.directory, segment_size=3, max_segments=2)
+        self.assertEqual([e['calories'] for e in log], list(range(7)))
+        self.assertEqual(len(log.segments()), 2)
+        self.assertIsNone(log.compacted_through)
+
+        # Arrêt avant la validation : la fusion est ignorée
+        log.extend(make_entry(i) for i in range(7, 10))
+        with patch.object(HistoryLog, '_save_schema', side_effect=OSError("arrêt brutal")):
+            with self.assertRaises(OSError):
+                log.compact()
+        log = HistoryLog(self.directory, segment_size=3, max_segments=2)
+        self.assertEqual([e['calories'] for e in log], list(range(10)))
+        self.assertFalse(any(name.endswith('.merge') for name in os.listdir(self.directory)))
+
+    def test_schema_migration(self):
+        """Un journal en version 1 (dicts) est converti en lignes compactes"""
+        directory = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(directory, 'segment-000001.jsonl'), 'w', encoding='utf-8') as f:
+                f.write(json.dumps({"date": "2024-12-03", "workout": "Cardio Express",
+                                    "duration": 900, "calories": 200}) + '\n')
+                f.write(json.dumps(make_entry(7)) + '\n')
+
+            log = HistoryLog(directory)
+            self.assertEqual(log.version, 2)
+            with open(log.segments()[0], 'r', encoding='utf-8') as f:
+                self.assertTrue(all(line.startswith('[') for line in f))
+            entries = list(HistoryLog(directory))
+            self.assertEqual([(e['workout'], e['time']) for e in entries],
+                             [("Cardio Express", 900), ("HIIT Intensif", 15)])
+            with open(os.path.join(directory, 'schema.json'), 'r', encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['programs'], ["Cardio Express", "HIIT Intensif"])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_truncated_line_is_skipped(self):
+        """Une ligne tronquée par un arrêt brutal n'empêche pas la lecture"""
+        self.log.append(make_entry(0))
+        with open(self.log.segments()[-1], 'a', encoding='utf-8') as f:
+            f.write('{"date": "2024-12-')
+
+        log = HistoryLog(self.directory, segment_size=3, max_segments=2)
+        log.append(make_entry(1))
+        self.assertEqual([e['calories'] for e in log], [0, 1])
+
+    def test_migrate_history(self):
+        """L'historique de progress.json est déplacé une seule fois"""
+        progress_data = {"stats": {}, "history": [make_entry(0), make_entry(1)]}
+        self.assertTrue(migrate_history(progress_data, self.log))
+        self.assertNotIn('history', progress_data)
+        self.assertEqual(len(self.log), 2)
+
+        # Une seconde migration (en-tête non sauvegardé) ne duplique rien
+        progress_data['history'] = [make_entry(0), make_entry(1)]
+        self.assertTrue(migrate_history(progress_data, self.log))
+        self.assertEqual(len(self.log), 2)
+        self.assertFalse(migrate_history(progress_data, self.log))
+
+    def test_interrupted_migration_is_redone(self):
+        """Une migration arrêtée en cours d'écriture est reprise sans perte"""
+        history = [make_entry(i) for i in range(5)]
+        # Arrêt brutal : une partie des séances écrite, migration non marquée
+        self.log.bulk_extend(history[:2])
+
+        log = HistoryLog(self.directory, segment_size=3, max_segments=2)
+        self.assertTrue(migrate_history({"history": history}, log))
+        self.assertEqual([e['calories'] for e in log], [0, 1, 2, 3, 4])
+        self.assertTrue(HistoryLog(self.directory).legacy_migrated)
+
+
+if __name__ == '__main__':
+    unittest.main()
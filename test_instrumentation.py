@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from instrumentation import Profiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.profiler = Profiler(capacity=4, clock=self.clock)
+
+    def test_ring_buffer(self):
+        """Le tampon garde les derniers événements, dans l'ordre"""
+        for i in range(6):
+            self.profiler.record(f"e{i}", 'callback', i, 0.001)
+        self.assertEqual(len(self.profiler), 4)
+        self.assertEqual([event[0] for event in self.profiler.events()], ['e2', 'e3', 'e4', 'e5'])
+
+    def test_instrument(self):
+        """Les méthodes instrumentées sont chronométrées, même en cas d'erreur"""
+        class Store:
+            def load(store, name):
+                self.clock.now += 0.01
+                return name
+
+            def save(store, name):
+                raise IOError("disque plein")
+
+        store = Store()
+        self.profiler.instrument(store, ('load', 'save'), 'json')
+        self.assertEqual(store.load('progress'), 'progress')
+        with self.assertRaises(IOError):
+            store.save('progress')
+
+        summary = self.profiler.summary()
+        self.assertAlmostEqual(summary['json/load']['mean_ms'], 10.0)
+        self.assertEqual(summary['json/save']['count'], 1)
+
+    def test_frame_stats(self):
+        """Images par seconde et durée des images sur la dernière seconde"""
+        profiler = Profiler(clock=self.clock)
+        for i in range(30):
+            profiler.record('frame', 'frame', i / 30, 0.002 if i else 0.02)
+        self.clock.now = 1.01
+        fps, mean_ms, max_ms = profiler.frame_stats()
+        self.assertEqual(fps, 29)
+        self.assertAlmostEqual(mean_ms, 2.0)
+        self.assertAlmostEqual(max_ms, 2.0)
+
+    def test_chrome_trace(self):
+        """Export au format Chrome trace, temps en microsecondes"""
+        self.profiler.record('logo', 'callback', 0.5, 0.002)
+        path = os.path.join(tempfile.mkdtemp(), 'trace.json')
+        self.profiler.export_chrome_trace(path)
+        with open(path, encoding='utf-8') as f:
+            event = json.load(f)['traceEvents'][0]
+        self.assertEqual(event['ph'], 'X')
+        self.assertEqual(event['name'], 'logo')
+        self.assertAlmostEqual(event['ts'], 500000)
+        self.assertAlmostEqual(event['dur'], 2000)
+
+    def test_from_environment(self):
+        """Le profilage n'est activé que sur demande"""
+        with patch.dict('os.environ', {}, clear=True):
+            self.assertIsNone(Profiler.from_environment())
+        with patch.dict('os.environ', {Profiler.ENV_VAR: 'seance.json'}):
+            self.assertIsInstance(Profiler.from_environment(), Profiler)
+            self.assertEqual(Profiler.trace_path(), 'seance.json')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import threading
+import time
+import unittest
+
+from io_worker import IOWorker
+
+
+class TestIOWorker(unittest.TestCase):
+    def setUp(self):
+        self.pending_calls = 0
+        self.worker = IOWorker(on_pending=self.on_pending)
+
+    def tearDown(self):
+        self.worker.close()
+
+    def on_pending(self):
+        self.pending_calls += 1
+
+    def test_callbacks_on_calling_thread(self):
+        """Les callbacks sont exécutés par poll(), sur le thread de l'interface"""
+        threads = []
+        self.worker.submit('a', lambda: threads.append(threading.current_thread()),
+                           on_done=lambda: threads.append(threading.current_thread()))
+        self.assertEqual(self.pending_calls, 1)
+        self.worker.drain()
+        self.assertIsNot(threads[0], threading.main_thread())
+        self.assertIs(threads[1], threading.main_thread())
+        self.assertIs(self.worker.poll(), False)
+
+    def test_ordered_per_key(self):
+        """Les écritures d'un même fichier restent dans l'ordre"""
+        order = []
+
+        def write(value, delay):
+            time.sleep(delay)
+            order.append(value)
+
+        self.worker.submit('progress.json', write, 1, 0.05)
+        self.worker.submit('progress.json', write, 2, 0.0)
+        self.worker.submit('progress.json', write, 3, 0.0)
+        self.worker.drain()
+        self.assertEqual(order, [1, 2, 3])
+
+    def test_poll_does_not_block(self):
+        """poll() rend la main tout de suite pendant une écriture lente"""
+        release = threading.Event()
+        self.worker.submit('slow', release.wait)
+        start = time.perf_counter()
+        self.assertIsNone(self.worker.poll())
+        self.assertLess(time.perf_counter() - start, 0.05)
+        release.set()
+        self.worker.drain()
+        self.assertFalse(self.worker.is_pending())
+
+    def test_errors(self):
+        """Une écriture en échec appelle on_error sans bloquer la file"""
+        errors = []
+
+        def fail():
+            raise OSError("disque plein")
+
+        self.worker.submit('a', fail, on_error=errors.append)
+        done = []
+        self.worker.submit('a', lambda: None, on_done=lambda: done.append(True))
+        self.worker.drain()
+        self.assertIsInstance(errors[0], OSError)
+        self.assertEqual(done, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
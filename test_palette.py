@@ -0,0 +1,32 @@
+import unittest
+
+from palette import CIRCLE_PALETTE, LOGO_CYCLE, TIMER_PALETTE, HuePalette, hsv_to_hex
+
+
+class TestPalette(unittest.TestCase):
+    def test_hsv_to_hex(self):
+        """Conversion HSV vers hexadécimal"""
+        self.assertEqual(hsv_to_hex(0, 1, 1), '#ff0000')
+        self.assertEqual(hsv_to_hex(120, 1, 1), '#00ff00')
+        self.assertEqual(hsv_to_hex(240, 1, 1), '#0000ff')
+
+    def test_palette_matches_conversion(self):
+        """Chaque entrée de la table correspond au calcul direct"""
+        for hue in range(360):
+            self.assertEqual(CIRCLE_PALETTE[hue], hsv_to_hex(hue, 1, 1))
+            self.assertEqual(TIMER_PALETTE[hue], hsv_to_hex(hue, 0.7, 1))
+
+    def test_palette_wraps(self):
+        """Les indices hors d'un tour reviennent dans la table, sans nouvelle chaîne"""
+        self.assertIs(CIRCLE_PALETTE[725], CIRCLE_PALETTE[5])
+        self.assertEqual(len(HuePalette(steps=36)), 36)
+        self.assertEqual(HuePalette(steps=36)[1], hsv_to_hex(10, 1, 1))
+
+    def test_logo_cycle(self):
+        """Un tour complet du logo par pas de 2°"""
+        self.assertEqual(len(LOGO_CYCLE), 180)
+        self.assertEqual(LOGO_CYCLE[0], '#00dcdc')
+
+
+if __name__ == '__main__':
+    unittest.main()
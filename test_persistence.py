@@ -0,0 +1,131 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from data_store import DataStore
+from io_worker import IOWorker
+from persistence import GroupCommitWriter, atomic_open, atomic_write_json
+
+
+class TestAtomicWrite(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'settings.json')
+        atomic_write_json(self.path, {"user": {"name": "TEST"}})
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read(self):
+        with open(self.path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_write_replaces_file(self):
+        """Le fichier est remplacé par le nouveau contenu"""
+        atomic_write_json(self.path, {"user": {"name": "NOUVEAU"}})
+        self.assertEqual(self.read()['user']['name'], "NOUVEAU")
+        self.assertEqual(os.listdir(self.directory), ['settings.json'])
+
+    def test_failed_write_keeps_old_file(self):
+        """Une erreur pendant l'écriture laisse l'ancien fichier intact"""
+        with self.assertRaises(RuntimeError):
+            with atomic_open(self.path) as f:
+                f.write('{"user": {"na')
+                raise RuntimeError("arrêt brutal")
+        self.assertEqual(self.read()['user']['name'], "TEST")
+        self.assertEqual(os.listdir(self.directory), ['settings.json'])
+
+    def test_permissions_are_kept(self):
+        """Le fichier réécrit garde ses permissions"""
+        os.chmod(self.path, 0o644)
+        atomic_write_json(self.path, {"user": {"name": "NOUVEAU"}})
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+
+    def test_binary_write(self):
+        """mode='wb' écrit des octets tels quels"""
+        path = os.path.join(self.directory, 'image.png')
+        with atomic_open(path, 'wb') as f:
+            f.write(b'\x89PNG\r\n')
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'\x89PNG\r\n')
+
+
+class TestGroupCommitWriter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.scheduled = []
+        self.writer = GroupCommitWriter(
+            delay_ms=200,
+            schedule=lambda delay, callback: self.scheduled.append(callback)
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_writes_are_coalesced(self):
+        """Plusieurs écritures rapprochées donnent un seul commit par fichier"""
+        path = os.path.join(self.directory, 'workout_programs.json')
+        with patch('persistence.atomic_write_json') as mock_write:
+            for i in range(5):
+                self.writer.write(path, {"count": i})
+            self.assertEqual(len(self.scheduled), 1)
+            self.assertTrue(self.writer.is_pending(path))
+            mock_write.assert_not_called()
+
+            self.scheduled.pop()()
+            mock_write.assert_called_once_with(path, {"count": 4})
+        self.assertFalse(self.writer.is_pending(path))
+
+    def test_failed_write_is_retried(self):
+        """Une écriture qui échoue est signalée et retentée au commit suivant"""
+        path = os.path.join(self.directory, 'progress.json')
+        errors = []
+        committed = []
+        self.writer.on_error = lambda failed_path, error: errors.append(failed_path)
+        with patch('persistence.atomic_write_json', side_effect=OSError("disque plein")):
+            self.writer.write(path, {"count": 1}, on_commit=lambda: committed.append(True))
+            self.scheduled.pop()()
+        self.assertEqual((errors, committed), ([path], []))
+        self.assertTrue(self.writer.is_pending(path))
+
+        self.writer.flush()
+        self.assertEqual(committed, [True])
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {"count": 1})
+
+    def test_store_serves_pending_data(self):
+        """Le DataStore sert les données en attente sans relire le disque"""
+        atomic_write_json(os.path.join(self.directory, 'settings.json'), {"user": {"name": "TEST"}})
+        store = DataStore(self.directory, writer=self.writer)
+        settings = store.settings
+        settings['user']['name'] = "NOUVEAU"
+        store.save('settings', settings)
+
+        self.assertEqual(store.user['name'], "NOUVEAU")
+        self.writer.flush()
+        with patch('builtins.open', side_effect=open) as mock_open:
+            self.assertEqual(store.user['name'], "NOUVEAU")
+            mock_open.assert_not_called()
+
+    def test_worker_writes_snapshot(self):
+        """Avec un worker, l'écriture porte sur l'état au moment du commit"""
+        worker = IOWorker()
+        writer = GroupCommitWriter(delay_ms=200, schedule=None, worker=worker)
+        path = os.path.join(self.directory, 'progress.json')
+        data = {"count": 1}
+        committed = []
+        writer.write(path, data, on_commit=lambda: committed.append(True))
+        # Modification après le commit : pas visible dans le fichier écrit
+        data['count'] = 2
+        worker.close()
+
+        self.assertEqual(committed, [True])
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {"count": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from profiles import ProfileIndex
+
+
+class TestProfileIndex(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.data_dir, 'settings.json'), 'w', encoding='utf-8') as f:
+            json.dump({"user": {"name": "SAMI"}}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_default_profile(self):
+        """Sans profiles.json, le profil d'origine utilise data/"""
+        index = ProfileIndex(self.data_dir)
+        self.assertEqual(index.active, ProfileIndex.DEFAULT)
+        self.assertEqual(index.names(), [(ProfileIndex.DEFAULT, "SAMI")])
+        self.assertEqual(index.directory(ProfileIndex.DEFAULT), os.path.normpath(self.data_dir))
+        self.assertFalse(os.path.exists(index.path))
+
+    def test_create_and_select(self):
+        """Un nouveau profil a son propre répertoire ; la sélection est conservée"""
+        index = ProfileIndex(self.data_dir)
+        profile_id = index.create("Alice", {"user": {"name": "Alice"}}, workout_counts=["HIIT"])
+        directory = index.directory(profile_id)
+        self.assertTrue(directory.startswith(os.path.join(self.data_dir, 'profiles')))
+        with open(os.path.join(directory, 'progress.json'), encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['workout_counts'], {"HIIT": 0})
+
+        index.select(profile_id)
+        with self.assertRaises(KeyError):
+            index.select("inconnu")
+
+        reloaded = ProfileIndex(self.data_dir)
+        self.assertEqual(reloaded.active, profile_id)
+        self.assertEqual(len(reloaded), 2)
+        self.assertNotEqual(reloaded.create("Bob", {"user": {"name": "Bob"}}), profile_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import tracemalloc
+import unittest
+
+from records import HistoryRecord, ProgramTable, duration_label
+
+
+class TestRecords(unittest.TestCase):
+    def test_program_table(self):
+        """Chaque nom de programme reçoit un id stable"""
+        programs = ProgramTable()
+        self.assertEqual(programs.intern("HIIT Intensif"), 0)
+        self.assertEqual(programs.intern("Cardio Express"), 1)
+        self.assertEqual(programs.intern("HIIT Intensif"), 0)
+        self.assertEqual(programs.name(1), "Cardio Express")
+        self.assertTrue(programs.changed)
+
+    def test_schema_normalization(self):
+        """Les anciennes durées (secondes dans 'duration') sont unifiées"""
+        programs = ProgramTable()
+        old = HistoryRecord.from_entry({"date": "2024-12-03", "workout": "Cardio Express",
+                                        "duration": 900, "calories": 200}, programs)
+        new = HistoryRecord.from_entry({"date": "2024-12-03", "workout": "HIIT Intensif",
+                                        "duration": "60 sec", "time": 60, "calories": 20,
+                                        "exercises_completed": 3, "completed": True}, programs)
+        self.assertEqual(old.seconds, 900)
+        self.assertEqual(old.to_entry(programs)['duration'], "15 min")
+        self.assertEqual(new.to_entry(programs), {
+            "date": "2024-12-03", "workout": "HIIT Intensif", "duration": "60 sec",
+            "completed": True, "calories": 20, "time": 60, "exercises_completed": 3
+        })
+        self.assertEqual(HistoryRecord.from_row(new.to_row()), new)
+        self.assertEqual(duration_label(30), "30 sec")
+
+    def test_memory(self):
+        """Un HistoryRecord occupe une fraction de la mémoire d'un dict"""
+        def allocated(build):
+            tracemalloc.start()
+            try:
+                items = build()
+                return tracemalloc.get_traced_memory()[0], items
+            finally:
+                tracemalloc.stop()
+
+        rows = [[739223 + i // 3, i % 5, 900 + i, 100 + i, 3, 1] for i in range(2000)]
+        programs = ProgramTable(f"Programme {i}" for i in range(5))
+        dicts_size, _ = allocated(lambda: [HistoryRecord.from_row(r).to_entry(programs) for r in rows])
+        records_size, _ = allocated(lambda: [HistoryRecord.from_row(r) for r in rows])
+        self.assertLess(records_size * 2, dicts_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
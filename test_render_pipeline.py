@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import Mock
+
+from render_pipeline import HIGH, LOW, MEDIUM, CanvasBatch, QualityGovernor, RenderPipeline
+
+
+class TestCanvasBatch(unittest.TestCase):
+    def test_redundant_changes_are_skipped(self):
+        """Seuls les changements visibles sont envoyés au canvas"""
+        canvas = Mock()
+        batch = CanvasBatch(canvas)
+        batch.coords(1, 10.2, 20.4, 30.0, 40.0)
+        batch.itemconfig(1, outline="#ff0000")
+        batch.itemconfig(1, dashoffset=3)
+        batch.flush()
+        canvas.coords.assert_called_once_with(1, 10, 20, 30, 40)
+        # Les options d'une même image partent en un seul appel
+        canvas.itemconfig.assert_called_once_with(1, outline="#ff0000", dashoffset=3)
+
+        canvas.reset_mock()
+        batch.coords(1, 10.4, 19.6, 30.0, 40.0)
+        batch.itemconfig(1, outline="#ff0000", dashoffset=4)
+        batch.flush()
+        canvas.coords.assert_not_called()
+        canvas.itemconfig.assert_called_once_with(1, dashoffset=4)
+        self.assertEqual((batch.calls, batch.skipped), (3, 1))
+
+
+class TestQualityGovernor(unittest.TestCase):
+    def test_degrades_and_recovers(self):
+        """La qualité baisse au-delà du budget et remonte ensuite"""
+        governor = QualityGovernor(budget_ms=8, smoothing=1.0, degrade_after=2, upgrade_after=3)
+        for _ in range(2):
+            governor.record(0.020)
+        self.assertEqual(governor.level, MEDIUM)
+        for _ in range(2):
+            governor.record(0.020)
+        self.assertEqual(governor.level, LOW)
+        governor.record(0.020)
+        self.assertEqual(governor.level, LOW)
+
+        # Entre les deux seuils : pas de changement
+        for _ in range(10):
+            governor.record(0.006)
+        self.assertEqual(governor.level, LOW)
+        for _ in range(3):
+            governor.record(0.001)
+        self.assertEqual(governor.level, MEDIUM)
+
+
+class TestRenderPipeline(unittest.TestCase):
+    def test_frame(self):
+        """end() applique l'image et donne la cadence de la qualité courante"""
+        now = [0.0]
+        pipeline = RenderPipeline(Mock(), QualityGovernor(smoothing=1.0, degrade_after=1),
+                                  clock=lambda: now[0])
+        label = Mock()
+        pipeline.begin()
+        pipeline.configure(label, text_color="#00ff00")
+        pipeline.configure(label, text_color="#00ff00")
+        self.assertIsNone(pipeline.end())
+        label.configure.assert_called_once_with(text_color="#00ff00")
+        self.assertEqual(pipeline.level, HIGH)
+
+        pipeline.begin()
+        now[0] = 0.05
+        self.assertEqual(pipeline.end(), RenderPipeline.FRAME_MS[MEDIUM])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from sprite_atlas import CYCLE, SpriteAtlas, circle_bbox
+
+
+class TestSpriteAtlas(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_geometry_is_periodic(self):
+        """Les cercles reviennent à leur position après un cycle"""
+        self.assertEqual(circle_bbox(0, 0), (60.0, 50.0, 260.0, 250.0))
+        for i in range(3):
+            for a, b in zip(circle_bbox(1.3, i), circle_bbox(1.3 + CYCLE, i)):
+                self.assertAlmostEqual(a, b)
+
+    def test_index_at(self):
+        atlas = SpriteAtlas(size=40, fps=4)
+        self.assertEqual(atlas.frame_count, 25)
+        self.assertEqual(atlas.index_at(0), 0)
+        self.assertEqual(atlas.index_at(CYCLE / 2), 12)
+        self.assertEqual(atlas.index_at(CYCLE + 0.01), 0)
+
+    def test_build_and_cache(self):
+        """La planche est dessinée une fois puis relue depuis le cache"""
+        atlas = SpriteAtlas(size=40, fps=4, background='#2d2d2d', cache_dir=self.cache_dir)
+        self.assertFalse(atlas.ready)
+        atlas.build()
+        self.assertTrue(atlas.ready)
+        self.assertEqual(atlas.sheet.size, (5 * 40, 5 * 40))
+        self.assertTrue(os.path.exists(atlas.cache_path()))
+
+        cached = SpriteAtlas(size=40, fps=4, background='#2d2d2d', cache_dir=self.cache_dir)
+        cached.render_sheet = None  # ne doit pas être appelé
+        cached.build()
+        self.assertEqual(list(cached.sheet.getdata()), list(atlas.sheet.getdata()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks import make_history, make_programs
+from sqlite_store import ProgressDatabase, month_bounds, week_bounds
+from stats_aggregates import StatsAggregates
+
+
+class TestProgressDatabase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.database = ProgressDatabase(os.path.join(self.directory, 'progress.db'))
+        self.history = make_history(2000, make_programs(5))
+        self.progress = {
+            'stats': {'total_workouts': 2000, 'streak': 3, 'last_workout_date': self.history[-1]['date']},
+            'workout_counts': {'HIIT': 400, 'Cardio': 400},
+            'achievements': ['first'],
+        }
+
+    def tearDown(self):
+        self.database.close()
+        shutil.rmtree(self.directory)
+
+    def test_bounds(self):
+        self.assertEqual(week_bounds("2024-12-04"), ("2024-12-02", "2024-12-09"))
+        self.assertEqual(month_bounds("2024-12-04"), ("2024-12-01", "2025-01-01"))
+        self.assertEqual(month_bounds("2024-02-29"), ("2024-02-01", "2024-03-01"))
+
+    def test_import(self):
+        """L'import conserve l'historique, les stats et les compteurs"""
+        self.assertFalse(self.database.imported)
+        self.database.import_json(self.progress, self.history)
+        self.assertTrue(self.database.imported)
+        self.assertEqual(len(self.database), 2000)
+        self.assertEqual(list(self.database), self.history)
+        self.assertEqual(self.database.load_progress(), self.progress)
+
+    def test_queries_match_aggregates(self):
+        """Les requêtes indexées donnent les mêmes résultats que les compteurs JSON"""
+        self.database.import_json(self.progress, self.history)
+        aggregates = StatsAggregates.rebuild(self.history)
+        # Jours et semaines : fenêtre glissante des compteurs JSON
+        for day in (self.history[-100]['date'], self.history[-1]['date'], "2031-01-01"):
+            self.assertEqual(list(self.database.day(day)), list(aggregates.day(day)))
+            self.assertEqual(list(self.database.week(day)), list(aggregates.week(day)))
+        for day in ("2020-01-01", self.history[700]['date'], self.history[-1]['date'], "2031-01-01"):
+            self.assertEqual(list(self.database.month(day)), list(aggregates.month(day)))
+        name = self.history[0]['workout']
+        self.assertEqual(list(self.database.program(name)), list(aggregates.program(name)))
+        self.assertEqual(self.database.favorite_program(), aggregates.favorite_program())
+        self.assertAlmostEqual(self.database.average_duration(), aggregates.average_duration())
+
+    def test_summaries(self):
+        """Percentiles et moyenne glissante lus dans les tables de synthèse,
+        reconstruites pour une base qui ne les a pas encore"""
+        from analytics import HistoryColumns
+        self.database.import_json(self.progress, self.history)
+        columns = HistoryColumns.from_entries(self.history)
+        day = self.history[-1]['date']
+        self.assertEqual(self.database.duration_percentiles((10, 50, 90)),
+                         columns.duration_percentiles((10, 50, 90)))
+        self.assertAlmostEqual(self.database.average_calories(day),
+                               columns.moving_average(day, day, window=7)[-1])
+
+        with self.database.connection:
+            self.database.connection.execute("DELETE FROM program_totals")
+            self.database.connection.execute("PRAGMA user_version = 0")
+        self.database.close()
+        self.database = ProgressDatabase(os.path.join(self.directory, 'progress.db'))
+        aggregates = StatsAggregates.rebuild(self.history)
+        self.assertEqual(self.database.totals, aggregates.totals)
+        self.assertEqual(self.database.favorite_program(), aggregates.favorite_program())
+
+    def test_save_progress(self):
+        """La séance et l'en-tête sont enregistrés ensemble et relus"""
+        self.database.import_json(self.progress, [])
+        progress = self.database.load_progress()
+        progress['stats']['total_workouts'] += 1
+        progress['workout_counts']['HIIT'] += 1
+        self.database.save_progress(progress, self.history[0])
+        self.database.close()
+
+        self.database = ProgressDatabase(os.path.join(self.directory, 'progress.db'))
+        reloaded = self.database.load_progress()
+        self.assertEqual(reloaded['stats']['total_workouts'], 2001)
+        self.assertEqual(reloaded['workout_counts']['HIIT'], 401)
+        self.assertEqual(list(self.database), [self.history[0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import patch
+
+from startup_timer import StartupTimer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStartupTimer(unittest.TestCase):
+    def test_steps(self):
+        """Chaque étape mesure le temps écoulé depuis la précédente"""
+        clock = FakeClock()
+        timer = StartupTimer(clock=clock)
+        clock.now += 0.25
+        timer.mark("données")
+        clock.now += 0.05
+        timer.mark("interface")
+
+        names = [name for name, _, _ in timer.steps]
+        self.assertEqual(names, ["données", "interface"])
+        self.assertAlmostEqual(timer.steps[1][1], 0.05)
+        self.assertAlmostEqual(timer.steps[1][2], 0.30)
+        self.assertAlmostEqual(timer.total(), 0.30)
+        self.assertIn("interface", timer.report())
+
+    def test_report_only_when_requested(self):
+        """Le rapport n'est affiché que si la variable d'environnement est définie"""
+        timer = StartupTimer()
+        timer.mark("interface")
+        with patch.dict('os.environ', {}, clear=True), patch('builtins.print') as mock_print:
+            timer.print_report()
+            mock_print.assert_not_called()
+        with patch.dict('os.environ', {StartupTimer.ENV_VAR: '1'}), patch('builtins.print') as mock_print:
+            timer.print_report()
+            mock_print.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+from stats_aggregates import StatsAggregates, entry_seconds, parse_duration
+
+
+HISTORY = [
+    {"date": "2024-12-02", "workout": "Cardio Express", "calories": 200, "duration": 900},
+    {"date": "2024-12-03", "workout": "HIIT Intensif", "calories": 200,
+     "duration": "15 min", "time": 900},
+    {"date": "2024-12-03", "workout": "HIIT Intensif", "calories": 20,
+     "duration": "15 sec", "time": 15},
+    {"date": "2024-12-09", "workout": "HIIT Intensif", "calories": 40,
+     "duration": "30 sec", "time": 30},
+]
+
+
+class TestDurations(unittest.TestCase):
+    def test_parse_duration(self):
+        """Les durées numériques et texte sont converties en secondes"""
+        self.assertEqual(parse_duration(900), 900)
+        self.assertEqual(parse_duration("15 min"), 900)
+        self.assertEqual(parse_duration("15 sec"), 15)
+        self.assertEqual(parse_duration("1 h"), 3600)
+        self.assertEqual(parse_duration(None), 0)
+
+    def test_entry_seconds(self):
+        """'time' est prioritaire sur le libellé 'duration'"""
+        self.assertEqual(entry_seconds(HISTORY[0]), 900)
+        self.assertEqual(entry_seconds(HISTORY[2]), 15)
+
+
+class TestStatsAggregates(unittest.TestCase):
+    def setUp(self):
+        self.aggregates = StatsAggregates.rebuild(HISTORY)
+
+    def test_periods(self):
+        """Compteurs par jour, semaine ISO et mois"""
+        self.assertEqual(self.aggregates.day("2024-12-03"), [2, 220, 915])
+        # Le 2 et le 3 décembre 2024 sont dans la même semaine ISO, pas le 9
+        self.assertEqual(self.aggregates.week("2024-12-04")[1], 420)
+        self.assertEqual(self.aggregates.week("2024-12-09")[1], 40)
+        self.assertEqual(self.aggregates.month("2024-12-31")[0], 4)
+        self.assertEqual(self.aggregates.day("2025-01-01"), (0, 0, 0))
+
+    def test_programs_and_totals(self):
+        """Compteurs par programme, moyenne et favori"""
+        self.assertEqual(self.aggregates.program("HIIT Intensif")[0], 3)
+        self.assertEqual(self.aggregates.totals, [4, 460, 1845])
+        self.assertAlmostEqual(self.aggregates.average_duration(), 1845 / 4)
+        self.assertEqual(self.aggregates.favorite_program(), "HIIT Intensif")
+
+    def test_percentiles_and_average(self):
+        """Percentiles de l'histogramme des durées et moyenne sur 7 jours"""
+        import numpy as np
+        seconds = [entry_seconds(entry) for entry in HISTORY]
+        self.assertEqual(self.aggregates.duration_percentiles((10, 50, 90)),
+                         np.percentile(seconds, (10, 50, 90)).tolist())
+        self.assertEqual(self.aggregates.average_calories("2024-12-04"), 420 / 7)
+
+    def test_incremental_matches_rebuild(self):
+        """Ajouter les séances une à une donne le même résultat qu'une reconstruction"""
+        data = {}
+        aggregates = StatsAggregates(data)
+        for entry in HISTORY:
+            aggregates.add(entry)
+        self.assertEqual(data, self.aggregates.data)
+
+    def test_rolling_window(self):
+        """Les jours et semaines anciens sont retirés, pas les mois ni les totaux"""
+        aggregates = StatsAggregates.rebuild(HISTORY)
+        aggregates.add({"date": "2026-06-01", "workout": "HIIT Intensif", "calories": 10, "time": 15})
+        self.assertEqual(list(aggregates.data['daily']), ["2026-06-01"])
+        self.assertEqual(list(aggregates.data['weekly']), ["2026-W23"])
+        self.assertEqual(aggregates.day("2024-12-03"), (0, 0, 0))
+        self.assertEqual(aggregates.month("2024-12-03")[0], 4)
+        self.assertEqual(aggregates.totals[0], 5)
+
+        # Une séance ancienne (import) ne revient pas dans la fenêtre
+        aggregates.add(HISTORY[0])
+        self.assertEqual(list(aggregates.data['daily']), ["2026-06-01"])
+        self.assertEqual(aggregates.totals[0], 6)
+
+    def test_rebuild_in_place(self):
+        """La reconstruction remplace le contenu du dict fourni"""
+        data = {'daily': {'2000-01-01': [1, 1, 1]}}
+        StatsAggregates.rebuild(HISTORY[:1], data)
+        self.assertNotIn('2000-01-01', data['daily'])
+        self.assertEqual(data['totals'], [1, 200, 900])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from datetime import date, datetime, timezone
+
+from streaks import StreakIndex, activity_day, current_streak, load_timezone, update_streak
+
+
+class TestActivityDay(unittest.TestCase):
+    def test_day_start_hour(self):
+        """Avec une journée commençant à 4 h, une séance à 1 h compte pour la veille"""
+        self.assertEqual(activity_day(datetime(2024, 12, 4, 1), day_start_hour=4), date(2024, 12, 3))
+        self.assertEqual(activity_day(datetime(2024, 12, 4, 5), day_start_hour=4), date(2024, 12, 4))
+
+    def test_timezone(self):
+        """Le jour d'activité est celui du fuseau choisi"""
+        paris = load_timezone("Europe/Paris")
+        moment = datetime(2024, 12, 3, 23, 30, tzinfo=timezone.utc)
+        self.assertEqual(activity_day(moment, paris), date(2024, 12, 4))
+        self.assertEqual(activity_day(moment, paris, day_start_hour=4), date(2024, 12, 3))
+        self.assertIsNone(load_timezone("Pas/Un_Fuseau"))
+
+
+class TestStreakIndex(unittest.TestCase):
+    def setUp(self):
+        # Séries : 1-3 décembre, 5 décembre, 7-10 décembre (dans le désordre)
+        days = ["2024-12-08", "2024-12-01", "2024-12-02", "2024-12-03", "2024-12-03",
+                "2024-12-05", "2024-12-07", "2024-12-09", "2024-12-10"]
+        self.index = StreakIndex.from_days(days)
+
+    def test_runs(self):
+        self.assertEqual(len(self.index.runs), 3)
+        self.assertEqual(self.index.best, 4)
+        self.assertEqual(self.index.last_streak, 4)
+        self.assertEqual(self.index.last_day, date(2024, 12, 10))
+
+    def test_as_of(self):
+        """Série au jour X, sans relire les jours"""
+        self.assertEqual(self.index.as_of("2024-11-30"), 0)
+        self.assertEqual(self.index.as_of("2024-12-02"), 2)
+        # Pas encore de séance le 4 : la série de la veille tient encore
+        self.assertEqual(self.index.as_of("2024-12-04"), 3)
+        self.assertEqual(self.index.as_of(date(2024, 12, 8)), 2)
+        self.assertEqual(self.index.as_of("2024-12-12"), 0)
+
+    def test_add(self):
+        self.index.add(date(2024, 12, 11))
+        self.assertEqual((self.index.last_streak, self.index.best), (5, 5))
+        # Jours anciens : les séries voisines sont fusionnées
+        self.index.add(date(2024, 12, 4))
+        self.assertEqual(self.index.as_of("2024-12-05"), 5)
+        self.index.add(date(2024, 12, 6))
+        self.assertEqual(self.index.best, 11)
+        self.assertEqual(self.index.as_of("2024-12-06"), 6)
+
+        stats = {}
+        self.index.apply(stats)
+        self.assertEqual(stats, {"streak": 11, "best_streak": 11, "last_workout_date": "2024-12-11"})
+
+
+class TestUpdateStreak(unittest.TestCase):
+    def test_best_streak_after_reset(self):
+        """La meilleure série est mise à jour même quand la série repart à 1"""
+        stats = {"streak": 0, "best_streak": 0, "last_workout_date": None}
+        update_streak(stats, date(2024, 12, 3))
+        self.assertEqual((stats['streak'], stats['best_streak']), (1, 1))
+        update_streak(stats, date(2024, 12, 3))
+        update_streak(stats, date(2024, 12, 4))
+        self.assertEqual((stats['streak'], stats['best_streak']), (2, 2))
+        update_streak(stats, date(2024, 12, 8))
+        self.assertEqual((stats['streak'], stats['best_streak']), (1, 2))
+
+        self.assertEqual(current_streak(stats, "2024-12-09"), 1)
+        self.assertEqual(current_streak(stats, "2024-12-10"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from timeline import REST, WORK, Timeline
+
+EXERCISES = [
+    {"name": "Burpees", "duration": 30, "rest": 15, "sets": 2},
+    {"name": "Pompes", "duration": 20, "rest": 10, "sets": 1},
+]
+
+
+class TestTimeline(unittest.TestCase):
+    def test_compile(self):
+        """Séries d'effort et repos, sans repos final"""
+        timeline = Timeline.compile(EXERCISES)
+        self.assertEqual([s.kind for s in timeline.segments], [WORK, REST, WORK, REST, WORK])
+        self.assertEqual([(s.start, s.end) for s in timeline.segments],
+                         [(0, 30), (30, 45), (45, 75), (75, 90), (90, 110)])
+        self.assertEqual(timeline.segments[2].label, "Burpees — série 2")
+        self.assertEqual(timeline.segments[3].label, "Repos")
+
+    def test_scaled_to_duration(self):
+        """Le déroulé dure exactement la durée choisie"""
+        timeline = Timeline.compile(EXERCISES, total=55)
+        self.assertEqual(timeline.duration, 55)
+        self.assertAlmostEqual(timeline.segments[0].end, 15)
+
+    def test_cursor(self):
+        """Le curseur suit le temps, en avant comme en arrière"""
+        timeline = Timeline.compile(EXERCISES)
+        self.assertEqual(timeline.at(0).set_number, 1)
+        self.assertEqual(timeline.at(50).set_number, 2)
+        self.assertEqual(timeline.at(80).kind, REST)
+        self.assertEqual(timeline.at(200).name, "Pompes")
+        self.assertEqual(timeline.at(10).start, 0)
+
+    def test_exercises_completed(self):
+        """Un exercice compte quand sa dernière série est terminée"""
+        timeline = Timeline.compile(EXERCISES)
+        self.assertEqual(timeline.exercises_completed(40), 0)
+        self.assertEqual(timeline.exercises_completed(75), 1)
+        self.assertEqual(timeline.exercises_completed(100), 1)
+        self.assertEqual(timeline.exercises_completed(110), 2)
+
+    def test_incomplete_exercises(self):
+        """Les exercices sans durée ni séries ont des valeurs par défaut"""
+        timeline = Timeline.compile([{"name": "Burpees"}, {"name": "Squats"}], total=30)
+        self.assertEqual(len(timeline), 2)
+        self.assertEqual(timeline.exercises_completed(30), 2)
+        self.assertIsNone(Timeline.compile([]).at(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+
+from virtual_list import VirtualList, visible_range
+
+
+class FakeCanvas:
+    """Canvas minimal : position de défilement et fenêtres des lignes"""
+
+    def __init__(self, height):
+        self.top = 0
+        self.height = height
+        self.windows = {}
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def winfo_height(self):
+        return self.height
+
+    def create_window(self, x, y, window=None, **options):
+        window_id = len(self.windows) + 1
+        self.windows[window_id] = {'widget': window, 'y': y, 'state': 'normal'}
+        return window_id
+
+    def coords(self, window_id, x, y):
+        self.windows[window_id]['y'] = y
+
+    def itemconfigure(self, window_id, **options):
+        self.windows[window_id].update(options)
+
+
+class FakeRoot:
+    def __init__(self):
+        self.bound = []
+
+    def bind_all(self, sequence, func, add=None):
+        self.bound.append(sequence)
+
+
+def fake_list(count, height=600, row_height=100):
+    """VirtualList sans Tk : seule la logique d'affichage des lignes sert"""
+    vlist = VirtualList.__new__(VirtualList)
+    vlist.canvas = FakeCanvas(height)
+    vlist.row_height = row_height
+    vlist.overscan = 2
+    vlist.count = count
+    vlist._rows = {}
+    vlist._free = []
+    vlist._width = 1
+    vlist.created = []
+    vlist.bound = {}
+
+    def create_row(parent):
+        vlist.created.append(object())
+        return vlist.created[-1]
+
+    def bind_row(widget, index):
+        vlist.bound[index] = widget
+
+    vlist.create_row = create_row
+    vlist.bind_row = bind_row
+    return vlist
+
+
+class TestVisibleRange(unittest.TestCase):
+    def test_top_of_list(self):
+        """En haut de la liste, seules les premières lignes sont créées"""
+        self.assertEqual(visible_range(0, 600, 100, 10000, overscan=2), (0, 9))
+
+    def test_scrolled(self):
+        """Les lignes créées suivent la position de défilement"""
+        self.assertEqual(visible_range(5000, 600, 100, 10000, overscan=2), (48, 59))
+        # Une ligne partiellement visible est incluse
+        self.assertEqual(visible_range(5050, 600, 100, 10000, overscan=0), (50, 57))
+
+    def test_bounded_by_count(self):
+        """Le nombre de lignes ne dépasse jamais la taille de la liste"""
+        self.assertEqual(visible_range(0, 600, 100, 3), (0, 3))
+        self.assertEqual(visible_range(9900, 600, 100, 100), (97, 100))
+
+    def test_independent_of_count(self):
+        """Le coût dépend de la hauteur de la fenêtre, pas du nombre de programmes"""
+        first, last = visible_range(0, 600, 130, 1000000)
+        self.assertLess(last - first, 12)
+
+    def test_empty(self):
+        self.assertEqual(visible_range(0, 600, 100, 0), (0, 0))
+        self.assertEqual(visible_range(0, 600, 0, 10), (0, 0))
+
+
+
+class TestRowRecycling(unittest.TestCase):
+    def test_rows_are_recycled(self):
+        """En défilant, les lignes sorties de l'écran sont réutilisées"""
+        vlist = fake_list(10000)
+        vlist._update()
+        self.assertEqual(sorted(vlist._rows), list(range(9)))
+        created = vlist.row_widget_count()
+
+        for top in range(0, 500001, 250):
+            vlist.canvas.top = top
+            vlist._update()
+        self.assertEqual(vlist.row_widget_count(), created + 2)
+        self.assertEqual(sorted(vlist._rows), list(range(4998, 5009)))
+        # Chaque ligne affichée est placée à sa position et reliée à sa donnée
+        for index, (widget, window_id) in vlist._rows.items():
+            self.assertEqual(vlist.canvas.windows[window_id]['y'], index * 100)
+            self.assertIs(vlist.bound[index], widget)
+        for widget, window_id in vlist._free:
+            self.assertEqual(vlist.canvas.windows[window_id]['state'], 'hidden')
+
+    def test_wheel_bound_once_per_root(self):
+        """La molette est liée une fois par racine Tk, y compris une racine recréée"""
+        first, second = FakeRoot(), FakeRoot()
+        for root in (first, first, second):
+            vlist = fake_list(10)
+            vlist._root = lambda root=root: root
+            vlist._bind_wheel()
+        self.assertEqual(len(first.bound), 3)
+        self.assertEqual(len(second.bound), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
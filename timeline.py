@@ -0,0 +1,108 @@
+from typing import NamedTuple
+
+WORK = 'work'
+REST = 'rest'
+
+# Valeurs par défaut d'un exercice incomplet dans workout_programs.json
+DEFAULT_EXERCISE = {"duration": 30, "rest": 0, "sets": 1}
+
+
+class Segment(NamedTuple):
+    """Intervalle de la séance : [start, end) en secondes depuis le départ"""
+    start: float
+    end: float
+    kind: str
+    exercise: int
+    set_number: int
+    name: str
+
+    @property
+    def label(self):
+        if self.kind == REST:
+            return "Repos"
+        return f"{self.name} — série {self.set_number}"
+
+
+class Timeline:
+    """Déroulé d'une séance : séries d'effort et de repos, calculé une fois.
+
+    compile() transforme les exercices d'un programme (durée, repos,
+    séries) en segments consécutifs, mis à l'échelle de la durée choisie.
+    Le curseur avance avec le temps écoulé : chaque appel à at() ne
+    parcourt que les segments franchis depuis l'appel précédent (O(1) par
+    tick). Le nombre d'exercices terminés à la fin de chaque segment est
+    précalculé.
+    """
+
+    def __init__(self, segments, exercise_count):
+        self.segments = segments
+        self.exercise_count = exercise_count
+        self.duration = segments[-1].end if segments else 0.0
+        self._cursor = 0
+        # Dernière série d'effort de chaque exercice
+        last_sets = {segment.exercise: i for i, segment in enumerate(segments) if segment.kind == WORK}
+        last_sets = set(last_sets.values())
+        # Exercices terminés quand le segment i est terminé
+        self._done = []
+        done = 0
+        for i in range(len(segments)):
+            if i in last_sets:
+                done += 1
+            self._done.append(done)
+
+    @classmethod
+    def compile(cls, exercises, total=None):
+        """Segments des exercices, mis à l'échelle pour durer total secondes"""
+        plan = []
+        for index, exercise in enumerate(exercises):
+            exercise = {**DEFAULT_EXERCISE, **exercise}
+            for set_number in range(1, max(1, int(exercise['sets'])) + 1):
+                plan.append((max(0, exercise['duration']), WORK, index, set_number, exercise.get('name', '')))
+                plan.append((max(0, exercise['rest']), REST, index, set_number, exercise.get('name', '')))
+        # Pas de repos après la dernière série ; les segments vides sont retirés
+        if plan and plan[-1][1] == REST:
+            plan.pop()
+        plan = [step for step in plan if step[0] > 0]
+
+        natural = sum(step[0] for step in plan)
+        scale = total / natural if total and natural else 1.0
+        segments = []
+        start = 0.0
+        for length, kind, index, set_number, name in plan:
+            end = start + length * scale
+            segments.append(Segment(start, end, kind, index, set_number, name))
+            start = end
+        if segments and total:
+            # Fin exacte malgré les arrondis de la mise à l'échelle
+            segments[-1] = segments[-1]._replace(end=float(total))
+        return cls(segments, len(exercises))
+
+    def __len__(self):
+        return len(self.segments)
+
+    def index_at(self, elapsed):
+        """Indice du segment en cours après elapsed secondes"""
+        segments = self.segments
+        if not segments:
+            return None
+        i = self._cursor
+        while i < len(segments) - 1 and elapsed >= segments[i].end:
+            i += 1
+        while i > 0 and elapsed < segments[i].start:
+            i -= 1
+        self._cursor = i
+        return i
+
+    def at(self, elapsed):
+        """Segment en cours (le dernier une fois la séance terminée)"""
+        i = self.index_at(elapsed)
+        return None if i is None else self.segments[i]
+
+    def exercises_completed(self, elapsed):
+        """Exercices dont toutes les séries d'effort sont terminées"""
+        i = self.index_at(elapsed)
+        if i is None:
+            return self.exercise_count if elapsed >= self.duration else 0
+        if elapsed >= self.segments[i].end:
+            return self._done[i]
+        return self._done[i - 1] if i else 0
@@ -0,0 +1,153 @@
+import weakref
+import tkinter as tk
+
+import customtkinter as ctk
+
+
+def visible_range(offset, viewport_height, row_height, count, overscan=2):
+    """Indices [first, last) des lignes à créer pour une position de défilement"""
+    if count <= 0 or row_height <= 0:
+        return 0, 0
+    first = max(0, int(offset // row_height) - overscan)
+    last = min(count, int((offset + viewport_height) // row_height) + 1 + overscan)
+    return first, max(first, last)
+
+
+class VirtualList(ctk.CTkFrame):
+    """Liste défilante qui ne crée des widgets que pour les lignes visibles.
+
+    Les lignes ont une hauteur fixe. create_row(parent) construit le widget
+    d'une ligne, bind_row(widget, index) le remplit avec les données de la
+    ligne index. Seules les lignes visibles (plus overscan de chaque côté)
+    existent ; en défilant, les widgets sortis de l'écran sont réutilisés.
+    Le coût d'affichage dépend donc de la hauteur de la fenêtre, pas du
+    nombre de lignes.
+    """
+
+    # Listes vivantes, pour un seul gestionnaire global de la molette
+    _instances = weakref.WeakSet()
+    # Fenêtres racines (une par interpréteur Tcl) où ce gestionnaire est lié
+    _wheel_roots = weakref.WeakSet()
+
+    def __init__(self, master, row_height, create_row, bind_row, count=0,
+                 overscan=2, canvas_color='#1a1a1a', **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.overscan = overscan
+        self.count = 0
+
+        self.canvas = ctk.CTkCanvas(
+            self,
+            bg=canvas_color,
+            highlightthickness=0,
+            yscrollincrement=max(1, row_height // 4)
+        )
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.canvas.bind('<Configure>', self._on_configure)
+
+        # index -> (widget, id de fenêtre du canvas) des lignes affichées
+        self._rows = {}
+        # lignes disponibles pour être réutilisées
+        self._free = []
+        self._width = 1
+
+        VirtualList._instances.add(self)
+        self._bind_wheel()
+        self.set_count(count)
+
+    def set_count(self, count):
+        """Change le nombre de lignes et relie les lignes visibles aux données"""
+        self.count = count
+        self.canvas.configure(scrollregion=(0, 0, self._width, count * self.row_height))
+        self.refresh()
+
+    def refresh(self):
+        """Recharge le contenu des lignes affichées (données modifiées)"""
+        for index, (widget, _) in list(self._rows.items()):
+            if index < self.count:
+                self.bind_row(widget, index)
+        self._update()
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self._update()
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._update()
+
+    def _on_configure(self, event):
+        self._width = event.width
+        self.canvas.configure(scrollregion=(0, 0, self._width, self.count * self.row_height))
+        for widget, window_id in list(self._rows.values()) + self._free:
+            self.canvas.itemconfigure(window_id, width=self._width)
+        self._update()
+
+    def _update(self):
+        top = self.canvas.canvasy(0)
+        height = self.canvas.winfo_height()
+        first, last = visible_range(top, height, self.row_height, self.count, self.overscan)
+
+        # Recycler les lignes sorties de la zone visible
+        for index in [i for i in self._rows if not first <= i < last]:
+            row = self._rows.pop(index)
+            self.canvas.itemconfigure(row[1], state='hidden')
+            self._free.append(row)
+
+        for index in range(first, last):
+            if index in self._rows:
+                continue
+            if self._free:
+                widget, window_id = self._free.pop()
+            else:
+                widget = self.create_row(self.canvas)
+                window_id = self.canvas.create_window(
+                    0, 0, window=widget, anchor='nw',
+                    width=self._width, height=self.row_height
+                )
+            self.bind_row(widget, index)
+            self.canvas.coords(window_id, 0, index * self.row_height)
+            self.canvas.itemconfigure(window_id, state='normal')
+            self._rows[index] = (widget, window_id)
+
+    def row_widget_count(self):
+        """Nombre de lignes réellement créées (affichées ou en réserve)"""
+        return len(self._rows) + len(self._free)
+
+    def _bind_wheel(self):
+        # bind_all vaut pour toute l'application Tk de cette liste : une
+        # seule fois par racine (une racine recréée est liée à nouveau)
+        root = self._root()
+        if root in VirtualList._wheel_roots:
+            return
+        VirtualList._wheel_roots.add(root)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            root.bind_all(sequence, VirtualList._on_wheel, add='+')
+
+    @staticmethod
+    def _on_wheel(event):
+        # Faire défiler la liste située sous le pointeur
+        try:
+            target = event.widget.winfo_containing(event.x_root, event.y_root)
+        except (tk.TclError, AttributeError):
+            return
+        if target is None:
+            return
+        path = str(target)
+        for instance in list(VirtualList._instances):
+            try:
+                if not instance.winfo_exists():
+                    continue
+            except tk.TclError:
+                continue
+            if path.startswith(str(instance.canvas)):
+                if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0:
+                    instance.yview('scroll', -1, 'units')
+                else:
+                    instance.yview('scroll', 1, 'units')
+                return